@@ -0,0 +1,190 @@
+# accesslog.py
+"""구조화 액세스 로그 - 요청 경로에서는 튜플 하나를 deque 에 넣기만 하고, JSON 직렬화와 쓰기는 별도 스레드
+
+    ACCESS_LOG_JSON     켜기 (기본 false)
+    ACCESS_LOG_FILE     출력 파일 (기본 - : stdout)
+    ACCESS_LOG_SAMPLE   기록 비율 0~1 (기본 1, 5xx 는 항상 기록)
+    ACCESS_LOG_BUFFER   쓰기 대기 최대 개수 (기본 8192, 넘치면 버리고 메트릭에 셈)
+
+X-Request-ID 가 없으면 만들어서 요청 헤더에 넣고(뒤쪽 미들웨어/핸들러도 같은 값) 응답에도 돌려줍니다.
+프록시가 X-Request-Start (t=<epoch 초|밀리초|마이크로초>) 를 붙이면 프록시→백엔드 대기 시간도 남깁니다.
+"""
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+
+from admission import QUEUE_WAIT_KEY
+import clientip
+
+ACCESS_LOG_JSON = os.getenv("ACCESS_LOG_JSON", "").strip().lower() in ("1", "true", "yes", "on")
+ACCESS_LOG_FILE = os.getenv("ACCESS_LOG_FILE", "").strip() or "-"
+ACCESS_LOG_SAMPLE = float(os.getenv("ACCESS_LOG_SAMPLE", "").strip() or 1.0)
+ACCESS_LOG_BUFFER = int(os.getenv("ACCESS_LOG_BUFFER", "").strip() or 8192)
+_FLUSH_INTERVAL = 0.2
+
+
+def parse_request_start(value):
+    """X-Request-Start 값 → epoch 초 (해석 불가면 None)"""
+    if value.startswith("t="):
+        value = value[2:]
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    if number > 1e14:
+        return number / 1e6
+    if number > 1e11:
+        return number / 1e3
+    return number
+
+
+class AccessLogWriter:
+    """백그라운드 스레드가 주기적으로 deque 를 비워 JSON Lines 로 한 번에 씀
+
+    deque 의 append/popleft 는 스레드 간에 원자적이라 요청 경로에 락이 없습니다.
+    """
+
+    FIELDS = ("time", "request_id", "method", "path", "query", "status", "client", "hops", "bytes_in", "bytes_out",
+              "upstream_queue_ms", "queue_ms", "handler_ms", "ttfb_ms", "duration_ms")
+
+    def __init__(self, path=ACCESS_LOG_FILE, max_buffer=ACCESS_LOG_BUFFER, sample=ACCESS_LOG_SAMPLE, metrics=None,
+                 **static_fields):
+        self.path = path
+        self.max_buffer = max_buffer
+        self.sample = sample
+        self.metrics = metrics
+        self.static_fields = static_fields
+        self.buffer = deque()
+        self.dropped = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def submit(self, entry):
+        if len(self.buffer) >= self.max_buffer:
+            self.dropped += 1
+            if self.metrics is not None:
+                self.metrics.access_log_dropped()
+            return
+        self.buffer.append(entry)
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="access-log", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        stream = sys.stdout if self.path == "-" else open(self.path, "a", encoding="utf-8", buffering=1024 * 1024)
+        try:
+            while not self._stop.is_set():
+                self._wake.wait(_FLUSH_INTERVAL)
+                self._wake.clear()
+                self._flush(stream)
+            self._flush(stream)
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+
+    def _flush(self, stream):
+        buffer = self.buffer
+        if not buffer:
+            return
+        lines = []
+        fields = self.FIELDS
+        static = self.static_fields
+        while buffer:
+            entry = buffer.popleft()
+            record = dict(zip(fields, entry))
+            record["time"] = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(entry[0])) + f".{int(entry[0] % 1 * 1000):03d}Z"
+            record.update(static)
+            lines.append(json.dumps(record, ensure_ascii=False))
+        lines.append("")
+        stream.write("\n".join(lines))
+        stream.flush()
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3) if seconds is not None else None
+
+
+class AccessLogMiddleware:
+    """X-Request-ID 보장과 요청별 시간/바이트 측정 (기록은 writer 로 넘김)"""
+
+    def __init__(self, app, writer):
+        self.app = app
+        self.writer = writer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        arrived_at = time.time()
+        started = time.perf_counter()
+        request_id = None
+        request_start = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value
+            elif name == b"x-request-start":
+                request_start = value
+        if request_id is None:
+            request_id = os.urandom(16).hex().encode("latin-1")
+            scope["headers"] = [*scope["headers"], (b"x-request-id", request_id)]
+        status = None
+        bytes_in = 0
+        bytes_out = 0
+        ttfb = None
+
+        async def receive_wrapper():
+            nonlocal bytes_in
+            message = await receive()
+            if message["type"] == "http.request":
+                bytes_in += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status, bytes_out, ttfb
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                ttfb = time.perf_counter() - started
+                message = {**message, "headers": [*message.get("headers", ()), (b"x-request-id", request_id)]}
+            elif message["type"] == "http.response.body":
+                bytes_out += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            writer = self.writer
+            if writer.sample >= 1.0 or (status or 500) >= 500 or random.random() < writer.sample:
+                upstream_queue = None
+                if request_start is not None:
+                    epoch = parse_request_start(request_start.decode("latin-1"))
+                    if epoch is not None:
+                        upstream_queue = max(0.0, arrived_at - epoch)
+                extensions = scope.get("extensions")
+                queue_wait = extensions.get(QUEUE_WAIT_KEY, 0.0) if extensions else 0.0
+                # 신뢰 프록시 체인으로 해석한 클라이언트 (없으면 연결 상대)
+                resolved = clientip.current(scope)
+                if resolved is not None:
+                    client, hops = resolved.ip, resolved.hops
+                else:
+                    client, hops = (scope.get("client") or (None,))[0], None
+                writer.submit((
+                    arrived_at, request_id.decode("latin-1"), scope["method"], scope["path"],
+                    scope["query_string"].decode("latin-1") or None, status, client, hops, bytes_in, bytes_out,
+                    _ms(upstream_queue), _ms(queue_wait), _ms(duration - queue_wait), _ms(ttfb), _ms(duration),
+                ))
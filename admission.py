@@ -0,0 +1,209 @@
+# admission.py
+"""수락 제어 - 라우트 그룹별 동시 처리 한도와 제한된 대기열, 넘치면 바로 503/429 + Retry-After
+
+ADMISSION_CONFIG 에 JSON 파일 경로나 JSON 문자열을 지정합니다.
+
+    {
+      "groups": {
+        "slow": {"routes": ["/timeout-test", "/upload*"], "limit": 50, "queue": 100, "queue_timeout": 2},
+        "default": {"limit": 500, "queue": 1000, "queue_timeout": 0.5, "status": 429, "retry_after": 1}
+      },
+      "exempt": ["/metrics"]
+    }
+
+routes 는 정확한 경로 또는 '*' 로 끝나는 접두어입니다. 어느 그룹에도 속하지 않는 경로는
+"default" 그룹(있으면)으로 가고, exempt 경로는 제한하지 않습니다.
+설정 파일 없이 ADMISSION_LIMIT(및 ADMISSION_QUEUE, ADMISSION_QUEUE_TIMEOUT, ADMISSION_STATUS,
+ADMISSION_RETRY_AFTER)만 주면 모든 경로에 적용되는 default 그룹 하나를 만듭니다.
+"""
+import asyncio
+import json
+import os
+import time
+from collections import deque
+
+DEFAULT_GROUP = "default"
+DEFAULT_EXEMPT = ("/metrics",)
+# 대기 시간(초)을 남기는 scope["extensions"] 키 (액세스 로그가 읽음)
+QUEUE_WAIT_KEY = "ingress_echo.queue_wait"
+
+
+class Shed(Exception):
+    """대기열이 가득 찼거나(queue_full) 대기 시간이 지나(queue_timeout) 거절"""
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def _shed_response(group, reason):
+    body = json.dumps(
+        {"오류": "과부하로 요청을 거절했습니다", "그룹": group.name, "사유": reason}, ensure_ascii=False
+    ).encode("utf-8")
+    return (
+        {
+            "type": "http.response.start",
+            "status": group.status,
+            "headers": [
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"content-type", b"application/json"),
+                (b"retry-after", str(group.retry_after).encode("latin-1")),
+            ],
+        },
+        {"type": "http.response.body", "body": body},
+    )
+
+
+class AdmissionGroup:
+    """동시 처리 limit 개 + 대기 queue 개 - 슬롯은 반납 시 대기 중인 요청에 바로 넘김 (FIFO)"""
+
+    def __init__(self, name, limit, queue=None, queue_timeout=1.0, status=503, retry_after=1, routes=()):
+        self.name = name
+        self.limit = int(limit)
+        self.queue_limit = int(queue if queue is not None else limit)
+        self.queue_timeout = float(queue_timeout)
+        self.status = int(status)
+        self.retry_after = int(retry_after)
+        self.routes = tuple(routes)
+        if self.limit < 1 or self.queue_limit < 0 or self.queue_timeout < 0:
+            raise ValueError(f"잘못된 admission 설정: {name}")
+        if self.status not in (429, 503):
+            raise ValueError(f"admission status 는 429 또는 503 이어야 합니다: {name}")
+        self.active = 0
+        self.waiters = deque()
+        # active/waiters 가 바뀔 때마다 admission_state 를 받음 (Metrics) - 대기/거절 중에도 게이지가 최신
+        self.observer = None
+        self.responses = {reason: _shed_response(self, reason) for reason in ("queue_full", "queue_timeout")}
+
+    async def acquire(self):
+        """슬롯을 얻을 때까지 대기 → 대기 시간(초), 거절되면 Shed"""
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            self._publish()
+            return 0.0
+        if len(self.waiters) >= self.queue_limit:
+            raise Shed("queue_full")
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append(future)
+        self._publish()
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await future
+        except TimeoutError:
+            if not future.done() or future.cancelled():
+                self._discard(future)
+                raise Shed("queue_timeout") from None
+            # 시간 초과와 동시에 슬롯을 넘겨받음 - 그대로 진행
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                self._discard(future)
+            raise
+        return time.perf_counter() - started
+
+    def _discard(self, future):
+        try:
+            self.waiters.remove(future)
+        except ValueError:
+            return
+        self._publish()
+
+    def _publish(self):
+        if self.observer is not None:
+            self.observer.admission_state(self.name, self.active, len(self.waiters))
+
+    def release(self):
+        waiters = self.waiters
+        while waiters:
+            future = waiters.popleft()
+            if not future.done():
+                # active 는 그대로 두고 슬롯을 대기자에게 넘김
+                future.set_result(None)
+                self._publish()
+                return
+        self.active -= 1
+        self._publish()
+
+
+class AdmissionConfig:
+    """경로 → 그룹 매핑"""
+
+    def __init__(self, groups, exempt=DEFAULT_EXEMPT):
+        self.groups = {name: AdmissionGroup(name, **options) for name, options in groups.items()}
+        self.exempt = frozenset(exempt)
+        self._exact = {}
+        self._prefixes = []
+        for group in self.groups.values():
+            for route in group.routes:
+                if route.endswith("*"):
+                    self._prefixes.append((route[:-1], group))
+                else:
+                    self._exact[route] = group
+        self._default = self.groups.get(DEFAULT_GROUP)
+
+    @classmethod
+    def load(cls):
+        """ADMISSION_CONFIG (파일 경로 또는 JSON) / ADMISSION_LIMIT 환경변수로 생성 (설정 없으면 None)"""
+        source = os.getenv("ADMISSION_CONFIG", "").strip()
+        if source:
+            if source.startswith("{"):
+                data = json.loads(source)
+            else:
+                with open(source, encoding="utf-8") as f:
+                    data = json.load(f)
+            return cls(data.get("groups", {}), data.get("exempt", DEFAULT_EXEMPT))
+        limit = os.getenv("ADMISSION_LIMIT", "").strip()
+        if not limit:
+            return None
+        return cls({DEFAULT_GROUP: {
+            "limit": int(limit),
+            "queue": int(os.getenv("ADMISSION_QUEUE", "").strip() or limit),
+            "queue_timeout": float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "").strip() or 1.0),
+            "status": int(os.getenv("ADMISSION_STATUS", "").strip() or 503),
+            "retry_after": int(os.getenv("ADMISSION_RETRY_AFTER", "").strip() or 1),
+        }})
+
+    def group_for(self, path):
+        if path in self.exempt:
+            return None
+        group = self._exact.get(path)
+        if group is not None:
+            return group
+        for prefix, group in self._prefixes:
+            if path.startswith(prefix):
+                return group
+        return self._default
+
+
+class AdmissionMiddleware:
+    """그룹 슬롯을 얻은 요청만 앱으로 넘기는 ASGI 미들웨어 (대기 시간/거절 수는 metrics 에 기록)"""
+
+    def __init__(self, app, config, metrics):
+        self.app = app
+        self.config = config
+        self.metrics = metrics
+        for group in config.groups.values():
+            group.observer = metrics
+
+    async def __call__(self, scope, receive, send):
+        group = self.config.group_for(scope["path"]) if scope["type"] == "http" else None
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+        metrics = self.metrics
+        try:
+            waited = await group.acquire()
+        except Shed as shed:
+            metrics.admission_shed(group.name, shed.reason)
+            for message in group.responses[shed.reason]:
+                await send(message)
+            return
+        metrics.admission_admitted(group.name, waited)
+        if waited:
+            scope.setdefault("extensions", {})[QUEUE_WAIT_KEY] = waited
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            group.release()
@@ -0,0 +1,109 @@
+# affinity.py
+"""세션 어피니티/부하 분산 확인 - 응답마다 파드 이름 헤더를 붙이고, 벤치마크 쪽에서 (route 쿠키, 파드) 쌍을 집계"""
+import os
+import socket
+import time
+
+POD_HEADER = "x-pod-name"
+# 쿠베르네티스에서는 hostname 이 파드 이름이지만, 차트는 downward API 로 POD_NAME 을 명시적으로 넘김
+POD_NAME = os.getenv("POD_NAME") or socket.gethostname()
+
+
+class PodIdentityMiddleware:
+    """모든 HTTP 응답에 X-Pod-Name 헤더 추가 (어느 레플리카가 응답했는지)"""
+
+    def __init__(self, app, pod_name=POD_NAME):
+        self.app = app
+        self.header = (POD_HEADER.encode("latin-1"), pod_name.encode("latin-1", "replace"))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        header = self.header
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", ()), header]}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class AffinityTracker:
+    """(route 쿠키 값, 응답한 파드) 집계 - 메모리는 max_keys 개 쿠키로 제한
+
+    쿠키마다 마지막 파드와 '레플리카 구성 세대'만 기억하므로 요청당 dict 조회 한두 번으로 끝납니다.
+    시작 후 settle 초가 지나 처음 보는 파드가 나타나면(스케일 아웃) 세대를 올리고,
+    그 뒤 각 쿠키의 첫 요청이 다른 파드로 갔는지로 재배치 비율(remap rate)을 셉니다.
+    """
+
+    def __init__(self, max_keys=65536, settle=5.0):
+        self.max_keys = max_keys
+        self.settle = settle
+        self.started = time.monotonic()
+        self.pods = {}
+        self.pod_requests = []
+        self.keys = {}
+        self.epoch = 0
+        self.changes = []
+        self.requests = 0
+        self.no_pod = 0
+        self.untracked = 0
+        self.repeats = 0
+        self.stuck = 0
+        self.after_change = 0
+        self.remapped = 0
+
+    def record(self, key, pod):
+        """key: 요청에 실어 보낸 쿠키 값 (없으면 None), pod: 응답의 파드 헤더 값"""
+        self.requests += 1
+        if pod is None:
+            self.no_pod += 1
+            return
+        index = self.pods.get(pod)
+        if index is None:
+            index = self.pods[pod] = len(self.pod_requests)
+            self.pod_requests.append(0)
+            elapsed = time.monotonic() - self.started
+            if elapsed >= self.settle:
+                self.epoch += 1
+                self.changes.append((round(elapsed, 3), pod))
+        self.pod_requests[index] += 1
+        if key is None:
+            return
+        entry = self.keys.get(key)
+        if entry is None:
+            if len(self.keys) < self.max_keys:
+                self.keys[key] = [index, self.epoch]
+            else:
+                self.untracked += 1
+            return
+        self.repeats += 1
+        same = entry[0] == index
+        if same:
+            self.stuck += 1
+        else:
+            entry[0] = index
+        if entry[1] != self.epoch:
+            entry[1] = self.epoch
+            self.after_change += 1
+            if not same:
+                self.remapped += 1
+
+    def report(self):
+        served = sum(self.pod_requests)
+        return {
+            "requests": self.requests,
+            "without_pod_header": self.no_pod,
+            "tracked_cookies": len(self.keys),
+            "untracked_requests": self.untracked,
+            "repeat_requests": self.repeats,
+            "stickiness": round(self.stuck / self.repeats, 4) if self.repeats else None,
+            "moves": self.repeats - self.stuck,
+            "replica_share": {
+                pod: round(self.pod_requests[index] / served, 4) for pod, index in self.pods.items()
+            } if served else {},
+            "replica_changes": [{"at_seconds": at, "new_pod": pod} for at, pod in self.changes],
+            "remap_rate": round(self.remapped / self.after_change, 4) if self.after_change else None,
+        }
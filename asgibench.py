@@ -0,0 +1,405 @@
+# asgibench.py
+"""인프로세스 ASGI 벤치마크 - 소켓 없이 앱을 직접 호출해 라우트별 요청당 CPU 시간/메모리 할당 측정
+
+    python main.py asgi-bench                     측정 후 기준선과 비교 (한도를 넘으면 종료 코드 1)
+    python main.py asgi-bench --update-baseline   기준선 파일(asgibench-baseline.json) 갱신
+    python main.py asgi-bench --cases root,upload-64k --rounds 9
+
+미들웨어 스택(헬스, 메트릭, 클라이언트 IP ...)까지 포함한 앱을 lifespan 시작 후 호출합니다.
+CPU 시간은 라운드마다 process_time 차이를 요청 수로 나눈 값(스레드풀에서 도는 def 핸들러 포함)의 최솟값,
+할당은 tracemalloc 으로 잰 요청 하나의 최대 할당(peak) 중앙값입니다 (tracemalloc 은 CPU 측정과 따로 돌림).
+라운드 앞뒤로 보정 루프(헤더 dict, JSON 직렬화, bytes 조립 - 핸들러와 비슷한 일)를 돌려 그 평균에 대한
+비율(cpu_norm)로 회귀를 판정합니다 - 다른 머신이나 옆 프로세스 때문에 느려진 만큼은 보정 루프도 같이 느려져서 상쇄됩니다.
+잡음은 한쪽(느려지는 쪽)으로만 끼므로 라운드 중 가장 빠른 값을 쓰고, 기준선은 전체 실행 여러 번(--runs)의 중앙값입니다.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "asgibench-baseline.json")
+RECEIVE_CHUNK = 64 * 1024
+# 앱 동작을 바꾸는 환경변수 - 기준선과 다르면 비교 전에 경고
+CONFIG_ENV = ("FAST_PATH", "ACCESS_LOG_JSON", "ACCESS_LOG_SAMPLE", "CAPTURE_SIZE", "ADMISSION_CONFIG",
+              "TRUSTED_PROXIES", "STARTUP_PROFILE")
+_ORIGIN = ((b"origin", b"https://bench.example.com"),)
+
+
+class Case:
+    """벤치마크 요청 하나 (요청 본문은 미리 ASGI 메시지로 잘라 둠 - 본문 생성은 측정하지 않음)"""
+
+    def __init__(self, name, method, path, headers=(), body=b"", content_type=None, status=200):
+        self.name = name
+        self.method = method
+        self.path, _, query = path.partition("?")
+        self.status = status
+        headers = [(b"host", b"bench.local"), (b"user-agent", b"ingress-echo-asgibench"), *headers]
+        if content_type is not None:
+            headers.append((b"content-type", content_type.encode("latin-1")))
+        if body or method in ("POST", "PUT", "PATCH"):
+            headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        self.scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "server": ("127.0.0.1", 8001),
+            "client": ("10.0.0.5", 40000),
+            "scheme": "http",
+            "method": method,
+            "root_path": "",
+            "path": self.path,
+            "raw_path": self.path.encode("latin-1"),
+            "query_string": query.encode("latin-1"),
+            "headers": headers,
+        }
+        pieces = [body[offset:offset + RECEIVE_CHUNK] for offset in range(0, len(body), RECEIVE_CHUNK)] or [b""]
+        self.messages = tuple(
+            {"type": "http.request", "body": piece, "more_body": index < len(pieces) - 1}
+            for index, piece in enumerate(pieces)
+        )
+
+
+def _upload_case(name, size):
+    from bench import multipart_body
+
+    body, content_type = multipart_body(size)
+    return Case(name, "POST", "/upload", body=b"".join(bytes(piece) for piece in body.chunks()),
+                content_type=content_type)
+
+
+def build_cases():
+    return [
+        # / 는 gzip 협상 여부에 따라 generate_html_dashboard 또는 미리 압축한 조각
+        Case("root", "GET", "/"),
+        Case("root-gzip", "GET", "/", [(b"accept-encoding", b"gzip, deflate, br")]),
+        Case("request-info", "GET", "/request-info", [(b"x-forwarded-for", b"203.0.113.7, 10.0.0.4")]),
+        Case("check-session", "GET", "/check-session", [(b"cookie", b"route=4f1c2a; JSESSIONID=abc")]),
+        Case("cors-get", "GET", "/cors-test", _ORIGIN),
+        Case("cors-post", "POST", "/cors-test", _ORIGIN, b"{}", "application/json"),
+        Case("cors-preflight", "OPTIONS", "/cors-test",
+             (*_ORIGIN, (b"access-control-request-method", b"POST")), status=204),
+        Case("redirect", "GET", "/redirect", status=307),
+        Case("redirect-external", "GET", "/redirect-external", status=301),
+        _upload_case("upload-1k", 1024),
+        _upload_case("upload-64k", 64 * 1024),
+        _upload_case("upload-1m", 1024 * 1024),
+    ]
+
+
+async def call(app, case):
+    """요청 하나를 앱에 보내고 (상태, 응답 본문 바이트) 반환"""
+    scope = {**case.scope, "headers": list(case.scope["headers"]), "extensions": {}, "state": {}}
+    messages = iter(case.messages)
+    done = asyncio.Event()
+    status = None
+    bytes_out = 0
+
+    async def receive():
+        message = next(messages, None)
+        if message is not None:
+            return message
+        # 본문을 다 준 뒤에는 응답이 끝날 때까지 기다렸다가 연결 종료
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status, bytes_out
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            bytes_out += len(message.get("body", b""))
+            if not message.get("more_body", False):
+                done.set()
+
+    await app(scope, receive, send)
+    done.set()
+    return status, bytes_out
+
+
+async def _batch(app, case, count):
+    for _ in range(count):
+        await call(app, case)
+
+
+async def measure(app, case, rounds, min_time, alloc_samples):
+    """라운드별 (CPU, 벽시계) 요청당 시간의 최솟값과 요청당 최대 할당 중앙값"""
+    status, bytes_out = await call(app, case)
+    if status != case.status:
+        raise RuntimeError(f"{case.name}: 상태 {status} (기대 {case.status})")
+    # 라운드 하나가 min_time 이상 걸리도록 요청 수 결정 (timeit autorange 와 같은 방식)
+    count = 1
+    while True:
+        started = time.perf_counter()
+        await _batch(app, case, count)
+        if time.perf_counter() - started >= min_time:
+            break
+        count *= 2
+    cpu, wall, norm, calibration = [], [], [], []
+    for _ in range(rounds):
+        gc.collect()
+        before = calibrate()
+        cpu_started = time.process_time_ns()
+        started = time.perf_counter_ns()
+        await _batch(app, case, count)
+        wall.append((time.perf_counter_ns() - started) / count / 1000)
+        cpu.append((time.process_time_ns() - cpu_started) / count / 1000)
+        # 라운드 앞뒤 보정의 평균 - 라운드 도중 머신 속도가 바뀐 것도 반영
+        calibration.append((before + calibrate()) / 2)
+        norm.append(cpu[-1] / calibration[-1])
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_samples):
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            await call(app, case)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    return {
+        "cpu_us": round(min(cpu), 2),
+        "cpu_norm": round(min(norm), 4),
+        "calibration_ms": round(statistics.median(calibration), 3),
+        "wall_us": round(min(wall), 2),
+        "alloc_bytes": int(statistics.median(peaks)),
+        "bytes_out": bytes_out,
+        "requests": count * rounds,
+    }
+
+
+_CALIBRATION_HEADERS = ((b"host", b"bench.local"), (b"user-agent", b"ingress-echo-asgibench"),
+                        (b"accept", b"*/*"), (b"cookie", b"route=4f1c2a; JSESSIONID=abc"))
+
+
+def _calibration_work(iterations=150):
+    """요청 하나를 처리하는 것과 비슷한 일 - 헤더 디코드/dict, JSON 직렬화, 응답 헤더/본문 bytes 조립"""
+    for index in range(iterations):
+        headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in _CALIBRATION_HEADERS}
+        cookies = dict(part.strip().partition("=")[::2] for part in headers["cookie"].split(";"))
+        body = json.dumps(
+            {"msg": "보정", "순번": index, "헤더": headers, "쿠키": cookies}, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        raw = [(b"content-length", str(len(body)).encode("latin-1")), (b"content-type", b"application/json")]
+        b"".join(name + b": " + value + b"\r\n" for name, value in raw)
+
+
+def calibrate(repeat=5):
+    """머신 속도 보정 (ms, 반복 중 최솟값)"""
+    best = None
+    for _ in range(repeat):
+        started = time.process_time_ns()
+        _calibration_work()
+        elapsed = (time.process_time_ns() - started) / 1e6
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class Lifespan:
+    """ASGI lifespan startup/shutdown 을 직접 구동"""
+
+    def __init__(self, app):
+        self.app = app
+        self.inbox = asyncio.Queue()
+        self.outbox = asyncio.Queue()
+        self.task = None
+
+    async def __aenter__(self):
+        scope = {"type": "lifespan", "asgi": {"version": "3.0", "spec_version": "2.3"}, "state": {}}
+        self.task = asyncio.create_task(self.app(scope, self.inbox.get, self.outbox.put))
+        await self.inbox.put({"type": "lifespan.startup"})
+        message = await self.outbox.get()
+        if message["type"] != "lifespan.startup.complete":
+            raise RuntimeError(f"lifespan 시작 실패: {message.get('message')}")
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.inbox.put({"type": "lifespan.shutdown"})
+        await self.outbox.get()
+        await self.task
+
+
+def compare(results, baseline, threshold, alloc_threshold):
+    """케이스별 판정 - CPU 는 기준선 cpu_norm 을 지금 보정 루프 시간으로 환산한 값 대비, 할당은 그대로 비교"""
+    base_cases = (baseline or {}).get("cases", {})
+    regressions = []
+    for name, result in results.items():
+        base = base_cases.get(name)
+        if base is None:
+            result["result"] = "new"
+            continue
+        expected_cpu = base["cpu_norm"] * result["calibration_ms"]
+        result["base_cpu_us"] = round(expected_cpu, 2)
+        result["base_alloc_bytes"] = base["alloc_bytes"]
+        result["cpu_change"] = round(result["cpu_norm"] / base["cpu_norm"] - 1, 4) if base["cpu_norm"] else None
+        result["alloc_change"] = round(result["alloc_bytes"] / base["alloc_bytes"] - 1, 4) if base["alloc_bytes"] else None
+        failed = []
+        if cpu_regressed(result, base, threshold):
+            failed.append("cpu")
+        # 작은 값의 흔들림은 무시 (1 KiB)
+        if result["alloc_bytes"] > base["alloc_bytes"] * (1 + alloc_threshold) + 1024:
+            failed.append("alloc")
+        if failed:
+            result["result"] = "REGRESSION(" + ",".join(failed) + ")"
+            regressions.append(name)
+        elif result["cpu_norm"] < base["cpu_norm"] * (1 - threshold):
+            result["result"] = "faster"
+        else:
+            result["result"] = "ok"
+    return regressions
+
+
+def format_results(results):
+    lines = [f"{'case':<20}{'cpu_us':>10}{'wall_us':>10}{'alloc_KiB':>11}{'base_cpu':>10}{'Δcpu':>8}{'Δalloc':>8}  result"]
+    for name, row in results.items():
+        def pct(value):
+            return f"{value:+8.1%}" if value is not None else f"{'-':>8}"
+
+        base = f"{row['base_cpu_us']:10.1f}" if "base_cpu_us" in row else f"{'-':>10}"
+        lines.append(
+            f"{name:<20}{row['cpu_us']:>10.1f}{row['wall_us']:>10.1f}{row['alloc_bytes'] / 1024:>11.1f}{base}"
+            f"{pct(row.get('cpu_change'))}{pct(row.get('alloc_change'))}  {row.get('result', '')}"
+        )
+    return "\n".join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py asgi-bench", description="인프로세스 ASGI 라우트 벤치마크")
+    parser.add_argument("--cases", default=None, help="실행할 케이스 (쉼표 구분, 기본 전체)")
+    parser.add_argument("--rounds", type=int, default=7, help="라운드 수 (최솟값 사용, 기본 7)")
+    parser.add_argument("--runs", type=int, default=None,
+                        help="전체 실행 횟수 - 케이스별 중앙값 사용 (기본: 기준선 갱신 5, 비교 1)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="라운드 하나의 최소 시간(초, 기본 0.2)")
+    parser.add_argument("--alloc-samples", type=int, default=20, help="할당 측정 요청 수 (기본 20)")
+    # 1 vCPU 공유 VM 에서 코드 변경 없이 단일 측정 cpu_norm 이 ±28% 까지 흔들려서 그보다 넉넉하게
+    parser.add_argument("--threshold", type=float, default=0.35, help="허용 CPU 증가 비율 (기본 0.35)")
+    parser.add_argument("--alloc-threshold", type=float, default=0.25, help="허용 할당 증가 비율 (기본 0.25)")
+    parser.add_argument("--confirm", type=int, default=2, help="CPU 회귀로 보이는 케이스 재측정 횟수 (기본 2)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="기준선 파일")
+    parser.add_argument("--update-baseline", action="store_true", help="비교하지 않고 측정값으로 기준선 갱신")
+    parser.add_argument("-o", "--output", default=None, help="측정 결과 JSON 파일 (기본 저장 안 함)")
+    return parser
+
+
+def cpu_regressed(result, base, threshold):
+    return base is not None and result["cpu_norm"] > base["cpu_norm"] * (1 + threshold)
+
+
+def merge_runs(runs):
+    """전체 실행 여러 번의 케이스별 중앙값"""
+    if len(runs) == 1:
+        return runs[0]
+    merged = {}
+    for name in runs[0]:
+        rows = [run[name] for run in runs]
+
+        def median(key, digits):
+            return round(statistics.median(row[key] for row in rows), digits)
+
+        merged[name] = {
+            "cpu_us": median("cpu_us", 2),
+            "cpu_norm": median("cpu_norm", 4),
+            "calibration_ms": median("calibration_ms", 3),
+            "wall_us": median("wall_us", 2),
+            "alloc_bytes": int(statistics.median(row["alloc_bytes"] for row in rows)),
+            "bytes_out": rows[0]["bytes_out"],
+            "requests": sum(row["requests"] for row in rows),
+        }
+    return merged
+
+
+async def _run(app, cases, args, baseline=None):
+    base_cases = (baseline or {}).get("cases", {})
+    async with Lifespan(app):
+        # 첫 케이스만 프로세스 워밍업(스레드풀, 캐시, gc 세대)을 떠안지 않도록 전부 한 번씩 먼저 돌림
+        for case in cases:
+            await _batch(app, case, 20)
+        # 실행 단위로 케이스를 번갈아 돌려 시간에 따라 바뀌는 잡음이 한 케이스에 몰리지 않게 함
+        runs = []
+        for _ in range(args.runs):
+            runs.append({case.name: await measure(app, case, args.rounds, args.min_time, args.alloc_samples)
+                         for case in cases})
+        results = merge_runs(runs)
+        # CPU 회귀로 보이는 케이스는 다시 재서 가장 빠른 측정을 씀 (한 번 튄 라운드 묶음으로 실패하지 않도록)
+        for _ in range(args.confirm):
+            suspects = [case for case in cases
+                        if cpu_regressed(results[case.name], base_cases.get(case.name), args.threshold)]
+            if not suspects:
+                break
+            for case in suspects:
+                again = await measure(app, case, args.rounds, args.min_time, args.alloc_samples)
+                if again["cpu_norm"] < results[case.name]["cpu_norm"]:
+                    results[case.name] = again
+    return results
+
+
+def main(argv=None, app=None):
+    args = build_parser().parse_args(argv)
+    if args.runs is None:
+        args.runs = 5 if args.update_baseline else 1
+    if app is None:
+        from main import app
+    cases = build_cases()
+    if args.cases:
+        wanted = [name.strip() for name in args.cases.split(",") if name.strip()]
+        unknown = set(wanted) - {case.name for case in cases}
+        if unknown:
+            print(f"알 수 없는 케이스: {', '.join(sorted(unknown))} (가능: {', '.join(case.name for case in cases)})",
+                  file=sys.stderr)
+            return 2
+        cases = [case for case in cases if case.name in wanted]
+
+    baseline = None
+    if not args.update_baseline:
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        else:
+            print(f"기준선 파일이 없습니다: {args.baseline} (--update-baseline 으로 생성)", file=sys.stderr)
+
+    results = asyncio.run(_run(app, cases, args, baseline))
+    calibration = round(statistics.median(result["calibration_ms"] for result in results.values()), 3)
+    config = {name: os.getenv(name) for name in CONFIG_ENV}
+    document = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "calibration_ms": calibration,
+        "config": config,
+        "settings": {"rounds": args.rounds, "runs": args.runs, "min_time": args.min_time,
+                     "alloc_samples": args.alloc_samples},
+        "cases": results,
+    }
+    if args.update_baseline:
+        if os.path.exists(args.baseline) and args.cases:
+            # 일부 케이스만 돌렸으면 나머지 기준선은 유지
+            with open(args.baseline, encoding="utf-8") as f:
+                document["cases"] = {**json.load(f).get("cases", {}), **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(document, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(format_results(results))
+        print(f"-> {args.baseline} (calibration {calibration} ms)")
+        return 0
+
+    if baseline is not None and baseline.get("config") != config:
+        print(f"경고: 기준선과 앱 설정 환경변수가 다릅니다 (기준선 {baseline.get('config')})", file=sys.stderr)
+    regressions = compare(results, baseline, args.threshold, args.alloc_threshold)
+    print(format_results(results))
+    if baseline is not None:
+        print(f"calibration {calibration} ms (기준선 {baseline.get('calibration_ms')} ms, "
+              f"{baseline.get('python')} {baseline.get('created_at')})")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, ensure_ascii=False, indent=2)
+    if regressions:
+        print(f"회귀: {', '.join(regressions)} (허용 CPU +{args.threshold:.0%}, 할당 +{args.alloc_threshold:.0%})",
+              file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,617 @@
+# bench.py
+"""비동기 부하 생성기 - 컨트롤러별 비교 벤치마크
+
+    python main.py bench http://localhost:8001
+    python main.py bench https://nginx.seungdobae.com https://traefik.seungdobae.com -c 64 -d 60
+
+같은 엔드포인트 조합을 keep-alive 연결 풀로 보내고, 라우트별 지연(p50/p90/p99/p999),
+처리량, 오류 수를 표로 출력한 뒤 대상별 JSON 결과 파일을 남깁니다.
+"""
+import argparse
+import asyncio
+import json
+import random
+import ssl
+import sys
+import time
+from array import array
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+from affinity import POD_HEADER, AffinityTracker
+
+DEFAULT_MIX = "/=4,/check-session=3,/cors-test=2,/upload=1,/timeout-test=1"
+READ_CHUNK = 64 * 1024
+USER_AGENT = "ingress-echo-bench"
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class HttpError(Exception):
+    """응답을 HTTP/1.1 로 해석할 수 없음"""
+
+
+class HttpResponse:
+    __slots__ = ("status", "headers", "body", "body_bytes", "ttfb")
+
+    def __init__(self, status, headers, body, body_bytes, ttfb):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.body_bytes = body_bytes
+        self.ttfb = ttfb
+
+    def header(self, name, default=None):
+        name = name.lower()
+        for key, value in self.headers:
+            if key == name:
+                return value
+        return default
+
+    def header_list(self, name):
+        name = name.lower()
+        return [value for key, value in self.headers if key == name]
+
+
+class StreamBody:
+    """고정 길이 본문을 같은 청크 반복으로 보내는 요청 본문 (메모리 일정)"""
+
+    def __init__(self, prefix, chunk, repeat_bytes, suffix):
+        self.prefix = prefix
+        self.chunk = memoryview(chunk)
+        self.repeat_bytes = repeat_bytes
+        self.suffix = suffix
+        self.length = len(prefix) + repeat_bytes + len(suffix)
+
+    def chunks(self):
+        yield self.prefix
+        remaining = self.repeat_bytes
+        while remaining > 0:
+            piece = self.chunk[:remaining] if remaining < len(self.chunk) else self.chunk
+            remaining -= len(piece)
+            yield piece
+        yield self.suffix
+
+
+def multipart_body(size, field="file", filename="bench.bin", total=False):
+    """size 바이트 파일 하나를 담은 multipart/form-data 본문과 Content-Type
+
+    total 이면 size 를 경계/파트 헤더까지 포함한 본문 전체 길이로 보고 파일 크기를 그만큼 줄입니다.
+    """
+    boundary = f"ingress-echo-bench-{random.getrandbits(64):016x}"
+    prefix = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode("latin-1")
+    suffix = f"\r\n--{boundary}--\r\n".encode("latin-1")
+    if total:
+        size = max(0, size - len(prefix) - len(suffix))
+    chunk = random.randbytes(min(size, 1024 * 1024)) if size else b""
+    return StreamBody(prefix, chunk, size, suffix), f"multipart/form-data; boundary={boundary}"
+
+
+class HttpConnection:
+    """keep-alive HTTP/1.1 연결 하나 (끊기면 다음 요청에서 다시 연결)"""
+
+    def __init__(self, host, port, use_tls=False, ssl_context=None, connect_host=None, header_limit=1024 * 1024):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.ssl_context = ssl_context
+        self.connect_host = connect_host or host
+        self.header_limit = header_limit
+        self.reader = None
+        self.writer = None
+        self.connects = 0
+        self.cookies = {}
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.open_connection(
+            self.connect_host,
+            self.port,
+            ssl=self.ssl_context if self.use_tls else None,
+            server_hostname=self.host if self.use_tls else None,
+            limit=self.header_limit,
+        )
+        self.connects += 1
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = None
+        self.writer = None
+
+    def _head(self, method, target, headers, body_length, host_header):
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host_header}", f"User-Agent: {USER_AGENT}"]
+        if self.cookies:
+            lines.append("Cookie: " + "; ".join(f"{k}={v}" for k, v in self.cookies.items()))
+        for name, value in headers:
+            lines.append(f"{name}: {value}")
+        if body_length is None:
+            lines.append("Transfer-Encoding: chunked")
+        elif body_length or method in ("POST", "PUT", "PATCH"):
+            lines.append(f"Content-Length: {body_length}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def request(self, method, target, headers=(), body=b"", keep_body=False, host_header=None, on_chunk=None):
+        """요청 하나를 보내고 응답을 끝까지 읽음 (keep_body=False 면 본문은 버리고 길이만)
+
+        body 는 bytes, StreamBody, 또는 async iterable (length 속성이 없거나 None 이면 chunked 로 보냄).
+        on_chunk 가 있으면 응답 본문을 읽을 때마다 읽은 바이트 수로 호출합니다.
+        """
+        if self.writer is None:
+            await self._connect()
+        writer = self.writer
+        streamed = hasattr(body, "__aiter__")
+        if streamed:
+            length = getattr(body, "length", None)
+        else:
+            length = body.length if isinstance(body, StreamBody) else len(body)
+        writer.write(self._head(method, target, headers, length, host_header or self.host))
+        if streamed:
+            async for piece in body:
+                writer.write(b"%x\r\n%s\r\n" % (len(piece), piece) if length is None else piece)
+                await writer.drain()
+            if length is None:
+                writer.write(b"0\r\n\r\n")
+        elif isinstance(body, StreamBody):
+            for piece in body.chunks():
+                writer.write(piece)
+                await writer.drain()
+        elif body:
+            writer.write(body)
+        await writer.drain()
+        started = time.perf_counter()
+        try:
+            response = await self._read_response(method, keep_body, started, on_chunk)
+        except (asyncio.IncompleteReadError, ConnectionError, HttpError):
+            self.close()
+            raise
+        for value in response.header_list("set-cookie"):
+            name, _, rest = value.partition("=")
+            self.cookies[name.strip()] = rest.split(";", 1)[0].strip()
+        connection = (response.header("connection") or "").lower()
+        if connection == "close":
+            self.close()
+        return response
+
+    async def _read_response(self, method, keep_body, started, on_chunk=None):
+        reader = self.reader
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.LimitOverrunError as exc:
+                raise HttpError("응답 헤더가 너무 큽니다") from exc
+            ttfb = time.perf_counter() - started
+            lines = head.decode("latin-1").split("\r\n")
+            parts = lines[0].split(" ", 2)
+            if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+                raise HttpError(f"잘못된 상태 줄: {lines[0]!r}")
+            status = int(parts[1])
+            headers = []
+            for line in lines[1:]:
+                if line:
+                    name, _, value = line.partition(":")
+                    headers.append((name.strip().lower(), value.strip()))
+            # 1xx 중간 응답은 건너뜀
+            if status >= 200 or status == 101:
+                break
+        body = bytearray() if keep_body else None
+        body_bytes = 0
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            pass
+        else:
+            lookup = dict(headers)
+            if "chunked" in lookup.get("transfer-encoding", "").lower():
+                while True:
+                    size_line = await reader.readuntil(b"\r\n")
+                    size = int(size_line.split(b";", 1)[0].strip(), 16)
+                    if size == 0:
+                        # 트레일러까지 소비
+                        while (await reader.readuntil(b"\r\n")) != b"\r\n":
+                            pass
+                        break
+                    body_bytes += await self._read_exact(size, body, on_chunk)
+                    await reader.readexactly(2)
+            elif "content-length" in lookup:
+                body_bytes = await self._read_exact(int(lookup["content-length"]), body, on_chunk)
+            else:
+                # 길이 정보가 없으면 연결 종료까지가 본문
+                while chunk := await reader.read(READ_CHUNK):
+                    body_bytes += len(chunk)
+                    if on_chunk is not None:
+                        on_chunk(len(chunk))
+                    if body is not None:
+                        body += chunk
+                self.close()
+        return HttpResponse(status, headers, bytes(body) if body is not None else None, body_bytes, ttfb)
+
+    async def _read_exact(self, size, sink, on_chunk=None):
+        remaining = size
+        while remaining:
+            chunk = await self.reader.read(min(remaining, READ_CHUNK))
+            if not chunk:
+                raise asyncio.IncompleteReadError(b"", remaining)
+            remaining -= len(chunk)
+            if on_chunk is not None:
+                on_chunk(len(chunk))
+            if sink is not None:
+                sink += chunk
+        return size
+
+
+class Target:
+    """벤치마크 대상 URL 해석 결과"""
+
+    def __init__(self, url, connect=None, insecure=False):
+        parts = urlsplit(url if "://" in url else f"http://{url}")
+        self.url = url
+        self.use_tls = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.use_tls else 80)
+        self.base_path = parts.path.rstrip("/")
+        default_port = 443 if self.use_tls else 80
+        self.host_header = self.host if self.port == default_port else f"{self.host}:{self.port}"
+        self.connect_host = None
+        if connect:
+            self.connect_host, _, connect_port = connect.rpartition(":")
+            if connect_port:
+                self.port = int(connect_port)
+        self.ssl_context = None
+        if self.use_tls:
+            self.ssl_context = ssl.create_default_context()
+            if insecure:
+                self.ssl_context.check_hostname = False
+                self.ssl_context.verify_mode = ssl.CERT_NONE
+
+    def connection(self):
+        return HttpConnection(self.host, self.port, self.use_tls, self.ssl_context, self.connect_host)
+
+
+class RouteSpec:
+    """믹스에 들어가는 라우트 하나 (이름, 메서드, 경로, 헤더, 본문)"""
+
+    def __init__(self, name, method, target, headers=(), body=b""):
+        self.name = name
+        self.method = method
+        self.target = target
+        self.headers = tuple(headers)
+        self.body = body
+
+
+def build_routes(mix, upload_size, timeout_seconds, origin):
+    """'경로=가중치,...' 믹스 문자열을 RouteSpec 목록과 가중치로 변환"""
+    routes, weights = [], []
+    for item in mix.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        path, _, weight = item.partition("=")
+        path = path.strip()
+        weight = float(weight) if weight else 1.0
+        if path in ("/upload", "/upload/stream"):
+            body, content_type = multipart_body(upload_size)
+            spec = RouteSpec(path, "POST", path, [("Content-Type", content_type)], body)
+        elif path == "/timeout-test":
+            spec = RouteSpec(path, "GET", f"{path}?seconds={timeout_seconds}")
+        elif path == "/cors-test":
+            spec = RouteSpec(path, "GET", path, [("Origin", origin)])
+        elif path.startswith("OPTIONS "):
+            path = path[len("OPTIONS "):]
+            spec = RouteSpec(f"OPTIONS {path}", "OPTIONS", path, [
+                ("Origin", origin), ("Access-Control-Request-Method", "POST"),
+            ])
+        else:
+            spec = RouteSpec(path, "GET", path)
+        routes.append(spec)
+        weights.append(weight)
+    if not routes:
+        raise ValueError("믹스에 라우트가 없습니다")
+    return routes, weights
+
+
+def percentile(sorted_values, pct):
+    """nearest-rank 백분위수 (정렬된 입력)"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(-(-pct * len(sorted_values) // 100)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class RouteStats:
+    """라우트별 지연/상태/오류 누적 (지연은 array('d') 에 초 단위로 저장)"""
+
+    __slots__ = ("latencies", "statuses", "errors", "bytes_in")
+
+    def __init__(self):
+        self.latencies = array("d")
+        self.statuses = {}
+        self.errors = {}
+        self.bytes_in = 0
+
+    def record(self, status, latency, body_bytes):
+        self.latencies.append(latency)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.bytes_in += body_bytes
+
+    def error(self, kind):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def report(self, elapsed):
+        values = sorted(self.latencies)
+        count = len(values)
+        failed = sum(n for status, n in self.statuses.items() if status >= 400)
+        report = {
+            "requests": count + sum(self.errors.values()),
+            "responses": count,
+            "http_errors": failed,
+            "transport_errors": sum(self.errors.values()),
+            "status_codes": {str(k): v for k, v in sorted(self.statuses.items())},
+            "errors": dict(sorted(self.errors.items())),
+            "throughput_rps": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+            "bytes_in": self.bytes_in,
+            "latency_ms": {
+                "mean": round(sum(values) / count * 1000, 3) if count else None,
+                "max": round(values[-1] * 1000, 3) if count else None,
+            },
+        }
+        for pct in PERCENTILES:
+            value = percentile(values, pct)
+            report["latency_ms"][f"p{pct:g}".replace(".", "")] = round(value * 1000, 3) if value is not None else None
+        return report
+
+
+class Benchmark:
+    """폐쇄 루프(동시성 고정) 또는 개방 루프(요청률 고정) 부하 실행기"""
+
+    def __init__(self, target, routes, weights, concurrency, duration=None, total=None,
+                 rate=None, warmup=0.0, timeout=70.0, affinity_cookie=None):
+        self.target = target
+        self.routes = routes
+        self.weights = weights
+        self.concurrency = concurrency
+        self.duration = duration
+        self.total = total
+        self.rate = rate
+        self.warmup = warmup
+        self.timeout = timeout
+        self.stats = {route.name: RouteStats() for route in routes}
+        # 어피니티 집계 모드: 요청에 실린 이 쿠키 값과 응답한 파드(X-Pod-Name) 쌍을 기록
+        self.affinity_cookie = affinity_cookie
+        self.affinity = AffinityTracker() if affinity_cookie else None
+        self.dropped = 0
+        self._issued = 0
+        self._record_from = 0.0
+
+    def _pick(self):
+        return random.choices(self.routes, self.weights)[0]
+
+    def _more(self, deadline):
+        if self.total is not None and self._issued >= self.total:
+            return False
+        return deadline is None or time.perf_counter() < deadline
+
+    async def _one(self, conn, route, scheduled):
+        """요청 하나 실행 - 지연은 예정 시각부터 측정 (개방 루프의 coordinated omission 방지)"""
+        stats = self.stats[route.name]
+        sticky = conn.cookies.get(self.affinity_cookie) if self.affinity is not None else None
+        try:
+            response = await asyncio.wait_for(
+                conn.request(route.method, self.target.base_path + route.target, route.headers,
+                             route.body, host_header=self.target.host_header),
+                self.timeout,
+            )
+        except TimeoutError:
+            conn.close()
+            if scheduled >= self._record_from:
+                stats.error("timeout")
+            return
+        except (OSError, asyncio.IncompleteReadError, HttpError) as exc:
+            conn.close()
+            if scheduled >= self._record_from:
+                stats.error(type(exc).__name__)
+            return
+        if scheduled >= self._record_from:
+            stats.record(response.status, time.perf_counter() - scheduled, response.body_bytes)
+            if self.affinity is not None:
+                self.affinity.record(sticky, response.header(POD_HEADER))
+        self.on_response(route, response)
+
+    def on_response(self, route, response):
+        """응답 후크 (하위 도구에서 재정의)"""
+
+    async def _closed_loop(self, deadline):
+        async def worker(conn):
+            while self._more(deadline):
+                self._issued += 1
+                await self._one(conn, self._pick(), time.perf_counter())
+            conn.close()
+
+        await asyncio.gather(*(worker(self.target.connection()) for _ in range(self.concurrency)))
+
+    async def _open_loop(self, deadline):
+        def schedule():
+            interval = 1.0 / self.rate
+            next_at = time.perf_counter()
+            while self._more(deadline):
+                yield self._pick(), next_at
+                next_at += interval
+
+        await self._paced(schedule())
+
+    async def _paced(self, schedule):
+        """(라우트, 예정 시각) 순서대로 연결 풀에서 요청 발행 - 응답을 기다리지 않고 다음 예정 시각으로"""
+        pool = asyncio.Queue()
+        for _ in range(self.concurrency):
+            pool.put_nowait(self.target.connection())
+        pending = set()
+        max_pending = self.concurrency * 10
+
+        async def issue(route, scheduled):
+            conn = await pool.get()
+            try:
+                await self._one(conn, route, scheduled)
+            finally:
+                pool.put_nowait(conn)
+
+        for route, scheduled in schedule:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._issued += 1
+            if len(pending) >= max_pending:
+                # 대상이 너무 느려 클라이언트 쪽 대기열이 넘침
+                self.dropped += 1
+            else:
+                task = asyncio.create_task(issue(route, scheduled))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
+        while not pool.empty():
+            pool.get_nowait().close()
+
+    async def run(self):
+        started = time.perf_counter()
+        self._record_from = started + self.warmup
+        deadline = started + self.warmup + self.duration if self.duration else None
+        if self.rate:
+            await self._open_loop(deadline)
+        else:
+            await self._closed_loop(deadline)
+        return time.perf_counter() - self._record_from
+
+    def report(self, elapsed):
+        routes = {name: stats.report(elapsed) for name, stats in self.stats.items()}
+        overall = RouteStats()
+        for stats in self.stats.values():
+            overall.latencies.extend(stats.latencies)
+            overall.bytes_in += stats.bytes_in
+            for status, count in stats.statuses.items():
+                overall.statuses[status] = overall.statuses.get(status, 0) + count
+            for kind, count in stats.errors.items():
+                overall.errors[kind] = overall.errors.get(kind, 0) + count
+        total = overall.report(elapsed)
+        total["client_dropped"] = self.dropped
+        report = {"routes": routes, "total": total}
+        if self.affinity is not None:
+            report["affinity"] = {"cookie": self.affinity_cookie, **self.affinity.report()}
+        return report
+
+
+async def detect_controller(target, timeout=5.0):
+    """/request-info 의 컨트롤러 이름 조회 (실패 시 None)"""
+    conn = target.connection()
+    try:
+        response = await asyncio.wait_for(
+            conn.request("GET", target.base_path + "/request-info", keep_body=True, host_header=target.host_header),
+            timeout,
+        )
+        return json.loads(response.body).get("컨트롤러")
+    except (OSError, TimeoutError, ValueError, HttpError, asyncio.IncompleteReadError):
+        return None
+    finally:
+        conn.close()
+
+
+def format_table(label, report):
+    header = f"{'route':<22}{'reqs':>9}{'rps':>10}{'err':>7}{'p50':>9}{'p90':>9}{'p99':>9}{'p999':>9}{'max':>9}  (ms)"
+    lines = [f"== {label}", header]
+    rows = list(report["routes"].items()) + [("TOTAL", report["total"])]
+    for name, stats in rows:
+        lat = stats["latency_ms"]
+
+        def ms(value):
+            return f"{value:9.2f}" if value is not None else f"{'-':>9}"
+
+        lines.append(
+            f"{name[:21]:<22}{stats['requests']:>9}{stats['throughput_rps']:>10.1f}"
+            f"{stats['http_errors'] + stats['transport_errors']:>7}"
+            f"{ms(lat['p50'])}{ms(lat['p90'])}{ms(lat['p99'])}{ms(lat['p999'])}{ms(lat['max'])}"
+        )
+    affinity = report.get("affinity")
+    if affinity is not None:
+        def ratio(value):
+            return f"{value:.2%}" if value is not None else "-"
+
+        share = ", ".join(f"{pod} {value:.1%}" for pod, value in affinity["replica_share"].items())
+        lines.append(
+            f"affinity[{affinity['cookie']}]: stickiness {ratio(affinity['stickiness'])}, "
+            f"moves {affinity['moves']}, remap {ratio(affinity['remap_rate'])} "
+            f"after {len(affinity['replica_changes'])} replica change(s)"
+        )
+        lines.append(f"replica share: {share or '-'}")
+    return "\n".join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py bench", description="인그레스 컨트롤러 비교 벤치마크")
+    parser.add_argument("urls", nargs="+", help="대상 base URL (여러 개면 차례로 실행)")
+    parser.add_argument("-c", "--concurrency", type=int, default=32, help="동시 연결 수 (기본 32)")
+    parser.add_argument("-d", "--duration", type=float, default=30.0, help="측정 시간(초), 0이면 -n 기준")
+    parser.add_argument("-n", "--requests", type=int, default=None, help="총 요청 수")
+    parser.add_argument("-r", "--rate", type=float, default=None, help="초당 요청 수 (지정 시 개방 루프)")
+    parser.add_argument("--warmup", type=float, default=0.0, help="결과에서 제외할 워밍업 시간(초)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"라우트=가중치 목록 (기본 {DEFAULT_MIX})")
+    parser.add_argument("--upload-size", type=int, default=64 * 1024, help="/upload 파일 크기(bytes)")
+    parser.add_argument("--timeout-seconds", type=float, default=1.0, help="/timeout-test 의 seconds 값")
+    parser.add_argument("--origin", default="https://bench.example.com", help="/cors-test 에 보낼 Origin")
+    parser.add_argument("--timeout", type=float, default=70.0, help="요청별 타임아웃(초)")
+    parser.add_argument("--connect", default=None, help="실제로 접속할 host:port (Host/SNI 는 URL 유지)")
+    parser.add_argument("--insecure", action="store_true", help="TLS 인증서 검증 생략")
+    parser.add_argument("--affinity-cookie", default=None, metavar="NAME",
+                        help="어피니티 집계 모드 - 이 쿠키 값별로 응답한 파드를 기록 (예: route)")
+    parser.add_argument("--label", default=None, help="결과 라벨 (기본: /request-info 의 컨트롤러 이름)")
+    parser.add_argument("-o", "--output", default="bench-{label}.json", help="결과 파일 경로 ({label} 치환)")
+    return parser
+
+
+async def _run(args):
+    routes, weights = build_routes(args.mix, args.upload_size, args.timeout_seconds, args.origin)
+    results = []
+    for url in args.urls:
+        target = Target(url, args.connect, args.insecure)
+        label = args.label or await detect_controller(target) or target.host
+        benchmark = Benchmark(
+            target, routes, weights, args.concurrency,
+            duration=args.duration or None, total=args.requests,
+            rate=args.rate, warmup=args.warmup, timeout=args.timeout,
+            affinity_cookie=args.affinity_cookie,
+        )
+        started_at = datetime.now(timezone.utc).isoformat()
+        elapsed = await benchmark.run()
+        report = benchmark.report(elapsed)
+        result = {
+            "label": label,
+            "target": url,
+            "started_at": started_at,
+            "elapsed_seconds": round(elapsed, 3),
+            "config": {
+                "concurrency": args.concurrency,
+                "rate": args.rate,
+                "duration": args.duration,
+                "requests": args.requests,
+                "warmup": args.warmup,
+                "mix": args.mix,
+                "upload_size": args.upload_size,
+                "timeout_seconds": args.timeout_seconds,
+                "affinity_cookie": args.affinity_cookie,
+            },
+            **report,
+        }
+        print(format_table(f"{label} ({url})", report))
+        output = args.output.replace("{label}", label.replace("/", "_"))
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"-> {output}\n")
+        results.append(result)
+    return results
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not args.duration and not args.requests:
+        print("--duration 또는 --requests 중 하나는 필요합니다", file=sys.stderr)
+        return 2
+    asyncio.run(_run(args))
+    return 0
@@ -0,0 +1,301 @@
+# buffering.py
+"""프록시 버퍼링 감지 - 정해진 간격으로 흘려보낸 본문 청크가 반대편에 언제 도착하는지 기록
+
+    POST /drip/upload?chunks=20&interval=0.1          요청 본문 청크 도착 타임라인 (nginx proxy_request_buffering,
+                                                      Envoy requestBuffer.limit 확인)
+    GET  /drip/download?chunks=20&interval=0.1&size=1K  interval 초마다 size 바이트씩 보내는 응답
+                                                      (nginx proxy_buffering / X-Accel-Buffering 확인)
+
+    python main.py drip https://nginx.seungdobae.com https://envoy.sd.seungdobae.com --chunks 20 --interval 0.1
+
+보낸 쪽은 청크를 시작 시각 + k * interval 에 보내고, 받은 쪽은 interval/2 이상 떨어진 도착을
+별개의 버스트로 묶습니다. 버스트 수가 청크 수에 가까우면 streaming, 1 이면 buffered (전부 모였다가 한 번에),
+그 사이면 partial (버퍼 크기 단위로 몰아서 전달) 입니다.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from starlette.responses import Response
+
+from bench import HttpError, Target, detect_controller
+from download import parse_size
+
+MAX_CHUNKS = 10000
+MAX_INTERVAL = 10.0
+MAX_DURATION = 300.0
+MAX_CHUNK_SIZE = 1024 * 1024
+DIRECTIONS = ("upload", "download")
+FRAMINGS = ("chunked", "length")
+ACCEL_BUFFERING = ("yes", "no")
+# 요약에 남길 버스트 수 (넘으면 앞쪽만)
+TIMELINE_POINTS = 32
+
+
+def check_params(chunks, interval, size=1):
+    """쿼리 값 검사 (잘못된 값이면 ValueError)"""
+    if not 1 <= chunks <= MAX_CHUNKS:
+        raise ValueError(f"chunks 는 1 ~ {MAX_CHUNKS} 여야 합니다")
+    if not 0 <= interval <= MAX_INTERVAL:
+        raise ValueError(f"interval 은 0 ~ {MAX_INTERVAL:g} 초여야 합니다")
+    if (chunks - 1) * interval > MAX_DURATION:
+        raise ValueError(f"(chunks - 1) * interval 은 최대 {MAX_DURATION:g} 초입니다")
+    if not 1 <= size <= MAX_CHUNK_SIZE:
+        raise ValueError(f"size 는 1 ~ {MAX_CHUNK_SIZE} bytes 여야 합니다")
+
+
+class ArrivalTimeline:
+    """받은 바이트의 도착 시각 기록 - 보낸 일정(chunks, interval)과 비교해 버퍼링 여부 판정"""
+
+    __slots__ = ("started", "arrivals")
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.arrivals = []
+
+    def mark(self, nbytes):
+        if nbytes:
+            self.arrivals.append((time.perf_counter(), nbytes))
+
+    def bursts(self, gap):
+        """gap 초 이상 떨어진 도착끼리 나눈 [(시작 시각, 바이트)]"""
+        bursts = []
+        last = None
+        for at, nbytes in self.arrivals:
+            if last is None or at - last >= gap:
+                bursts.append([at, nbytes])
+            else:
+                bursts[-1][1] += nbytes
+            last = at
+        return bursts
+
+    def summary(self, chunks, interval):
+        expected = (chunks - 1) * interval
+        if not self.arrivals:
+            return {"바이트": 0, "읽기_수": 0, "첫_바이트_ms": None, "도착_구간_ms": None,
+                    "예상_구간_ms": round(expected * 1000, 3), "버스트_수": 0, "청크_수": chunks,
+                    "판정": "판정불가", "타임라인": []}
+        first = self.arrivals[0][0]
+        last = self.arrivals[-1][0]
+        bursts = self.bursts(interval / 2) if interval > 0 else [[first, sum(n for _, n in self.arrivals)]]
+        if chunks < 2 or interval <= 0:
+            verdict = "판정불가"
+        elif len(bursts) <= 1:
+            verdict = "buffered"
+        elif len(bursts) >= chunks * 0.8:
+            verdict = "streaming"
+        else:
+            verdict = "partial"
+        return {
+            "바이트": sum(nbytes for _, nbytes in self.arrivals),
+            "읽기_수": len(self.arrivals),
+            "첫_바이트_ms": round((first - self.started) * 1000, 3),
+            "도착_구간_ms": round((last - first) * 1000, 3),
+            "예상_구간_ms": round(expected * 1000, 3),
+            "버스트_수": len(bursts),
+            "청크_수": chunks,
+            "판정": verdict,
+            # [첫 바이트 기준 ms, 버스트 바이트]
+            "타임라인": [[round((at - first) * 1000, 1), nbytes] for at, nbytes in bursts[:TIMELINE_POINTS]],
+        }
+
+
+async def receive_drip(request, chunks, interval):
+    """요청 본문을 읽으며 청크 도착 시각 기록 (핸들러 시작 = 요청 헤더 도착 기준)"""
+    timeline = ArrivalTimeline()
+    async for chunk in request.stream():
+        timeline.mark(len(chunk))
+    return timeline.summary(chunks, interval)
+
+
+def drip_chunk(seq, size, elapsed):
+    """'seq 경과ms' 줄로 시작해 size 바이트를 채운 청크 (받은 쪽에서 눈으로도 순서/시각 확인 가능)"""
+    line = f"{seq:06d} {elapsed * 1000:.3f}".encode("latin-1")[:size - 1]
+    return line + b"." * (size - len(line) - 1) + b"\n" if size > 1 else b"\n"
+
+
+class DripResponse(Response):
+    """interval 초마다 청크 하나씩 보내는 응답 - 일정은 시작 시각 + k * interval 이라 지연이 누적되지 않음"""
+
+    media_type = "text/plain; charset=utf-8"
+
+    def __init__(self, chunks, interval, size, framing="chunked", accel_buffering=None):
+        self.chunks = chunks
+        self.interval = interval
+        self.size = size
+        headers = {"cache-control": "no-cache", "x-drip-chunks": str(chunks), "x-drip-interval": f"{interval:g}"}
+        if accel_buffering is not None:
+            # nginx 가 이 응답만 버퍼링 끄기/켜기 (yes|no)
+            headers["x-accel-buffering"] = accel_buffering
+        super().__init__(content=None, headers=headers)
+        if framing == "length":
+            self.headers["content-length"] = str(chunks * size)
+        else:
+            del self.headers["content-length"]
+
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope.get("method") == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        disconnected = False
+
+        async def watch_disconnect():
+            nonlocal disconnected
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected = True
+
+        watcher = asyncio.create_task(watch_disconnect())
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            for seq in range(self.chunks):
+                delay = started + seq * self.interval - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if disconnected:
+                    return
+                body = drip_chunk(seq, self.size, loop.time() - started)
+                await send({"type": "http.response.body", "body": body, "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            watcher.cancel()
+
+
+# ===== drip CLI =====
+class DripBody:
+    """시작 시각 + k * interval 에 청크를 하나씩 내는 요청 본문 (HttpConnection.request 의 async iterable 본문)
+
+    chunked 면 length 가 None 이라 Transfer-Encoding: chunked 로 보냅니다.
+    """
+
+    def __init__(self, chunks, interval, size, framing):
+        self.chunks = chunks
+        self.interval = interval
+        self.payload = b"u" * size
+        self.length = chunks * size if framing == "length" else None
+        self.finished_at = None
+
+    async def __aiter__(self):
+        loop = asyncio.get_running_loop()
+        begin = loop.time()
+        for seq in range(self.chunks):
+            delay = begin + seq * self.interval - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield self.payload
+        # 마지막 청크를 보낸(drain) 뒤에 다시 불림
+        self.finished_at = time.perf_counter()
+
+
+async def probe_download(target, chunks, interval, size, framing, accel_buffering=None):
+    """/drip/download 응답 청크의 도착 타임라인 (응답 헤더가 늦게 오면 프록시가 본문을 다 모은 것)"""
+    query = f"chunks={chunks}&interval={interval:g}&size={size}&framing={framing}"
+    if accel_buffering is not None:
+        query += f"&accel_buffering={accel_buffering}"
+    conn = target.connection()
+    try:
+        started = time.perf_counter()
+        timeline = ArrivalTimeline(started)
+        response = await conn.request("GET", f"{target.base_path}/drip/download?{query}",
+                                      host_header=target.host_header, on_chunk=timeline.mark)
+    finally:
+        conn.close()
+    return {"방향": "download", "상태": response.status, "헤더_ms": round(response.ttfb * 1000, 3),
+            "x_accel_buffering": response.header("x-accel-buffering"), **timeline.summary(chunks, interval)}
+
+
+async def probe_upload(target, chunks, interval, size, framing):
+    """/drip/upload 로 청크를 일정대로 보내고 서버가 기록한 도착 타임라인을 받음"""
+    body = DripBody(chunks, interval, size, framing)
+    path = f"{target.base_path}/drip/upload?chunks={chunks}&interval={interval:g}"
+    conn = target.connection()
+    try:
+        started = time.perf_counter()
+        response = await conn.request("POST", path, [("Content-Type", "application/octet-stream")], body,
+                                      keep_body=True, host_header=target.host_header)
+    finally:
+        conn.close()
+    try:
+        summary = json.loads(response.body)
+    except ValueError:
+        summary = {}
+    if response.status != 200 or "판정" not in summary:
+        summary = {"판정": "판정불가", "오류": summary.get("오류") or response.body[:200].decode("utf-8", "replace")}
+    sent = body.finished_at - started
+    return {"방향": "upload", "상태": response.status, "전송_ms": round(sent * 1000, 3),
+            "응답_ms": round((sent + response.ttfb) * 1000, 3), **summary}
+
+
+def format_probe(label, rows):
+    lines = [f"== {label}", f"{'direction':<10}{'status':>7}{'first':>10}{'spread':>10}{'expect':>10}{'bursts':>8}  verdict"]
+    for row in rows:
+        def ms(value):
+            return f"{value:10.1f}" if value is not None else f"{'-':>10}"
+
+        bursts = f"{row.get('버스트_수', 0)}/{row.get('청크_수', '-')}"
+        verdict = row["판정"] + (f" ({row['오류']})" if row.get("오류") else "")
+        lines.append(f"{row['방향']:<10}{row['상태']:>7}{ms(row.get('첫_바이트_ms'))}{ms(row.get('도착_구간_ms'))}"
+                     f"{ms(row.get('예상_구간_ms'))}{bursts:>8}  {verdict}")
+    return "\n".join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py drip", description="요청/응답 본문 버퍼링 감지")
+    parser.add_argument("urls", nargs="+", help="대상 base URL (여러 개면 차례로 실행)")
+    parser.add_argument("--direction", choices=(*DIRECTIONS, "both"), default="both", help="확인할 방향 (기본 both)")
+    parser.add_argument("--chunks", type=int, default=20, help="청크 수 (기본 20)")
+    parser.add_argument("--interval", type=float, default=0.1, help="청크 간격(초) (기본 0.1)")
+    parser.add_argument("--size", default="1K", help="청크 크기 (기본 1K)")
+    parser.add_argument("--framing", choices=FRAMINGS, default="chunked",
+                        help="본문 길이 표시 방식 - chunked 또는 Content-Length (기본 chunked)")
+    parser.add_argument("--accel-buffering", choices=ACCEL_BUFFERING, default=None,
+                        help="download 응답에 X-Accel-Buffering 헤더 추가 (nginx)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="예상 구간에 더할 타임아웃(초)")
+    parser.add_argument("--connect", default=None, help="실제로 접속할 host:port (Host/SNI 는 URL 유지)")
+    parser.add_argument("--insecure", action="store_true", help="TLS 인증서 검증 생략")
+    parser.add_argument("--label", default=None, help="결과 라벨 (기본: /request-info 의 컨트롤러 이름)")
+    parser.add_argument("-o", "--output", default="drip-{label}.json", help="결과 파일 경로 ({label} 치환)")
+    return parser
+
+
+async def _run(args, size):
+    directions = DIRECTIONS if args.direction == "both" else (args.direction,)
+    timeout = (args.chunks - 1) * args.interval + args.timeout
+    for url in args.urls:
+        target = Target(url, args.connect, args.insecure)
+        label = args.label or await detect_controller(target) or target.host
+        rows = []
+        for direction in directions:
+            if direction == "upload":
+                probe = probe_upload(target, args.chunks, args.interval, size, args.framing)
+            else:
+                probe = probe_download(target, args.chunks, args.interval, size, args.framing, args.accel_buffering)
+            try:
+                rows.append(await asyncio.wait_for(probe, timeout))
+            except (OSError, TimeoutError, HttpError, asyncio.IncompleteReadError) as exc:
+                rows.append({"방향": direction, "상태": "-", "판정": "판정불가", "오류": type(exc).__name__})
+        print(format_probe(f"{label} ({url})", rows))
+        output = args.output.replace("{label}", label.replace("/", "_"))
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump({
+                "label": label, "target": url, "chunks": args.chunks, "interval": args.interval, "size": size,
+                "framing": args.framing, "accel_buffering": args.accel_buffering, "rows": rows,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"-> {output}\n")
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        size = parse_size(args.size)
+        check_params(args.chunks, args.interval, size)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    asyncio.run(_run(args, size))
+    return 0
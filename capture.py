@@ -0,0 +1,140 @@
+# capture.py
+"""최근 요청 캡처 - 미리 만든 고정 개수 레코드를 돌려 쓰는 링 버퍼, JSONL 로 내보내기
+
+    GET    /capture?limit=N   오래된 순서로 JSONL (한 줄에 요청 하나, `main.py replay` 입력 형식)
+    DELETE /capture           비우기
+
+CAPTURE_SIZE (기본 4096, 0 이면 끔) 개의 레코드를 시작 시 만들어 두고, 요청이 끝날 때마다
+가장 오래된 레코드의 슬롯 값만 덮어쓰므로 캡처가 메모리를 늘리지 않습니다.
+워커가 여럿이면 캡처는 워커별입니다.
+"""
+import json
+import os
+import time
+
+CAPTURE_SIZE = int(os.getenv("CAPTURE_SIZE", "4096") or 0)
+# 캡처하는 요청 헤더 (쿠키는 따로)
+CAPTURE_HEADERS = (
+    "host", "user-agent", "accept", "accept-encoding", "accept-language", "content-type",
+    "origin", "referer", "x-forwarded-for", "x-forwarded-proto", "x-real-ip", "x-request-id",
+)
+EXCLUDED_PATHS = frozenset({"/capture", "/metrics"})
+
+_HEADER_INDEX = {name.encode("latin-1"): index for index, name in enumerate(CAPTURE_HEADERS)}
+
+
+class CaptureRecord:
+    """요청 하나 (headers 는 CAPTURE_HEADERS 순서의 값 튜플)"""
+
+    __slots__ = ("method", "path", "query", "status", "headers", "cookies", "body_bytes",
+                 "arrived_at", "service_time")
+
+    def __init__(self):
+        self.method = None
+        self.path = None
+        self.query = None
+        self.status = None
+        self.headers = ()
+        self.cookies = None
+        self.body_bytes = 0
+        self.arrived_at = 0.0
+        self.service_time = 0.0
+
+    def to_dict(self):
+        return {
+            "method": self.method,
+            "path": self.path,
+            "query": self.query,
+            "status": self.status,
+            "headers": {name: value for name, value in zip(CAPTURE_HEADERS, self.headers) if value is not None},
+            "cookies": self.cookies,
+            "body_bytes": self.body_bytes,
+            "arrived_at": round(self.arrived_at, 6),
+            "service_ms": round(self.service_time * 1000, 3),
+        }
+
+
+class CaptureRing:
+    """고정 크기 링 버퍼 - 가득 차면 가장 오래된 레코드를 덮어씀"""
+
+    def __init__(self, size=CAPTURE_SIZE):
+        self.size = size
+        self.records = [CaptureRecord() for _ in range(size)]
+        self.next = 0
+        self.count = 0
+
+    def claim(self):
+        record = self.records[self.next]
+        self.next = (self.next + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+        return record
+
+    def clear(self):
+        cleared = self.count
+        self.next = 0
+        self.count = 0
+        return cleared
+
+    def recent(self, limit=None):
+        """오래된 것부터 (limit 이 있으면 최근 limit 개)"""
+        count = self.count if limit is None else max(0, min(limit, self.count))
+        start = (self.next - count) % self.size if self.size else 0
+        return [self.records[(start + offset) % self.size] for offset in range(count)]
+
+    def to_jsonl(self, limit=None):
+        # 완료 순서로 쌓이므로 도착 시각 순으로 다시 정렬
+        records = sorted(self.recent(limit), key=lambda record: record.arrived_at)
+        return "".join(json.dumps(record.to_dict(), ensure_ascii=False) + "\n" for record in records)
+
+
+class CaptureMiddleware:
+    """요청이 끝나면 메서드/경로/선택 헤더/쿠키/본문 크기/도착 시각/처리 시간을 링에 기록"""
+
+    def __init__(self, app, ring):
+        self.app = app
+        self.ring = ring
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        arrived_at = time.time()
+        started = time.perf_counter()
+        status = None
+        body_bytes = 0
+
+        async def receive_wrapper():
+            nonlocal body_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                body_bytes += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            headers = [None] * len(CAPTURE_HEADERS)
+            cookies = None
+            for name, value in scope["headers"]:
+                index = _HEADER_INDEX.get(name)
+                if index is not None:
+                    headers[index] = value.decode("latin-1")
+                elif name == b"cookie":
+                    cookies = value.decode("latin-1")
+            record = self.ring.claim()
+            record.method = scope["method"]
+            record.path = scope["path"]
+            record.query = scope["query_string"].decode("latin-1") or None
+            record.status = status
+            record.headers = tuple(headers)
+            record.cookies = cookies
+            record.body_bytes = body_bytes
+            record.arrived_at = arrived_at
+            record.service_time = time.perf_counter() - started
@@ -0,0 +1,180 @@
+# clientip.py
+"""신뢰 프록시 체인으로 실제 클라이언트 IP 찾기 - 응답마다 X-Client-IP / X-Client-Hops 헤더
+
+    TRUSTED_PROXIES   신뢰할 프록시 CIDR 목록 (쉼표 구분, 기본: 루프백 + 사설 대역)
+                      예) 10.0.0.0/16 (values 파일의 vpc_cidr, nginx set-real-ip-from, Traefik trustedIPs 와 같게)
+
+연결 상대(peer)부터 시작해서 Forwarded(for=) 또는 X-Forwarded-For 를 오른쪽부터 거슬러 올라가며
+신뢰 대역이 아닌 첫 주소를 클라이언트로 봅니다. 전달 헤더가 없고 peer 가 신뢰 대역이면 X-Real-IP 를 씁니다.
+hops 는 클라이언트와 앱 사이에서 거친 신뢰 프록시 수입니다.
+
+CIDR 은 주소 패밀리별로 겹치는 구간을 합친 정렬된 (시작, 끝) 정수 구간 목록이라 조회는 bisect 한 번이고,
+(peer, 전달 헤더) 조합별 결과는 LRU 캐시에 두어 같은 프록시/클라이언트 조합은 다시 계산하지 않습니다.
+"""
+import functools
+import ipaddress
+import os
+from bisect import bisect_right
+
+SCOPE_KEY = "ingress_echo.client"
+DEFAULT_TRUSTED = "127.0.0.0/8,::1/128,10.0.0.0/8,172.16.0.0/12,192.168.0.0/16,fc00::/7"
+IP_HEADER = b"x-client-ip"
+HOPS_HEADER = b"x-client-hops"
+
+
+class CidrIndex:
+    """신뢰 대역 - 패밀리별 정렬된 구간 목록"""
+
+    def __init__(self, cidrs):
+        ranges = {4: [], 6: []}
+        for cidr in cidrs:
+            network = ipaddress.ip_network(cidr.strip(), strict=False)
+            ranges[network.version].append((int(network.network_address), int(network.broadcast_address)))
+        self.starts = {}
+        self.ends = {}
+        for version, items in ranges.items():
+            merged = []
+            for start, end in sorted(items):
+                if merged and start <= merged[-1][1] + 1:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            self.starts[version] = [start for start, _ in merged]
+            self.ends[version] = [end for _, end in merged]
+        self.cidrs = tuple(cidr.strip() for cidr in cidrs)
+
+    @classmethod
+    def from_env(cls):
+        value = os.getenv("TRUSTED_PROXIES", "").strip() or DEFAULT_TRUSTED
+        return cls([item for item in value.split(",") if item.strip()])
+
+    def __contains__(self, address):
+        starts = self.starts[address.version]
+        index = bisect_right(starts, int(address)) - 1
+        return index >= 0 and int(address) <= self.ends[address.version][index]
+
+
+def parse_address(value):
+    """전달 헤더의 주소 하나 → ip_address (포트/대괄호/따옴표 제거, 해석 불가면 None)"""
+    value = value.strip().strip('"')
+    if value.startswith("["):
+        value = value[1:value.find("]")] if "]" in value else value[1:]
+    elif value.count(":") == 1:
+        # IPv4:port
+        value = value.partition(":")[0]
+    try:
+        address = ipaddress.ip_address(value)
+    except ValueError:
+        return None
+    if address.version == 6 and address.ipv4_mapped is not None:
+        return address.ipv4_mapped
+    return address
+
+
+def forwarded_for(value):
+    """RFC 7239 Forwarded 헤더의 for= 값 목록 (왼쪽 = 처음 홉)"""
+    hops = []
+    for element in value.split(","):
+        for pair in element.split(";"):
+            name, _, item = pair.strip().partition("=")
+            if name.lower() == "for":
+                hops.append(item)
+    return hops
+
+
+class ResolvedClient:
+    """해석 결과 - 응답 헤더 두 개는 미리 인코딩해 둠"""
+
+    __slots__ = ("ip", "hops", "peer", "source", "chain", "headers")
+
+    def __init__(self, ip, hops, peer, source, chain):
+        self.ip = ip
+        self.hops = hops
+        self.peer = peer
+        self.source = source
+        self.chain = chain
+        self.headers = (
+            (IP_HEADER, (ip or "unknown").encode("latin-1", "replace")),
+            (HOPS_HEADER, str(hops).encode("latin-1")),
+        )
+
+    def info(self):
+        return {"ip": self.ip, "홉_수": self.hops, "peer": self.peer, "출처": self.source, "체인": list(self.chain)}
+
+
+class ClientResolver:
+    """peer 와 전달 헤더로 실제 클라이언트를 결정 (결과는 조합별 LRU 캐시)"""
+
+    def __init__(self, trusted=None, cache_size=4096):
+        self.trusted = trusted if trusted is not None else CidrIndex.from_env()
+        self.resolve = functools.lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _trusted(self, value):
+        address = parse_address(value)
+        return address is not None and address in self.trusted
+
+    def _resolve(self, peer, x_forwarded_for, forwarded, x_real_ip):
+        if peer is None or not self._trusted(peer):
+            return ResolvedClient(peer, 0, peer, "peer", (peer,) if peer else ())
+        if forwarded is not None:
+            source, chain = "forwarded", [item.strip().strip('"') for item in forwarded_for(forwarded)]
+        elif x_forwarded_for is not None:
+            source, chain = "x-forwarded-for", [item.strip() for item in x_forwarded_for.split(",") if item.strip()]
+        elif x_real_ip is not None:
+            source, chain = "x-real-ip", [x_real_ip.strip()]
+        else:
+            return ResolvedClient(peer, 0, peer, "peer", (peer,))
+        chain.append(peer)
+        # 오른쪽(앱에 가까운 쪽)부터 신뢰 프록시를 건너뜀 - 맨 왼쪽까지 모두 신뢰면 맨 왼쪽이 클라이언트
+        hops = 0
+        index = len(chain) - 1
+        while index > 0 and self._trusted(chain[index]):
+            hops += 1
+            index -= 1
+        address = parse_address(chain[index])
+        ip = str(address) if address is not None else chain[index]
+        return ResolvedClient(ip, hops, peer, source, tuple(chain))
+
+    def resolve_scope(self, scope):
+        client = scope.get("client")
+        x_forwarded_for = forwarded = x_real_ip = None
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                # 여러 줄이면 순서대로 이어 붙임
+                value = value.decode("latin-1")
+                x_forwarded_for = value if x_forwarded_for is None else f"{x_forwarded_for}, {value}"
+            elif name == b"forwarded":
+                value = value.decode("latin-1")
+                forwarded = value if forwarded is None else f"{forwarded}, {value}"
+            elif name == b"x-real-ip":
+                x_real_ip = value.decode("latin-1")
+        return self.resolve(client[0] if client else None, x_forwarded_for, forwarded, x_real_ip)
+
+
+def current(scope):
+    """ClientIPMiddleware 가 해석한 결과 (미들웨어 밖이면 None)"""
+    extensions = scope.get("extensions")
+    return extensions.get(SCOPE_KEY) if extensions else None
+
+
+class ClientIPMiddleware:
+    """요청마다 실제 클라이언트를 해석해 scope 에 두고 응답에 X-Client-IP / X-Client-Hops 추가"""
+
+    def __init__(self, app, resolver):
+        self.app = app
+        self.resolver = resolver
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        resolved = self.resolver.resolve_scope(scope)
+        scope.setdefault("extensions", {})[SCOPE_KEY] = resolved
+        headers = resolved.headers
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", ()), *headers]}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,157 @@
+# compression.py
+"""응답 압축 헬퍼 - Accept-Encoding 협상, 미리 압축한 조각 이어붙이기, /compressible 본문 코퍼스
+
+/compressible 본문은 (크기, 엔트로피) 별로 한 번만 만들고, 인코딩(identity/gzip/br)별 결과도
+한 번만 압축해 캐시합니다. 크기는 정해진 단계(CORPUS_SIZES)만 받으므로 캐시 크기도 정해져 있습니다. 요청마다 백엔드가 압축하지 않으므로 컨트롤러가 직접 압축하는지,
+백엔드 압축을 그대로 넘기는지, 풀었다가 다시 압축하는지를 바이트/지연으로 비교할 수 있습니다.
+"""
+import functools
+import gzip
+import random
+import struct
+import zlib
+
+import brotli
+
+# gzip 헤더 (mtime 0, OS unknown) 와 마지막 빈 deflate 블록
+_GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+_DEFLATE_FINAL = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS).flush()
+
+
+@functools.lru_cache(maxsize=256)
+def choose_encoding(accept_encoding, available):
+    """Accept-Encoding 헤더에서 사용할 인코딩 선택 (없으면 'identity')
+
+    q=0 으로 거부된 인코딩은 제외하고, q 값이 같으면 available 순서를 따릅니다.
+    클라이언트별 헤더 값 종류가 적으므로 결과를 캐시합니다 (available 은 튜플).
+    """
+    if not accept_encoding:
+        return "identity"
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding] = q
+    wildcard = weights.get("*")
+    best, best_q = "identity", 0.0
+    for coding in available:
+        q = weights.get(coding, wildcard if wildcard is not None else 0.0)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def deflate_segment(data, level=6):
+    """독립적으로 이어붙일 수 있는 raw deflate 조각 생성
+
+    Z_FULL_FLUSH 로 끝내므로 바이트 경계가 맞고, 앞 조각을 참조하지 않습니다.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FULL_FLUSH)
+
+
+def gzip_frame(deflate_parts, crc, size):
+    """raw deflate 조각들을 하나의 gzip 스트림으로 감싸기"""
+    return b"".join((
+        _GZIP_HEADER,
+        *deflate_parts,
+        _DEFLATE_FINAL,
+        struct.pack("<II", crc & 0xFFFFFFFF, size & 0xFFFFFFFF),
+    ))
+
+
+# ===== /compressible 코퍼스 =====
+# 크기를 임의로 받으면 크기마다 4 MiB 까지 새로 만들고 압축하게 되므로 단계로 제한
+CORPUS_SIZES = tuple(1024 * 4 ** i for i in range(7))  # 1K, 4K, 16K, 64K, 256K, 1M, 4M
+# 압축이 잘 되는 순서
+ENTROPY_LEVELS = ("zero", "low", "medium", "high")
+# 협상 우선순위 (q 값이 같으면 앞쪽)
+CORPUS_ENCODINGS = ("br", "gzip")
+_MEDIA_TYPES = {"medium": "application/json"}
+_WORDS = (
+    b"ingress", b"controller", b"nginx", b"traefik", b"envoy", b"gateway", b"route", b"backend", b"upstream",
+    b"request", b"response", b"header", b"cookie", b"session", b"timeout", b"buffer", b"proxy", b"cluster",
+    b"service", b"pod", b"latency", b"stream", b"chunk", b"the", b"a", b"of", b"to", b"and", b"is", b"in",
+)
+_HIGH_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+_HIGH_TABLE = bytes.maketrans(bytes(range(256)), _HIGH_ALPHABET * 4)
+
+
+def check_corpus_params(size, entropy, encoding):
+    """쿼리 값 검사 (잘못된 값이면 ValueError)"""
+    if size not in CORPUS_SIZES:
+        raise ValueError("size 는 1K, 4K, 16K, 64K, 256K, 1M, 4M 중 하나여야 합니다")
+    if entropy not in ENTROPY_LEVELS:
+        raise ValueError(f"entropy 는 {', '.join(ENTROPY_LEVELS)} 중 하나여야 합니다")
+    if encoding not in ("auto", "identity", *CORPUS_ENCODINGS):
+        raise ValueError(f"encoding 은 auto, identity, {', '.join(CORPUS_ENCODINGS)} 중 하나여야 합니다")
+
+
+@functools.lru_cache(maxsize=len(CORPUS_SIZES) * len(ENTROPY_LEVELS))
+def corpus(size, entropy):
+    """엔트로피 단계별 원본 본문 (시드 고정이라 워커/파드가 달라도 같은 바이트)
+
+    zero    같은 바이트 반복 (압축률 최대)
+    low     작은 어휘의 단어 나열 (일반 텍스트 정도)
+    medium  임의 id/숫자가 들어간 JSON Lines (API 응답 정도)
+    high    64 글자 알파벳의 임의 문자 (base64 처럼 거의 압축되지 않음)
+    """
+    rng = random.Random(f"{entropy}:{size}")
+    if entropy == "zero":
+        return b"0" * size
+    if entropy == "high":
+        return rng.randbytes(size).translate(_HIGH_TABLE)
+    parts = []
+    length = 0
+    while length < size:
+        if entropy == "low":
+            piece = b" ".join(rng.choices(_WORDS, k=64)) + b"\n"
+        else:
+            piece = b'{"id":"%s","seq":%d,"value":%d,"tag":"%s"}\n' % (
+                rng.randbytes(8).hex().encode("latin-1"), length, rng.randrange(1 << 30), rng.choice(_WORDS))
+        parts.append(piece)
+        length += len(piece)
+    return b"".join(parts)[:size]
+
+
+@functools.lru_cache(maxsize=len(CORPUS_SIZES) * len(ENTROPY_LEVELS) * 3)
+def encoded_corpus(size, entropy, encoding):
+    """인코딩별 본문 - 최초 한 번만 압축 (gzip 9, brotli 9, mtime 0 이라 결과가 항상 같음)"""
+    data = corpus(size, entropy)
+    if encoding == "gzip":
+        return gzip.compress(data, 9, mtime=0)
+    if encoding == "br":
+        return brotli.compress(data, quality=9)
+    return data
+
+
+def compressible(size, entropy, encoding, accept_encoding):
+    """(본문, 헤더, media_type) - encoding 이 auto 면 Accept-Encoding 으로 협상, 아니면 그 인코딩 강제
+
+    X-Backend-* 헤더는 백엔드가 실제로 보낸 인코딩/바이트라 프록시가 Content-Encoding 을 바꿔도 남습니다.
+    ETag 는 강한 ETag 라 프록시가 재압축하면 약한 ETag(W/) 로 바뀌거나 빠지는 것도 확인할 수 있습니다.
+    """
+    if encoding == "auto":
+        encoding = choose_encoding(accept_encoding, CORPUS_ENCODINGS)
+    body = encoded_corpus(size, entropy, encoding)
+    headers = {
+        "Vary": "Accept-Encoding",
+        "ETag": f'"{entropy}-{size}-{encoding}"',
+        "X-Backend-Encoding": encoding,
+        "X-Backend-Bytes": str(len(body)),
+        "X-Uncompressed-Bytes": str(size),
+        "X-Compression-Ratio": f"{size / len(body):.2f}",
+        "X-Entropy": entropy,
+        # 프록시가 Accept-Encoding 을 지우거나 바꿔서 넘기는지
+        "X-Accept-Encoding-Received": accept_encoding or "-",
+    }
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return body, headers, _MEDIA_TYPES.get(entropy, "text/plain; charset=utf-8")
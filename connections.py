@@ -0,0 +1,145 @@
+# connections.py
+"""TCP 연결 추적 - 연결마다 ID 를 붙이고 연결당 요청 수와 수명을 기록
+
+인그레스 컨트롤러가 백엔드(파드) 연결을 재사용하는지(nginx upstream keepalive, Envoy 커넥션 풀,
+Traefik transport) 확인하기 위한 것입니다. uvicorn HTTP 프로토콜 클래스를 상속해서
+connection_made/connection_lost 와 요청 시작을 가로채며, 요청 scope 의
+extensions["ingress_echo.connection"] 로 현재 연결 정보를 넘깁니다.
+"""
+import itertools
+import os
+import socket
+import struct
+import time
+
+from uvicorn.protocols.http.h11_impl import H11Protocol
+
+try:
+    from uvicorn.protocols.http.httptools_impl import HttpToolsProtocol
+except ImportError:
+    HttpToolsProtocol = None
+
+SCOPE_KEY = "ingress_echo.connection"
+
+
+class Connection:
+    """TCP 연결 하나 (ID 는 워커 pid 와 순번)"""
+
+    __slots__ = ("id", "opened", "requests", "transport")
+
+    def __init__(self, id, transport):
+        self.id = id
+        self.opened = time.monotonic()
+        self.requests = 0
+        self.transport = transport
+
+    @property
+    def age(self):
+        return time.monotonic() - self.opened
+
+    def reset(self):
+        """SO_LINGER 0 으로 닫아 FIN 대신 RST 를 보냄 (클라이언트가 이미 끊었으면 아무것도 하지 않음)"""
+        if self.transport is None:
+            return
+        sock = self.transport.get_extra_info("socket")
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+            except OSError:
+                pass
+        self.transport.abort()
+
+    def info(self):
+        return {"id": self.id, "요청_순번": self.requests, "연결_후_초": round(self.age, 3)}
+
+
+class ConnectionRegistry:
+    """워커 프로세스의 연결 열림/닫힘 기록 - observer(Metrics) 가 있으면 통계를 넘김"""
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self.prefix = None
+        self.open = 0
+        self.observer = None
+
+    def opened(self, transport):
+        if self.prefix is None:
+            # fork 된 워커마다 다른 접두어가 되도록 처음 연결 시점의 pid 사용
+            self.prefix = f"{os.getpid()}-"
+        self.open += 1
+        if self.observer is not None:
+            self.observer.connection_opened()
+        return Connection(f"{self.prefix}{next(self._ids)}", transport)
+
+    def closed(self, connection):
+        self.open -= 1
+        connection.transport = None
+        if self.observer is not None:
+            self.observer.connection_closed(connection.requests, connection.age)
+
+
+registry = ConnectionRegistry()
+
+
+class _TrackedProtocol:
+    """uvicorn HTTP 프로토콜 믹스인 - 연결 등록과 요청 수 집계"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connection = None
+        self._inner_app = self.app
+        # uvicorn 은 요청마다 self.app 으로 ASGI 사이클을 시작함
+        self.app = self._tracked_app
+
+    def connection_made(self, transport):
+        self.connection = registry.opened(transport)
+        super().connection_made(transport)
+
+    def connection_lost(self, exc):
+        super().connection_lost(exc)
+        if self.connection is not None:
+            registry.closed(self.connection)
+            self.connection = None
+
+    def handle_websocket_upgrade(self, *args):
+        # 업그레이드하면 transport 가 WebSocket 프로토콜로 넘어가 이 객체의 connection_lost 는 불리지 않음
+        # - HTTP 연결로서는 여기서 끝난 것으로 기록 (WebSocket 세션 수는 longlived 레지스트리가 셈)
+        super().handle_websocket_upgrade(*args)
+        if self.connection is not None:
+            registry.closed(self.connection)
+            self.connection = None
+
+    async def _tracked_app(self, scope, receive, send):
+        connection = self.connection
+        if connection is not None:
+            connection.requests += 1
+            scope.setdefault("extensions", {})[SCOPE_KEY] = connection
+        await self._inner_app(scope, receive, send)
+
+
+class TrackedH11Protocol(_TrackedProtocol, H11Protocol):
+    pass
+
+
+if HttpToolsProtocol is not None:
+    class TrackedHttpToolsProtocol(_TrackedProtocol, HttpToolsProtocol):
+        pass
+else:
+    TrackedHttpToolsProtocol = None
+
+
+def protocol_class(choice):
+    """UVICORN_HTTP 값(auto | h11 | httptools) 에 맞는 추적 프로토콜 클래스"""
+    if choice == "h11":
+        return TrackedH11Protocol
+    if choice == "httptools":
+        if TrackedHttpToolsProtocol is None:
+            raise ImportError("UVICORN_HTTP=httptools 이지만 httptools 가 설치되어 있지 않습니다")
+        return TrackedHttpToolsProtocol
+    return TrackedHttpToolsProtocol or TrackedH11Protocol
+
+
+def current(scope):
+    """요청이 들어온 연결 (uvicorn 밖에서 실행 중이면 None)"""
+    extensions = scope.get("extensions")
+    return extensions.get(SCOPE_KEY) if extensions else None
@@ -0,0 +1,543 @@
+# dashboard.py
+"""대시보드 HTML 템플릿 캐시
+
+CSS/JS와 컨트롤러별 안내 문구는 컨트롤러 이름이 정해지면 바뀌지 않으므로
+시작 시 한 번만 만들고, 요청마다 쿠키/헤더/클라이언트 IP/시각만 끼워 넣습니다.
+큰 정적 조각은 gzip(raw deflate)으로 미리 압축해 두고 그대로 이어붙입니다.
+"""
+import html
+import re
+import time
+import zlib
+from datetime import datetime
+
+import clientip
+from compression import deflate_segment, gzip_frame
+
+# 이 크기 이상의 정적 조각만 미리 압축 (작은 조각은 요청별 압축기에 함께 넣음)
+_PRECOMPRESS_MIN_BYTES = 512
+_SLOT_RE = re.compile(r"@@(\w+)@@")
+
+REQUEST_HEADERS = (
+    "host", "user-agent", "x-forwarded-for", "x-real-ip",
+    "origin", "referer", "accept", "accept-language",
+    "x-forwarded-proto", "x-forwarded-host", "x-forwarded-port"
+)
+CORS_REQUEST_HEADERS = ("origin", "access-control-request-method", "access-control-request-headers")
+
+_ROUTE_COOKIE_NOTICE = """
+        <div style="margin-top: 20px; padding: 15px; background-color: #e7f3ff; border-left: 4px solid #2196F3; border-radius: 4px;">
+            <strong style="color: #1976D2;">ℹ️ route 쿠키 값이 다른 이유:</strong>
+            <ul style="margin: 10px 0 0 20px; color: #1976D2;">
+                <li><strong>nginx:</strong> 백엔드 서비스의 IP:Port를 기반으로 해시 값을 생성합니다. 형식: <code>백엔드해시.가중치.인덱스.체크섬|SHA1해시</code></li>
+                <li><strong>Traefik:</strong> 자체 알고리즘으로 백엔드 식별자를 생성합니다. 더 짧고 간단한 형식입니다.</li>
+                <li><strong>Envoy Gateway:</strong> ConsistentHash 기반으로 쿠키를 자동 생성합니다. TTL 설정이 필수이며, 첫 요청 시 Set-Cookie로 응답합니다.</li>
+                <li>각 컨트롤러가 서로 다른 알고리즘을 사용하므로 쿠키 값이 다르지만, 모두 같은 목적(세션 어피니티)을 달성합니다.</li>
+                <li>이것은 정상적인 동작이며, 각 컨트롤러가 독립적으로 동작하기 때문입니다.</li>
+            </ul>
+        </div>
+        """
+
+_TRAEFIK_NOTICE = """
+        <div style="margin-top: 20px; padding: 15px; background-color: #fff3cd; border-left: 4px solid #ffc107; border-radius: 4px;">
+            <strong style="color: #856404;">⚠️ Traefik CORS 미들웨어 동작 방식:</strong>
+            <ul style="margin: 10px 0 0 20px; color: #856404;">
+                <li>Traefik의 CORS 미들웨어는 <strong>실제 CORS 요청</strong>이 있을 때만 응답 헤더를 추가합니다.</li>
+                <li>같은 origin에서 요청하면 CORS 헤더가 보이지 않을 수 있습니다 (정상 동작).</li>
+                <li>nginx와 달리 항상 헤더를 추가하지 않습니다.</li>
+                <li><strong>테스트 방법:</strong> 브라우저 개발자 도구에서 다른 origin으로 요청하거나, curl로 <code>Origin</code> 헤더를 포함한 요청을 보내세요.</li>
+                <li>항상 CORS 헤더가 보이게 하려면 Headers 미들웨어를 사용하여 CORS 헤더를 직접 추가하는 방법을 사용하세요.</li>
+            </ul>
+            <div style="margin-top: 10px; padding-top: 10px; border-top: 1px solid #ffc107;">
+                <a href="https://doc.traefik.io/traefik/reference/routing-configuration/kubernetes/ingress-nginx/#limitations" target="_blank" style="color: #856404; text-decoration: none; font-weight: 500;">
+                    📚 Traefik 공식 문서: NGINX Ingress 제한사항 보기 →
+                </a>
+            </div>
+        </div>
+        """
+
+_ENVOY_NOTICE = """
+        <div style="margin-top: 20px; padding: 15px; background-color: #e8f5e9; border-left: 4px solid #4CAF50; border-radius: 4px;">
+            <strong style="color: #2E7D32;">⚠️ Envoy Gateway CORS & 쿠키 동작 방식:</strong>
+            <ul style="margin: 10px 0 0 20px; color: #2E7D32;">
+                <li><strong>CORS:</strong> SecurityPolicy로 설정하며, <strong>Cross-Origin 요청</strong>에만 응답 헤더가 추가됩니다.</li>
+                <li>같은 origin(Same-Origin)에서 요청하면 CORS 헤더가 보이지 않습니다 (정상 동작).</li>
+                <li><strong>테스트 방법:</strong> <code>curl -H "Origin: https://other.com" URL</code> 또는 다른 도메인에서 요청하세요.</li>
+                <li><strong>route 쿠키:</strong> BackendTrafficPolicy의 ConsistentHash Cookie로 설정됩니다.</li>
+                <li>쿠키가 자동 생성되려면 <strong>ttl 설정이 필수</strong>입니다 (예: 24h).</li>
+                <li>첫 요청 시 <code>Set-Cookie: route=...</code> 헤더로 응답하며, 이후 요청에서 같은 백엔드로 라우팅됩니다.</li>
+                <li><strong>보안 헤더:</strong> HTTPRoute의 ResponseHeaderModifier filter로 추가됩니다 (SecurityPolicy에서는 미지원).</li>
+            </ul>
+            <div style="margin-top: 10px; padding-top: 10px; border-top: 1px solid #4CAF50;">
+                <a href="https://gateway.envoyproxy.io/latest/tasks/traffic/http-routing/" target="_blank" style="color: #2E7D32; text-decoration: none; font-weight: 500;">
+                    📚 Envoy Gateway 공식 문서: HTTP Routing 보기 →
+                </a>
+            </div>
+        </div>
+        """
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Ingress Controller Test Dashboard - @@CONTROLLER@@</title>
+    <style>
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .header {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 30px;
+            border-radius: 10px;
+            margin-bottom: 30px;
+            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+        }
+        .header h1 {
+            margin: 0;
+            font-size: 2em;
+        }
+        .header .controller {
+            margin-top: 10px;
+            font-size: 1.2em;
+            opacity: 0.9;
+        }
+        .section {
+            background: white;
+            padding: 25px;
+            margin-bottom: 20px;
+            border-radius: 8px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+        .section h2 {
+            margin-top: 0;
+            color: #333;
+            border-bottom: 2px solid #667eea;
+            padding-bottom: 10px;
+        }
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            margin-top: 15px;
+        }
+        th, td {
+            padding: 12px;
+            text-align: left;
+            border-bottom: 1px solid #ddd;
+        }
+        th {
+            background-color: #f8f9fa;
+            font-weight: 600;
+            color: #555;
+        }
+        tr:hover {
+            background-color: #f8f9fa;
+        }
+        .links {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 15px;
+            margin-top: 20px;
+        }
+        .link-card {
+            background: #f8f9fa;
+            padding: 20px;
+            border-radius: 8px;
+            border-left: 4px solid #667eea;
+            transition: transform 0.2s;
+        }
+        .link-card:hover {
+            transform: translateY(-2px);
+            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+        }
+        .link-card h3 {
+            margin: 0 0 10px 0;
+            color: #667eea;
+        }
+        .link-card a {
+            color: #667eea;
+            text-decoration: none;
+            font-weight: 500;
+        }
+        .link-card a:hover {
+            text-decoration: underline;
+        }
+        .status {
+            display: inline-block;
+            padding: 5px 10px;
+            border-radius: 5px;
+            font-size: 0.9em;
+            font-weight: 500;
+        }
+        .status.ok {
+            background-color: #d4edda;
+            color: #155724;
+        }
+        .status.none {
+            background-color: #f8d7da;
+            color: #721c24;
+        }
+        .timestamp {
+            color: #666;
+            font-size: 0.9em;
+            margin-top: 10px;
+        }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>🚀 Ingress Controller Test Dashboard - <strong>@@CONTROLLER@@</strong></h1>
+        <div class="timestamp">Last updated: @@TIMESTAMP@@</div>
+    </div>
+
+    <div class="section">
+        <h2>📊 현재 요청 정보</h2>
+        <table>
+            <tr>
+                <th>항목</th>
+                <th>값</th>
+            </tr>
+            <tr>
+                <td><strong>클라이언트 IP</strong></td>
+                <td>@@CLIENT_IP@@</td>
+            </tr>
+            <tr>
+                <td><strong>요청 URL</strong></td>
+                <td>@@URL@@</td>
+            </tr>
+            <tr>
+                <td><strong>요청 메서드</strong></td>
+                <td>@@METHOD@@</td>
+            </tr>
+        </table>
+    </div>
+
+    <div class="section">
+        <h2>🍪 쿠키 정보</h2>
+        <table>
+            <tr>
+                <th>쿠키 이름</th>
+                <th>값</th>
+            </tr>
+            @@COOKIE_ROWS@@
+        </table>
+        <div style="margin-top: 15px;">
+            <span class="status @@COOKIE_STATUS_CLASS@@">
+                @@COOKIE_STATUS@@
+            </span>
+            <span class="status @@ROUTE_STATUS_CLASS@@" style="margin-left: 10px;">
+                route 쿠키: @@ROUTE_STATUS@@
+            </span>
+        </div>
+        @@ROUTE_COOKIE_NOTICE@@
+    </div>
+
+    <div class="section">
+        <h2>📋 요청 헤더 정보</h2>
+        <table>
+            <tr>
+                <th>헤더 이름</th>
+                <th>값</th>
+            </tr>
+            @@REQUEST_HEADER_ROWS@@
+        </table>
+    </div>
+
+    <div class="section">
+        <h2>🌐 CORS 헤더 (응답)</h2>
+        <div id="cors-headers" style="color: #666; font-style: italic;">로딩 중...</div>
+        <table id="cors-headers-table" style="display: none;">
+            <tr>
+                <th>헤더 이름</th>
+                <th>값</th>
+            </tr>
+        </table>
+        <div style="margin-top: 15px; font-size: 0.9em; color: #666;">
+            <strong>CORS 요청 헤더:</strong>
+            <table style="margin-top: 10px; width: 100%;">
+                <tr>
+                    <th style="padding: 8px; background-color: #f8f9fa;">헤더 이름</th>
+                    <th style="padding: 8px; background-color: #f8f9fa;">값</th>
+                </tr>
+                @@CORS_REQUEST_ROWS@@
+            </table>
+        </div>
+        @@TRAEFIK_NOTICE@@
+        @@ENVOY_NOTICE@@
+    </div>
+
+    <div class="section">
+        <h2>🔒 보안 헤더 (응답)</h2>
+        <div id="security-headers" style="color: #666; font-style: italic;">로딩 중...</div>
+        <table id="security-headers-table" style="display: none;">
+            <tr>
+                <th>헤더 이름</th>
+                <th>값</th>
+            </tr>
+        </table>
+    </div>
+
+    <div class="section">
+        <h2>🔗 테스트 기능</h2>
+        <div class="links">
+            <div class="link-card">
+                <h3>쿠키 설정</h3>
+                <p>JSESSIONID 쿠키를 설정합니다</p>
+                <a href="/set-cookie" target="_blank">/set-cookie</a>
+            </div>
+            <div class="link-card">
+                <h3>세션 확인</h3>
+                <p>route 쿠키 확인</p>
+                <a href="/check-session" target="_blank">/check-session</a>
+            </div>
+            <div class="link-card">
+                <h3>CORS 테스트</h3>
+                <p>CORS 헤더 확인</p>
+                <a href="/cors-test" target="_blank">/cors-test</a>
+            </div>
+            <div class="link-card">
+                <h3>보안 헤더</h3>
+                <p>Security headers 확인</p>
+                <a href="/security-headers" target="_blank">/security-headers</a>
+            </div>
+            <div class="link-card">
+                <h3>리다이렉트</h3>
+                <p>내부 리다이렉트 테스트</p>
+                <a href="/redirect" target="_blank">/redirect</a>
+            </div>
+            <div class="link-card">
+                <h3>타임아웃 테스트</h3>
+                <p>프록시 타임아웃 확인</p>
+                <a href="/timeout-test?seconds=5" target="_blank">/timeout-test</a>
+            </div>
+            <div class="link-card">
+                <h3>파일 업로드</h3>
+                <p>파일 업로드 테스트 (POST)</p>
+                <a href="/upload" target="_blank">/upload</a>
+            </div>
+            <div class="link-card">
+                <h3>요청 정보</h3>
+                <p>전체 요청 정보 확인</p>
+                <a href="/request-info" target="_blank">/request-info</a>
+            </div>
+        </div>
+    </div>
+
+    <div class="section">
+        <h2>💡 사용 방법</h2>
+        <ul>
+            <li>브라우저 개발자 도구(F12)를 열어 Network 탭에서 응답 헤더를 확인하세요</li>
+            <li>Application 탭에서 쿠키를 확인할 수 있습니다</li>
+            <li>각 테스트 링크를 클릭하여 기능을 확인하세요</li>
+            <li>페이지를 새로고침하면 최신 쿠키/헤더 정보가 표시됩니다</li>
+        </ul>
+    </div>
+
+    <script>
+        // 응답 헤더 확인 (CORS 및 보안 헤더)
+        async function loadResponseHeaders() {
+            try {
+                const response = await fetch('/headers-probe', { cache: 'no-store' });
+                const corsHeaders = {
+                    'access-control-allow-origin': response.headers.get('access-control-allow-origin'),
+                    'access-control-allow-methods': response.headers.get('access-control-allow-methods'),
+                    'access-control-allow-headers': response.headers.get('access-control-allow-headers'),
+                    'access-control-allow-credentials': response.headers.get('access-control-allow-credentials'),
+                    'access-control-expose-headers': response.headers.get('access-control-expose-headers'),
+                    'access-control-max-age': response.headers.get('access-control-max-age')
+                };
+                
+                const securityHeaders = {
+                    'x-content-type-options': response.headers.get('x-content-type-options'),
+                    'x-frame-options': response.headers.get('x-frame-options'),
+                    'x-xss-protection': response.headers.get('x-xss-protection'),
+                    'strict-transport-security': response.headers.get('strict-transport-security'),
+                    'content-security-policy': response.headers.get('content-security-policy'),
+                    'pragma': response.headers.get('pragma'),
+                    'cache-control': response.headers.get('cache-control'),
+                    'referrer-policy': response.headers.get('referrer-policy')
+                };
+
+                // CORS 헤더 표시
+                const corsTable = document.getElementById('cors-headers-table');
+                const corsDiv = document.getElementById('cors-headers');
+                let corsFound = false;
+                
+                for (const [name, value] of Object.entries(corsHeaders)) {
+                    if (value) {
+                        corsFound = true;
+                        const row = corsTable.insertRow();
+                        row.insertCell(0).innerHTML = '<strong>' + name + '</strong>';
+                        row.insertCell(1).textContent = value;
+                    }
+                }
+                
+                if (corsFound) {
+                    corsDiv.style.display = 'none';
+                    corsTable.style.display = 'table';
+                } else {
+                    corsDiv.textContent = 'CORS 응답 헤더 없음';
+                }
+
+                // 보안 헤더 표시
+                const securityTable = document.getElementById('security-headers-table');
+                const securityDiv = document.getElementById('security-headers');
+                let securityFound = false;
+                
+                for (const [name, value] of Object.entries(securityHeaders)) {
+                    if (value) {
+                        securityFound = true;
+                        const row = securityTable.insertRow();
+                        row.insertCell(0).innerHTML = '<strong>' + name + '</strong>';
+                        row.insertCell(1).textContent = value;
+                    }
+                }
+                
+                if (securityFound) {
+                    securityDiv.style.display = 'none';
+                    securityTable.style.display = 'table';
+                } else {
+                    securityDiv.textContent = '보안 응답 헤더 없음';
+                }
+            } catch (error) {
+                document.getElementById('cors-headers').textContent = '헤더 로드 실패: ' + error.message;
+                document.getElementById('security-headers').textContent = '헤더 로드 실패: ' + error.message;
+            }
+        }
+        
+        // 페이지 로드 시 헤더 확인
+        loadResponseHeaders();
+    </script>
+</body>
+</html>"""
+
+
+def _rows(pairs):
+    return "".join(
+        f"<tr><td><strong>{html.escape(name)}</strong></td><td>{html.escape(value)}</td></tr>"
+        for name, value in pairs
+    )
+
+
+class DashboardTemplate:
+    """컨트롤러별 대시보드 정적 셸 + 요청별 조각 렌더러"""
+
+    def __init__(self, controller_name):
+        self.controller_name = controller_name
+        lowered = controller_name.lower()
+        text = (
+            _PAGE_TEMPLATE
+            .replace("@@CONTROLLER@@", html.escape(controller_name.upper()))
+            .replace("@@TRAEFIK_NOTICE@@", _TRAEFIK_NOTICE if lowered == "traefik" else "")
+            .replace("@@ENVOY_NOTICE@@", _ENVOY_NOTICE if lowered == "envoy-gateway" else "")
+        )
+        parts = _SLOT_RE.split(text)
+        # parts: [정적, 슬롯, 정적, 슬롯, ..., 정적]
+        self._static_text = parts[0::2]
+        self._slots = parts[1::2]
+        self._static = [part.encode("utf-8") for part in self._static_text]
+        self._static_deflate = [
+            deflate_segment(part) if len(part) >= _PRECOMPRESS_MIN_BYTES else None
+            for part in self._static
+        ]
+        # 있거나 없거나 둘 중 하나인 고정 문구 슬롯은 미리 압축해 둔 것을 재사용
+        notice = _ROUTE_COOKIE_NOTICE.encode("utf-8")
+        self._fixed_fragments = {"ROUTE_COOKIE_NOTICE": (notice, deflate_segment(notice))}
+        self._timestamp_second = -1
+        self._timestamp = ""
+
+    def _now(self):
+        # 초 단위로만 바뀌므로 같은 초 안에서는 문자열을 재사용
+        second = int(time.time())
+        if second != self._timestamp_second:
+            self._timestamp = datetime.fromtimestamp(second).strftime('%Y-%m-%d %H:%M:%S')
+            self._timestamp_second = second
+        return self._timestamp
+
+    def _fragments(self, request):
+        """요청별로 달라지는 조각 (슬롯 이름 -> 문자열)"""
+        cookies = request.cookies
+        headers = request.headers
+        resolved = clientip.current(request.scope)
+        if resolved is not None:
+            client_ip = f"{resolved.ip} (프록시 {resolved.hops}홉, peer {resolved.peer})" if resolved.hops else resolved.ip
+        else:
+            client_ip = request.client.host if request.client else None
+        has_route = "route" in cookies
+
+        request_headers = [(name, headers[name]) for name in REQUEST_HEADERS if headers.get(name)]
+        cors_headers = [(name, headers[name]) for name in CORS_REQUEST_HEADERS if headers.get(name)]
+
+        return {
+            "TIMESTAMP": self._now(),
+            "CLIENT_IP": html.escape(client_ip or "알 수 없음"),
+            "URL": html.escape(str(request.url)),
+            "METHOD": request.method,
+            "COOKIE_ROWS": _rows(cookies.items()) if cookies else "<tr><td colspan='2'>쿠키 없음</td></tr>",
+            "COOKIE_STATUS_CLASS": "ok" if cookies else "none",
+            "COOKIE_STATUS": f"쿠키 {len(cookies)}개 발견" if cookies else "쿠키 없음",
+            "ROUTE_STATUS_CLASS": "ok" if has_route else "none",
+            "ROUTE_STATUS": "있음" if has_route else "없음",
+            "ROUTE_COOKIE_NOTICE": _ROUTE_COOKIE_NOTICE if has_route else "",
+            "REQUEST_HEADER_ROWS": _rows(request_headers),
+            "CORS_REQUEST_ROWS": _rows(cors_headers) if cors_headers else (
+                "<tr><td colspan='2' style='text-align: center; color: #999;'>CORS 요청 헤더 없음</td></tr>"
+            ),
+        }
+
+    def render(self, request):
+        """비압축 HTML 문자열"""
+        fragments = self._fragments(request)
+        out = [self._static_text[0]]
+        for slot, static in zip(self._slots, self._static_text[1:]):
+            out.append(fragments[slot])
+            out.append(static)
+        return "".join(out)
+
+    def _gzip_pieces(self, fragments):
+        """(원본 바이트, 미리 압축된 deflate 또는 None) 순서열"""
+        yield self._static[0], self._static_deflate[0]
+        for slot, static, precompressed in zip(self._slots, self._static[1:], self._static_deflate[1:]):
+            fragment = fragments[slot]
+            known = self._fixed_fragments.get(slot)
+            if known is not None and fragment:
+                yield known
+            else:
+                yield fragment.encode("utf-8"), None
+            yield static, precompressed
+
+    def render_gzip(self, request):
+        """gzip 본문 - 미리 압축한 정적 조각 사이에 요청별 조각만 새로 압축"""
+        fragments = self._fragments(request)
+        compressor = zlib.compressobj(1, zlib.DEFLATED, -zlib.MAX_WBITS, 4)
+        parts = []
+        crc = 0
+        size = 0
+        region = []
+        for data, precompressed in self._gzip_pieces(fragments):
+            if precompressed is None:
+                region.append(data)
+                continue
+            if region:
+                # FULL_FLUSH 이후 출력은 이전 데이터를 참조하지 않으므로 사이에 끼워 넣어도 안전
+                chunk = b"".join(region)
+                parts.append(compressor.compress(chunk))
+                parts.append(compressor.flush(zlib.Z_FULL_FLUSH))
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+                region = []
+            parts.append(precompressed)
+            crc = zlib.crc32(data, crc)
+            size += len(data)
+        if region:
+            chunk = b"".join(region)
+            parts.append(compressor.compress(chunk))
+            parts.append(compressor.flush(zlib.Z_FULL_FLUSH))
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+        return gzip_frame(parts, crc, size)
@@ -0,0 +1,183 @@
+# download.py
+"""대용량 다운로드 - 미리 만든 버퍼의 memoryview 조각을 그대로 전송 (요청별 페이로드 할당 없음)
+
+본문의 절대 위치 i 바이트는 항상 버퍼[i % 버퍼크기] 이므로 Range 응답도 내용으로 검증할 수 있습니다.
+source=memory 는 프로세스 메모리 버퍼, source=file 은 임시 파일을 mmap 한 페이지 캐시를 씁니다.
+(uvicorn 은 ASGI zero-copy/pathsend 확장을 지원하지 않으므로 sendfile 대신 mmap 사용)
+"""
+import asyncio
+import mmap
+import os
+import re
+import tempfile
+
+from starlette.responses import Response
+
+_SIZE_RE = re.compile(r"^\s*(\d+)\s*([kmgt]?)(i?)b?\s*$", re.IGNORECASE)
+_UNITS = {"": 0, "k": 1, "m": 2, "g": 3, "t": 4}
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+MEMORY_BUFFER_SIZE = 4 * 1024 * 1024
+# 패턴 줄 길이(64)의 배수로 맞춤
+FILE_BUFFER_SIZE = max(64, int(os.getenv("DOWNLOAD_FILE_SIZE", str(64 * 1024 * 1024))) // 64 * 64)
+MAX_DOWNLOAD_SIZE = int(os.getenv("DOWNLOAD_MAX_SIZE", str(10 * 1024 ** 3)))
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+FRAMINGS = ("length", "chunked")
+
+
+def parse_size(value):
+    """'1048576', '64K', '10M', '1Gi' 같은 크기 문자열을 바이트로 (1K = 1024)"""
+    match = _SIZE_RE.match(str(value))
+    if not match:
+        raise ValueError(f"잘못된 크기: {value}")
+    number, unit, _ = match.groups()
+    return int(number) * 1024 ** _UNITS[unit.lower()]
+
+
+def _fill_pattern(view):
+    # 사람이 읽을 수 있는 64바이트 반복 줄 - 버퍼 크기가 64의 배수면 source 와 무관하게 같은 본문
+    line = b"ingress-echo download payload 0123456789abcdefghijklmnopqrstuvw\n"
+    for offset in range(0, len(view), len(line)):
+        piece = line[: len(view) - offset]
+        view[offset:offset + len(piece)] = piece
+
+
+class PayloadSource:
+    """고정 크기 버퍼를 반복해서 임의 길이 본문을 만드는 원본"""
+
+    def __init__(self, name, buffer):
+        self.name = name
+        self.view = memoryview(buffer)
+        self.size = len(self.view)
+
+    def slices(self, offset, length, chunk):
+        """[offset, offset+length) 구간을 chunk 이하 크기의 memoryview 로 순서대로 반환"""
+        view = self.view
+        size = self.size
+        end = offset + length
+        while offset < end:
+            start = offset % size
+            piece = min(chunk, end - offset, size - start)
+            yield view[start:start + piece]
+            offset += piece
+
+
+_sources = {}
+
+
+def get_source(name):
+    """원본 버퍼는 처음 요청될 때 한 번만 생성"""
+    source = _sources.get(name)
+    if source is not None:
+        return source
+    if name == "memory":
+        buffer = bytearray(MEMORY_BUFFER_SIZE)
+        _fill_pattern(memoryview(buffer))
+        source = PayloadSource(name, bytes(buffer))
+    elif name == "file":
+        fd, path = tempfile.mkstemp(prefix="ingress-echo-download-")
+        try:
+            os.ftruncate(fd, FILE_BUFFER_SIZE)
+            writable = mmap.mmap(fd, FILE_BUFFER_SIZE)
+            _fill_pattern(memoryview(writable))
+            writable.flush()
+            writable.close()
+            source = PayloadSource(name, mmap.mmap(fd, FILE_BUFFER_SIZE, access=mmap.ACCESS_READ))
+        finally:
+            os.close(fd)
+            os.unlink(path)
+    else:
+        raise ValueError(f"source 는 memory 또는 file 이어야 합니다: {name}")
+    _sources[name] = source
+    return source
+
+
+def parse_range(header, total):
+    """단일 bytes Range 해석 → (start, end) (포함 범위), 만족 불가면 ValueError, 무시할 형식이면 None"""
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        # 다중 범위 등은 지원하지 않으므로 전체 응답 (RFC 9110 상 허용)
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0:
+            raise ValueError("빈 suffix range")
+        return max(0, total - suffix), total - 1
+    start = int(first)
+    end = int(last) if last else total - 1
+    if start >= total or end < start:
+        raise ValueError("만족할 수 없는 range")
+    return start, min(end, total - 1)
+
+
+class DownloadResponse(Response):
+    """원본 버퍼 조각을 스트리밍하는 응답 (framing=length 면 Content-Length, chunked 면 생략)"""
+
+    media_type = "application/octet-stream"
+
+    def __init__(self, source, start, length, chunk, framing, status_code=200, headers=None):
+        self.source = source
+        self.start = start
+        self.length = length
+        self.chunk = chunk
+        super().__init__(content=None, status_code=status_code, headers=headers)
+        # 빈 본문 기준으로 붙은 content-length: 0 을 실제 길이로 바꾸거나(length) 빼서 chunked 로 보냄
+        if framing == "length":
+            self.headers["content-length"] = str(length)
+        else:
+            del self.headers["content-length"]
+
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope.get("method") == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        disconnected = False
+
+        async def watch_disconnect():
+            nonlocal disconnected
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected = True
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            for piece in self.source.slices(self.start, self.length, self.chunk):
+                if disconnected:
+                    return
+                await send({"type": "http.response.body", "body": piece, "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            watcher.cancel()
+
+
+def build_download(size, chunk, framing, source, range_header=None, if_range=None):
+    """쿼리 값으로 DownloadResponse 생성 (잘못된 값이면 ValueError)"""
+    total = parse_size(size)
+    chunk_size = parse_size(chunk)
+    if total > MAX_DOWNLOAD_SIZE:
+        raise ValueError(f"size 는 최대 {MAX_DOWNLOAD_SIZE} bytes 입니다")
+    if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+        raise ValueError(f"chunk 는 1 ~ {MAX_CHUNK_SIZE} bytes 여야 합니다")
+    if framing not in FRAMINGS:
+        raise ValueError("framing 은 length 또는 chunked 여야 합니다")
+    payload = get_source(source)
+    etag = f'"{total:x}-{payload.name}"'
+    headers = {"accept-ranges": "bytes", "etag": etag}
+
+    requested = range_header if not if_range or if_range == etag else None
+    try:
+        byte_range = parse_range(requested, total)
+    except ValueError:
+        return Response(status_code=416, headers={"content-range": f"bytes */{total}", **headers})
+    if byte_range is None:
+        return DownloadResponse(payload, 0, total, chunk_size, framing, headers=headers)
+    start, end = byte_range
+    headers["content-range"] = f"bytes {start}-{end}/{total}"
+    return DownloadResponse(payload, start, end - start + 1, chunk_size, framing, status_code=206, headers=headers)
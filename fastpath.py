@@ -0,0 +1,107 @@
+# fastpath.py
+"""정적 JSON 엔드포인트 fast path - FastAPI 라우팅/의존성 해석/스레드풀을 건너뛰고 직접 응답
+
+응답은 시작 시 원래 엔드포인트 함수를 한 번 호출해 FastAPI 와 같은 방식(JSONResponse,
+하위 Response 헤더 병합)으로 만들어 두므로 바이트 단위로 동일합니다.
+요청 값에 따라 달라지는 엔드포인트는 요청마다 함수만 직접 호출하고 같은 규칙으로 직렬화합니다.
+"""
+import inspect
+import json
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+def _render_json(content):
+    # JSONResponse.render 와 같은 설정
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+class _Route:
+    __slots__ = ("route", "endpoint", "parameters", "status", "headers", "body")
+
+    def __init__(self, route, endpoint):
+        self.route = route
+        self.endpoint = endpoint
+        self.parameters = tuple(inspect.signature(endpoint).parameters)
+        for name in self.parameters:
+            if name not in ("request", "response"):
+                raise TypeError(f"fast path 로 처리할 수 없는 인자: {endpoint.__name__}({name})")
+        self.status = self.headers = self.body = None
+
+    def call(self, request):
+        """FastAPI 가 주입하던 request/response 인자를 이름으로 채워 호출 → (결과, 하위 Response 헤더)"""
+        if not self.parameters:
+            return self.endpoint(), ()
+        kwargs = {}
+        sub_response = None
+        for name in self.parameters:
+            if name == "request":
+                kwargs[name] = request
+            else:
+                # FastAPI 가 의존성으로 만드는 하위 Response 와 같게 (content-length 제거)
+                sub_response = Response()
+                del sub_response.headers["content-length"]
+                kwargs[name] = sub_response
+        result = self.endpoint(**kwargs)
+        return result, sub_response.headers.raw if sub_response is not None else ()
+
+
+class FastPath:
+    """(메서드, 경로) → 미리 만든 응답 또는 요청별 호출"""
+
+    def __init__(self, app):
+        self._app_routes = {
+            (method, route.path): route
+            for route in app.routes
+            for method in getattr(route, "methods", None) or ()
+        }
+        self.routes = {}
+
+    def add(self, method, path, endpoint, per_request=False):
+        """per_request=False 면 지금 한 번 호출한 결과를 그대로 재사용"""
+        entry = _Route(self._app_routes[(method, path)], endpoint)
+        if not per_request:
+            result, extra_headers = entry.call(None)
+            if isinstance(result, Response):
+                response = result
+            else:
+                response = JSONResponse(jsonable_encoder(result))
+                response.headers.raw.extend(extra_headers)
+            entry.status = response.status_code
+            entry.headers = list(response.raw_headers)
+            entry.body = response.body
+        self.routes[(method, path)] = entry
+
+    def lookup(self, scope):
+        return self.routes.get((scope["method"], scope["path"]))
+
+
+class FastPathMiddleware:
+    """등록된 라우트만 가로채는 ASGI 미들웨어 (나머지는 FastAPI 로)
+
+    메트릭 라벨이 같도록 scope["route"] 에 원래 라우트를 남깁니다.
+    """
+
+    def __init__(self, app, fast_path):
+        self.app = app
+        self.fast_path = fast_path
+
+    async def __call__(self, scope, receive, send):
+        entry = self.fast_path.lookup(scope) if scope["type"] == "http" else None
+        if entry is None:
+            await self.app(scope, receive, send)
+            return
+        scope["route"] = entry.route
+        if entry.body is not None:
+            status, headers, body = entry.status, entry.headers, entry.body
+        else:
+            result, extra_headers = entry.call(Request(scope, receive))
+            body = _render_json(result)
+            status = 200
+            headers = [(b"content-length", str(len(body)).encode("latin-1")), (b"content-type", b"application/json")]
+            headers.extend(extra_headers)
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,324 @@
+# faults.py
+"""장애/지연 주입 - 프로필에 따라 지연 분포, 오류 응답, 연결 끊김, 헤더 지연, 본문 중간 멈춤을 흉내
+
+프로필은 라우트별로 설정 파일(FAULT_CONFIG, JSON)에 두거나 요청마다 쿼리 문자열로 지정합니다.
+
+    {
+      "profiles": {"flaky": {"latency": "lognormal:0.05,1.0", "error_rate": 0.02, "errors": [502, 503]}},
+      "routes": {"/timeout-test": "flaky", "/cors-test": {"latency": "bimodal:0.01,2,0.05"}}
+    }
+
+    ?fault=flaky                       이름 있는 프로필 사용
+    ?fault_latency=lognormal:0.05,1.0  응답 전 지연 분포 (아래 형식)
+    ?fault_error_rate=0.02             오류 응답 비율
+    ?fault_errors=502,503,504          오류 응답 상태 코드 (균등 선택)
+    ?fault_reset_rate=0.001            응답 도중 연결을 RST 로 끊는 비율
+    ?fault_header_delay=2              응답 헤더를 보내기 전 대기(초)
+    ?fault_stall=5&fault_stall_after=1024  본문 1024 바이트 후 5초 멈춤
+
+지연 분포: 0.5 | fixed:0.5 | uniform:0.1,0.3 | exp:0.2 (평균)
+         | lognormal:0.05,1.0 (중앙값, sigma) | bimodal:0.01,2,0.05 (빠름, 느림, 느릴 확률)
+"""
+import asyncio
+import json
+import math
+import os
+import random
+from urllib.parse import parse_qsl
+
+import connections
+
+QUERY_PREFIX = "fault_"
+DEFAULT_ERRORS = (502, 503, 504)
+MAX_DELAY = float(os.getenv("FAULT_MAX_DELAY", "300"))
+
+
+class InjectedReset(Exception):
+    """응답 도중 연결 끊기 - 연결 정보가 없을 때(uvicorn 밖) 서버가 본문을 마치지 못한 채 닫게 함"""
+
+
+class DelayScheduler:
+    """같은 tick(기본 1ms) 에 끝나는 대기를 타이머 하나로 묶는 sleep
+
+    asyncio.sleep 은 대기마다 TimerHandle 을 만들어 타이머 힙에 넣지만, 여기서는 tick 당
+    한 번만 넣고 대기는 목록에 추가만 하므로 수만 개의 동시 지연도 힙 크기가 tick 수에 묶입니다.
+    """
+
+    def __init__(self, resolution=0.001):
+        self.resolution = resolution
+        self._buckets = {}
+
+    async def sleep(self, seconds):
+        if not math.isfinite(seconds):
+            raise ValueError(f"대기 시간은 유한한 숫자여야 합니다: {seconds}")
+        if seconds <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        tick = math.ceil((loop.time() + seconds) / self.resolution)
+        waiters = self._buckets.get(tick)
+        if waiters is None:
+            waiters = self._buckets[tick] = []
+            loop.call_at(tick * self.resolution, self._wake, tick)
+        future = loop.create_future()
+        waiters.append(future)
+        await future
+
+    def _wake(self, tick):
+        for future in self._buckets.pop(tick, ()):
+            if not future.done():
+                future.set_result(None)
+
+    @property
+    def pending(self):
+        return sum(len(waiters) for waiters in self._buckets.values())
+
+
+scheduler = DelayScheduler()
+
+
+def _floats(spec, args, count):
+    try:
+        values = [float(arg) for arg in args.split(",")] if args else []
+    except ValueError:
+        values = []
+    if len(values) != count or any(value < 0 or math.isnan(value) for value in values):
+        raise ValueError(f"잘못된 지연 분포: {spec}")
+    return values
+
+
+def parse_latency(spec):
+    """지연 분포 문자열 → 초 단위 값을 뽑는 함수 (지연 없음이면 None)"""
+    if spec is None or str(spec).strip() in ("", "0"):
+        return None
+    spec = str(spec).strip()
+    kind, _, args = spec.partition(":")
+    if not args:
+        kind, args = "fixed", spec
+    kind = kind.lower()
+    if kind == "fixed":
+        (value,) = _floats(spec, args, 1)
+        return lambda: value
+    if kind == "uniform":
+        low, high = _floats(spec, args, 2)
+        return lambda: random.uniform(low, high)
+    if kind == "exp":
+        (mean,) = _floats(spec, args, 1)
+        return lambda: random.expovariate(1 / mean) if mean else 0.0
+    if kind == "lognormal":
+        median, sigma = _floats(spec, args, 2)
+        if median == 0:
+            raise ValueError(f"lognormal 중앙값은 0보다 커야 합니다: {spec}")
+        mu = math.log(median)
+        return lambda: random.lognormvariate(mu, sigma)
+    if kind == "bimodal":
+        fast, slow, p_slow = _floats(spec, args, 3)
+        return lambda: slow if random.random() < p_slow else fast
+    raise ValueError(f"알 수 없는 지연 분포: {spec}")
+
+
+def _rate(name, value):
+    rate = float(value)
+    if not 0 <= rate <= 1:
+        raise ValueError(f"{name} 은 0 ~ 1 사이여야 합니다: {value}")
+    return rate
+
+
+def _seconds(name, value):
+    seconds = float(value)
+    if not 0 <= seconds <= MAX_DELAY:
+        raise ValueError(f"{name} 은 0 ~ {MAX_DELAY:g}초 사이여야 합니다: {value}")
+    return seconds
+
+
+def _status_codes(value):
+    if isinstance(value, str):
+        value = [part for part in value.split(",") if part.strip()]
+    codes = tuple(int(code) for code in value)
+    if not codes or any(not 100 <= code <= 599 for code in codes):
+        raise ValueError(f"잘못된 오류 상태 코드: {value}")
+    return codes
+
+
+class FaultProfile:
+    """요청 하나에 적용할 주입 설정"""
+
+    __slots__ = ("latency", "error_rate", "errors", "reset_rate", "header_delay", "stall", "stall_after",
+                 "_sample_latency")
+
+    FIELDS = ("latency", "error_rate", "errors", "reset_rate", "header_delay", "stall", "stall_after")
+
+    def __init__(self, latency=None, error_rate=0.0, errors=DEFAULT_ERRORS, reset_rate=0.0,
+                 header_delay=0.0, stall=0.0, stall_after=0):
+        self.latency = latency
+        self._sample_latency = parse_latency(latency)
+        self.error_rate = _rate("error_rate", error_rate)
+        self.errors = _status_codes(errors)
+        self.reset_rate = _rate("reset_rate", reset_rate)
+        if self.error_rate + self.reset_rate > 1:
+            raise ValueError("error_rate + reset_rate 는 1 이하여야 합니다")
+        self.header_delay = _seconds("header_delay", header_delay)
+        self.stall = _seconds("stall", stall)
+        self.stall_after = int(stall_after)
+        if self.stall_after < 0:
+            raise ValueError(f"stall_after 는 0 이상이어야 합니다: {stall_after}")
+
+    @classmethod
+    def from_options(cls, options, base=None):
+        """dict 로 프로필 생성 - base 가 있으면 그 값을 기본으로 덮어씀"""
+        unknown = set(options) - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f"알 수 없는 fault 옵션: {', '.join(sorted(unknown))}")
+        values = {field: getattr(base, field) for field in cls.FIELDS} if base is not None else {}
+        values.update(options)
+        return cls(**values)
+
+    def sample_latency(self):
+        if self._sample_latency is None:
+            return 0.0
+        return min(max(0.0, self._sample_latency()), MAX_DELAY)
+
+
+class FaultConfig:
+    """이름 있는 프로필과 경로별 기본 프로필"""
+
+    def __init__(self, profiles=None, routes=None):
+        self.profiles = {name: FaultProfile.from_options(options) for name, options in (profiles or {}).items()}
+        self.routes = {path: self._resolve(profile) for path, profile in (routes or {}).items()}
+
+    def _resolve(self, profile):
+        if isinstance(profile, str):
+            try:
+                return self.profiles[profile]
+            except KeyError:
+                raise ValueError(f"알 수 없는 fault 프로필: {profile}") from None
+        return FaultProfile.from_options(profile)
+
+    @classmethod
+    def load(cls, path=None):
+        """FAULT_CONFIG 경로의 JSON 설정 (없으면 빈 설정)"""
+        path = path if path is not None else os.getenv("FAULT_CONFIG")
+        if not path:
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("profiles"), data.get("routes"))
+
+    def profile_for(self, scope):
+        """요청에 적용할 프로필 (없으면 None) - 쿼리 값이 경로 설정보다 우선"""
+        base = self.routes.get(scope["path"])
+        query_string = scope.get("query_string", b"")
+        if b"fault" not in query_string:
+            return base
+        options = {}
+        for key, value in parse_qsl(query_string.decode("latin-1")):
+            if key == "fault":
+                base = self._resolve(value)
+            elif key.startswith(QUERY_PREFIX):
+                options[key[len(QUERY_PREFIX):]] = value
+        if not options:
+            return base
+        return FaultProfile.from_options(options, base)
+
+
+def _json_response(status, content, injected=False):
+    body = json.dumps(content, ensure_ascii=False).encode("utf-8")
+    headers = [
+        (b"content-length", str(len(body)).encode("latin-1")),
+        (b"content-type", b"application/json"),
+    ]
+    if injected:
+        headers.append((b"x-fault-injected", b"error"))
+    return (
+        {"type": "http.response.start", "status": status, "headers": headers},
+        {"type": "http.response.body", "body": body},
+    )
+
+
+class FaultInjectionMiddleware:
+    """프로필이 있는 요청에만 지연/오류/끊김/멈춤을 적용하는 ASGI 미들웨어
+
+    주입한 내용은 X-Fault-Injected 응답 헤더로 남깁니다 (예: "latency=0.052;stall=5").
+    """
+
+    def __init__(self, app, config=None, scheduler=scheduler):
+        self.app = app
+        self.config = config if config is not None else FaultConfig.load()
+        self.scheduler = scheduler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        try:
+            profile = self.config.profile_for(scope)
+        except ValueError as exc:
+            for message in _json_response(400, {"오류": str(exc)}):
+                await send(message)
+            return
+        if profile is None:
+            await self.app(scope, receive, send)
+            return
+
+        injected = []
+        latency = profile.sample_latency()
+        if latency:
+            injected.append(f"latency={latency:.4f}")
+            await self.scheduler.sleep(latency)
+
+        roll = random.random()
+        if roll < profile.reset_rate:
+            await self._reset(scope, send)
+            return
+        if roll < profile.reset_rate + profile.error_rate:
+            status = random.choice(profile.errors)
+            for message in _json_response(status, {"오류": "주입된 오류", "상태": status}, injected=True):
+                await send(message)
+            return
+
+        if profile.header_delay:
+            injected.append(f"header_delay={profile.header_delay:g}")
+        if profile.stall:
+            injected.append(f"stall={profile.stall:g}@{profile.stall_after}")
+        await self.app(scope, receive, self._wrap_send(send, profile, ";".join(injected)))
+
+    async def _reset(self, scope, send):
+        # 헤더와 본문 일부만 보낸 뒤 TCP RST (프록시에는 upstream 조기 종료/connection reset 으로 보임)
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-length", b"1024"), (b"content-type", b"text/plain"), (b"x-fault-injected", b"reset")],
+        })
+        await send({"type": "http.response.body", "body": b"partial", "more_body": True})
+        connection = connections.current(scope)
+        if connection is None:
+            raise InjectedReset("주입된 연결 끊김")
+        connection.reset()
+
+    def _wrap_send(self, send, profile, injected):
+        if not injected:
+            return send
+        sleep = self.scheduler.sleep
+        header_value = injected.encode("latin-1")
+        sent = 0
+        stalled = not profile.stall
+
+        async def send_wrapper(message):
+            nonlocal sent, stalled
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", ()), (b"x-fault-injected", header_value)]}
+                if profile.header_delay:
+                    await sleep(profile.header_delay)
+            elif message["type"] == "http.response.body" and not stalled:
+                body = message.get("body", b"")
+                if sent + len(body) >= profile.stall_after or not message.get("more_body", False):
+                    split = max(0, profile.stall_after - sent)
+                    if split:
+                        await send({"type": "http.response.body", "body": body[:split], "more_body": True})
+                    stalled = True
+                    await sleep(profile.stall)
+                    message = {**message, "body": body[split:]}
+                else:
+                    sent += len(body)
+            await send(message)
+
+        return send_wrapper
@@ -0,0 +1,212 @@
+# headerstress.py
+"""헤더/쿠키 크기 스트레스 - 프록시 버퍼 한도(nginx large_client_header_buffers / proxy_buffer_size,
+Envoy max_request_headers_kb 등) 찾기
+
+    GET /stress/headers?count=N&size=S            X-Stress-NNNN 응답 헤더 N 개 (값 S bytes)
+    GET /stress/cookies?count=N&size=S&max_age=   Set-Cookie N 개 (값 S bytes)
+    GET|POST /stress/request-headers              받은 요청 헤더 수/전체 크기/큰 헤더/쿠키 수 보고
+
+    python main.py header-sweep https://nginx.seungdobae.com --kind request --count 1 --sizes 1K,4K,8K,16K,32K
+
+응답 헤더 값은 (시작 위치, size) 별로만 캐시하고(최대 약 8 MiB) 묶음은 요청마다 그 값을 참조해 만들며,
+요청 헤더는 scope 의 바이트 그대로 셉니다.
+값은 헤더마다 시작 위치가 다른 패턴이라 HPACK/QPACK 이 같은 값으로 압축해 버리지 않습니다.
+"""
+import argparse
+import asyncio
+import functools
+import json
+import sys
+import time
+
+from bench import HttpError, Target, detect_controller, percentile
+from download import parse_size
+
+MAX_COUNT = 10000
+MAX_SIZE = 64 * 1024
+MAX_TOTAL = 4 * 1024 * 1024
+KINDS = ("request", "request-cookies", "response", "response-cookies")
+
+# 쿠키 값에도 쓸 수 있는 문자만 (RFC 6265 cookie-octet)
+_ALPHABET = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_"
+
+
+def check_params(count, size):
+    """쿼리 값 검사 (잘못된 값이면 ValueError)"""
+    if not 0 <= count <= MAX_COUNT:
+        raise ValueError(f"count 는 0 ~ {MAX_COUNT} 여야 합니다")
+    if not 1 <= size <= MAX_SIZE:
+        raise ValueError(f"size 는 1 ~ {MAX_SIZE} bytes 여야 합니다")
+    if count * size > MAX_TOTAL:
+        raise ValueError(f"count * size 는 최대 {MAX_TOTAL} bytes 입니다")
+
+
+def filler(index, size):
+    """index 마다 시작 위치가 다른 size 바이트 값"""
+    return _filler(index % len(_ALPHABET), size)
+
+
+# 시작 위치는 len(_ALPHABET) 가지뿐이라 값 하나(최대 MAX_SIZE)만 캐시 - 128 개면 size 두 개 분량, 최대 8 MiB
+@functools.lru_cache(maxsize=128)
+def _filler(offset, size):
+    repeat = (size + offset) // len(_ALPHABET) + 1
+    return (_ALPHABET * repeat)[offset:offset + size]
+
+
+def header_block(count, size):
+    """X-Stress-NNNN: <size bytes> 헤더 목록 (ASGI raw header 튜플)"""
+    return tuple((f"x-stress-{index:04d}".encode("latin-1"), filler(index, size)) for index in range(count))
+
+
+def cookie_block(count, size, max_age):
+    """stressNNNN=<size bytes> Set-Cookie 헤더 목록 (Max-Age 가 지나면 브라우저에서 사라짐)"""
+    suffix = f"; Max-Age={max_age}; Path=/".encode("latin-1")
+    return tuple(
+        (b"set-cookie", f"stress{index:04d}=".encode("latin-1") + filler(index, size) + suffix)
+        for index in range(count)
+    )
+
+
+def block_bytes(block):
+    """헤더 묶음의 HTTP/1.1 기준 크기 ('이름: 값\\r\\n')"""
+    return sum(len(name) + len(value) + 4 for name, value in block)
+
+
+def summarize_request(headers, top=5):
+    """scope["headers"] → 헤더 수/전체 크기/가장 큰 헤더/쿠키 수 (값은 디코드하지 않음)"""
+    total = 0
+    largest = []
+    cookies = 0
+    cookie_bytes = 0
+    for name, value in headers:
+        size = len(name) + len(value) + 4
+        total += size
+        if name == b"cookie":
+            cookies += value.count(b";") + 1
+            cookie_bytes += len(value)
+        if len(largest) < top or size > largest[-1][0]:
+            largest.append((size, name))
+            largest.sort(reverse=True)
+            del largest[top:]
+    return {
+        "헤더_수": len(headers),
+        "헤더_bytes": total,
+        "큰_헤더": [{"이름": name.decode("latin-1"), "bytes": size} for size, name in largest],
+        "쿠키_수": cookies,
+        "쿠키_bytes": cookie_bytes,
+    }
+
+
+# ===== header-sweep CLI =====
+def _request_plan(kind, count, size, base_path):
+    """(대상 경로, 요청 헤더) - 요청 쪽 스트레스면 헤더를 직접 만들고, 응답 쪽이면 쿼리로 요청"""
+    if kind == "request":
+        headers = [(name.decode("latin-1"), value.decode("latin-1")) for name, value in header_block(count, size)]
+        return f"{base_path}/stress/request-headers", headers
+    if kind == "request-cookies":
+        cookie = "; ".join(f"stress{index:04d}={filler(index, size).decode('latin-1')}" for index in range(count))
+        return f"{base_path}/stress/request-headers", [("Cookie", cookie)]
+    path = "headers" if kind == "response" else "cookies"
+    return f"{base_path}/stress/{path}?count={count}&size={size}", []
+
+
+async def sweep(target, kind, count, sizes, repeat=20, timeout=10.0):
+    """크기를 키워 가며 상태 코드와 지연을 기록, 처음 실패한 크기에서 멈춤"""
+    rows = []
+    for size in sizes:
+        path, headers = _request_plan(kind, count, size, target.base_path)
+        latencies = []
+        statuses = {}
+        errors = {}
+        conn = target.connection()
+        try:
+            for _ in range(repeat):
+                started = time.perf_counter()
+                try:
+                    response = await asyncio.wait_for(
+                        conn.request("GET", path, headers, host_header=target.host_header), timeout
+                    )
+                except (OSError, TimeoutError, HttpError, asyncio.IncompleteReadError) as exc:
+                    kind_name = type(exc).__name__
+                    errors[kind_name] = errors.get(kind_name, 0) + 1
+                    conn.close()
+                    continue
+                finally:
+                    # 응답 쿠키가 다음 요청 헤더를 키우지 않도록
+                    conn.cookies.clear()
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status] = statuses.get(response.status, 0) + 1
+        finally:
+            conn.close()
+        latencies.sort()
+        ok = not errors and set(statuses) <= {200}
+        rows.append({
+            "count": count,
+            "size": size,
+            "bytes": count * size,
+            "statuses": {str(code): n for code, n in sorted(statuses.items())},
+            "errors": errors,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 3) if latencies else None,
+            "p99_ms": round(percentile(latencies, 99) * 1000, 3) if latencies else None,
+            "ok": ok,
+        })
+        if not ok:
+            break
+    return rows
+
+
+def format_sweep(label, kind, rows):
+    lines = [f"== {label} [{kind}]", f"{'count':>7}{'size':>9}{'total':>10}{'p50':>9}{'p99':>9}  result"]
+    for row in rows:
+        def ms(value):
+            return f"{value:9.2f}" if value is not None else f"{'-':>9}"
+
+        result = ", ".join(f"{code}x{n}" for code, n in row["statuses"].items())
+        if row["errors"]:
+            result = ", ".join(filter(None, [result, *(f"{name}x{n}" for name, n in row["errors"].items())]))
+        lines.append(f"{row['count']:>7}{row['size']:>9}{row['bytes']:>10}{ms(row['p50_ms'])}{ms(row['p99_ms'])}  {result}")
+    return "\n".join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py header-sweep", description="헤더/쿠키 크기 한도 탐색")
+    parser.add_argument("urls", nargs="+", help="대상 base URL (여러 개면 차례로 실행)")
+    parser.add_argument("--kind", choices=KINDS, default="request",
+                        help="request: 요청 헤더, request-cookies: Cookie 헤더, response: 응답 헤더, "
+                             "response-cookies: Set-Cookie (기본 request)")
+    parser.add_argument("--count", type=int, default=1, help="헤더/쿠키 개수 (기본 1)")
+    parser.add_argument("--sizes", default="1K,2K,4K,8K,12K,16K,24K,32K,48K,64K",
+                        help="헤더/쿠키 하나의 값 크기 목록 (작은 것부터)")
+    parser.add_argument("--repeat", type=int, default=20, help="크기별 요청 수 (기본 20)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="요청별 타임아웃(초)")
+    parser.add_argument("--connect", default=None, help="실제로 접속할 host:port (Host/SNI 는 URL 유지)")
+    parser.add_argument("--insecure", action="store_true", help="TLS 인증서 검증 생략")
+    parser.add_argument("--label", default=None, help="결과 라벨 (기본: /request-info 의 컨트롤러 이름)")
+    parser.add_argument("-o", "--output", default="headers-{label}-{kind}.json",
+                        help="결과 파일 경로 ({label}, {kind} 치환)")
+    return parser
+
+
+async def _run(args, sizes):
+    for url in args.urls:
+        target = Target(url, args.connect, args.insecure)
+        label = args.label or await detect_controller(target) or target.host
+        rows = await sweep(target, args.kind, args.count, sizes, args.repeat, args.timeout)
+        print(format_sweep(f"{label} ({url})", args.kind, rows))
+        output = args.output.replace("{label}", label.replace("/", "_")).replace("{kind}", args.kind)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump({"label": label, "target": url, "kind": args.kind, "rows": rows}, f, ensure_ascii=False, indent=2)
+        print(f"-> {output}\n")
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        sizes = [parse_size(item) for item in args.sizes.split(",") if item.strip()]
+        for size in sizes:
+            check_params(args.count, size)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    asyncio.run(_run(args, sizes))
+    return 0
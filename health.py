@@ -0,0 +1,117 @@
+# health.py
+"""헬스 체크 - startup/liveness/readiness 를 앱 앞단 미들웨어에서 바로 응답
+
+    /health/startup  lifespan 시작이 끝나면 200
+    /health/live     이벤트 루프가 응답할 수 있으면 항상 200 (과부하로 재시작시키지 않도록 부하는 보지 않음)
+    /health/ready    드레인 중이거나 in-flight/이벤트 루프 지연이 한도를 넘으면 503
+
+    READY_MAX_IN_FLIGHT   이 워커의 처리 중 요청이 이 값을 넘으면 not ready (0 이면 사용 안 함)
+    READY_MAX_LOOP_LAG    이벤트 루프 지연(초)이 이 값을 넘으면 not ready (0 이면 사용 안 함)
+    DRAIN_SECONDS         SIGTERM 후 not ready 상태로 요청을 계속 받는 시간 (server.py 가 사용)
+"""
+import json
+import os
+
+STARTUP_PATH = "/health/startup"
+LIVE_PATH = "/health/live"
+READY_PATH = "/health/ready"
+
+
+def _env_float(name, default):
+    value = os.getenv(name, "").strip()
+    return float(value) if value else default
+
+
+class HealthState:
+    """워커 프로세스 하나의 시작/드레인 상태와 readiness 한도"""
+
+    def __init__(self, max_in_flight=None, max_loop_lag=None):
+        self.started = False
+        self.draining = False
+        self.max_in_flight = int(_env_float("READY_MAX_IN_FLIGHT", 0)) if max_in_flight is None else max_in_flight
+        self.max_loop_lag = _env_float("READY_MAX_LOOP_LAG", 0.0) if max_loop_lag is None else max_loop_lag
+
+    def mark_started(self):
+        self.started = True
+
+    def begin_drain(self):
+        self.draining = True
+
+    def not_ready_reason(self, metrics):
+        """준비되지 않은 이유 (준비됐으면 None)"""
+        if self.draining:
+            return "draining"
+        if not self.started:
+            return "starting"
+        if self.max_in_flight and metrics.in_flight > self.max_in_flight:
+            return f"in_flight {metrics.in_flight} > {self.max_in_flight}"
+        if self.max_loop_lag and metrics.loop_lag > self.max_loop_lag:
+            return f"loop_lag {metrics.loop_lag:.3f}s > {self.max_loop_lag:g}s"
+        return None
+
+
+state = HealthState()
+
+
+def _message(status, content):
+    body = json.dumps(content, ensure_ascii=False).encode("utf-8")
+    return (
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"content-type", b"application/json"),
+                (b"cache-control", b"no-store"),
+            ],
+        },
+        {"type": "http.response.body", "body": body},
+    )
+
+
+_OK = _message(200, {"status": "ok"})
+_STARTING = _message(503, {"status": "starting"})
+
+
+class HealthMiddleware:
+    """헬스 경로는 라우팅 없이 바로 응답하고, 드레인 중인 다른 응답에는 Connection: close 를 붙임
+
+    드레인 중 keep-alive 연결을 닫게 해서 프록시가 새 요청을 남은 파드로 보내도록 유도합니다.
+    """
+
+    def __init__(self, app, metrics, state=state):
+        self.app = app
+        self.metrics = metrics
+        self.state = state
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        if path.startswith("/health/"):
+            messages = self._probe(path)
+            if messages is not None:
+                for message in messages:
+                    await send(message)
+                return
+        if not self.state.draining:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", ()), (b"connection", b"close")]}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _probe(self, path):
+        if path == LIVE_PATH:
+            return _OK
+        if path == STARTUP_PATH:
+            return _OK if self.state.started else _STARTING
+        if path == READY_PATH:
+            reason = self.state.not_ready_reason(self.metrics)
+            return _OK if reason is None else _message(503, {"status": "not ready", "reason": reason})
+        return None
@@ -0,0 +1,272 @@
+# longlived.py
+"""오래 유지되는 연결 테스트 - SSE 틱 스트림, WebSocket 에코, 연결 수/연결당 메모리 보고
+
+    GET /sse/ticks?interval=1&payload=0   interval 초마다 tick 이벤트 (data 에 payload 바이트 패딩)
+    WS  /ws/echo?interval=&payload=       받은 메시지를 그대로 돌려줌 (interval 을 주면 tick 도 보냄)
+    GET /long-lived                       이 워커의 SSE/WebSocket 연결 수, RSS, 연결당 메모리
+
+클라이언트마다 타이머를 두지 않고 interval 별 공유 타이머(Ticker) 하나가 틱마다 future 하나를
+완료시켜 구독자 전체를 깨웁니다. 이벤트 바이트도 틱마다 payload 크기별로 한 번만 만듭니다.
+연결당 메모리는 시작 직후(lifespan)의 RSS 를 기준으로 (현재 RSS - 기준) / 연결 수 로 계산하므로
+새로 띄운 파드에서 연결 수를 늘려 가며 측정해야 의미가 있습니다 (Python 은 해제한 메모리를 바로 돌려주지 않음).
+"""
+import asyncio
+import json
+import os
+import time
+
+from starlette.responses import Response
+
+import connections
+
+# 연결 수명 동안 열려 있는 라우트 - HTTP in-flight/지연 히스토그램에서 빼고 registry 로만 보고
+PATHS = frozenset(("/sse/ticks", "/ws/echo"))
+MIN_INTERVAL = 0.05
+MAX_INTERVAL = 3600.0
+MAX_PAYLOAD = 64 * 1024
+SSE_HEADERS = {
+    "cache-control": "no-cache",
+    # nginx 가 이벤트를 버퍼링하지 않도록
+    "x-accel-buffering": "no",
+}
+
+
+def check_params(interval, payload):
+    """쿼리 값 검사 (잘못된 값이면 ValueError)"""
+    if not MIN_INTERVAL <= interval <= MAX_INTERVAL:
+        raise ValueError(f"interval 은 {MIN_INTERVAL:g} ~ {MAX_INTERVAL:g} 초여야 합니다")
+    if not 0 <= payload <= MAX_PAYLOAD:
+        raise ValueError(f"payload 는 0 ~ {MAX_PAYLOAD} bytes 여야 합니다")
+
+
+def rss_bytes():
+    """현재 프로세스 RSS (리눅스 /proc, 그 외에는 최대 RSS)"""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class Ticker:
+    """interval 하나의 공유 타이머 - 구독자가 없으면 멈춤
+
+    틱 시각은 시작 시각 + k * interval 로 잡아 누적 지연이 생기지 않습니다.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.seq = 0
+        self.subscribers = 0
+        self._future = None
+        self._next_at = None
+        self._events = {}
+
+    def wait(self):
+        """다음 틱에 완료되는 future (구독자가 공유하므로 asyncio.shield 로 기다릴 것)"""
+        if self._future is None:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            if self._next_at is None or self._next_at < now:
+                self._next_at = now + self.interval
+            self._future = loop.create_future()
+            loop.call_at(self._next_at, self._tick)
+        return self._future
+
+    def _tick(self):
+        future, self._future = self._future, None
+        self.seq += 1
+        self._next_at += self.interval
+        self._events.clear()
+        future.set_result(self.seq)
+        if self.subscribers:
+            self.wait()
+        else:
+            self._next_at = None
+
+    def message(self, payload):
+        """현재 틱의 JSON 문자열 (payload 크기별로 틱마다 한 번 생성)"""
+        data = self._events.get(payload)
+        if data is None:
+            content = {"seq": self.seq, "time": round(time.time(), 3), "interval": self.interval}
+            if payload:
+                content["pad"] = "x" * payload
+            data = self._events[payload] = json.dumps(content)
+        return data
+
+    def event(self, payload):
+        """현재 틱의 SSE 이벤트 바이트"""
+        key = ("sse", payload)
+        data = self._events.get(key)
+        if data is None:
+            data = f"id: {self.seq}\nevent: tick\ndata: {self.message(payload)}\n\n".encode("utf-8")
+            self._events[key] = data
+        return data
+
+
+class LongLived:
+    """워커 프로세스의 SSE/WebSocket 연결 수와 interval 별 Ticker
+
+    observer(Metrics) 가 있으면 연결 수가 바뀔 때마다 게이지를 갱신합니다.
+    """
+
+    def __init__(self):
+        self.tickers = {}
+        self.sse = 0
+        self.websocket = 0
+        self.peak = 0
+        self.baseline_rss = None
+        self.observer = None
+
+    @property
+    def total(self):
+        return self.sse + self.websocket
+
+    def subscribe(self, interval):
+        """interval 의 Ticker 에 구독자 추가 (없으면 새로 만듦)"""
+        ticker = self.tickers.get(interval)
+        if ticker is None:
+            ticker = self.tickers[interval] = Ticker(interval)
+        ticker.subscribers += 1
+        return ticker
+
+    def unsubscribe(self, ticker):
+        """구독자 제거 - 마지막 구독자면 Ticker 를 목록에서 뺌 (interval 값마다 남지 않도록)"""
+        ticker.subscribers -= 1
+        if not ticker.subscribers and self.tickers.get(ticker.interval) is ticker:
+            del self.tickers[ticker.interval]
+
+    def mark_baseline(self):
+        self.baseline_rss = rss_bytes()
+
+    def changed(self, kind, delta):
+        setattr(self, kind, getattr(self, kind) + delta)
+        self.peak = max(self.peak, self.total)
+        if self.observer is not None:
+            self.observer.long_lived_state(self.sse, self.websocket)
+
+    def stats(self):
+        rss = rss_bytes()
+        total = self.total
+        per_connection = None
+        if total and self.baseline_rss is not None:
+            per_connection = max(0, rss - self.baseline_rss) // total
+        return {
+            "워커": os.getpid(),
+            "sse": self.sse,
+            "websocket": self.websocket,
+            "최대_동시": self.peak,
+            "tcp_연결": connections.registry.open,
+            "rss_bytes": rss,
+            "기준_rss_bytes": self.baseline_rss,
+            "연결당_bytes": per_connection,
+            "틱_타이머": {str(interval): ticker.subscribers for interval, ticker in self.tickers.items()},
+        }
+
+
+registry = LongLived()
+
+
+class SSEResponse(Response):
+    """공유 Ticker 에 맞춰 tick 이벤트를 보내는 ASGI 응답
+
+    연결 종료는 추적 프로토콜의 연결 정보로 틱마다 확인하므로 클라이언트별 감시 태스크가 없습니다
+    (uvicorn 밖에서 실행 중이면 receive 감시 태스크로 대신함). 드레인이 시작되면 스트림을 끝냅니다.
+    """
+
+    media_type = "text/event-stream"
+
+    def __init__(self, interval, payload, state, registry=registry):
+        self.interval = interval
+        self.payload = payload
+        self.state = state
+        self.registry = registry
+        # 본문 없이 헤더만 (Content-Length 없이 chunked 로 흘려보냄)
+        self.status_code = 200
+        self.background = None
+        self.init_headers(SSE_HEADERS)
+
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope.get("method") == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        connection = connections.current(scope)
+        watcher = None
+        disconnected = False
+        if connection is None:
+            async def watch_disconnect():
+                nonlocal disconnected
+                while (await receive())["type"] != "http.disconnect":
+                    pass
+                disconnected = True
+
+            watcher = asyncio.create_task(watch_disconnect())
+
+        registry = self.registry
+        registry.changed("sse", 1)
+        ticker = registry.subscribe(self.interval)
+        try:
+            # 연결 직후 프록시가 헤더를 흘려보내는지 바로 알 수 있도록 주석 한 줄
+            await send({"type": "http.response.body", "body": b": connected\n\n", "more_body": True})
+            while True:
+                await asyncio.shield(ticker.wait())
+                if disconnected or (connection is not None and connection.transport is None):
+                    return
+                if self.state.draining:
+                    break
+                await send({"type": "http.response.body", "body": ticker.event(self.payload), "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            registry.unsubscribe(ticker)
+            registry.changed("sse", -1)
+            if watcher is not None:
+                watcher.cancel()
+
+
+async def websocket_echo(websocket, state, interval=None, payload=0, registry=registry):
+    """받은 메시지를 그대로 돌려주고, interval 이 있으면 공유 Ticker 의 tick 도 텍스트로 보냄
+
+    tick 모드에서는 드레인이 시작되면 1001(going away) 로 닫습니다.
+    """
+    await websocket.accept()
+    registry.changed("websocket", 1)
+    try:
+        if interval is None:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                await _echo(websocket, message)
+        ticker = registry.subscribe(interval)
+        # 틱과 수신을 같이 기다려야 하므로 이 모드에서만 연결당 수신 태스크 하나를 둠
+        receiving = asyncio.ensure_future(websocket.receive())
+        ticks = asyncio.shield(ticker.wait())
+        try:
+            while True:
+                done, _ = await asyncio.wait((receiving, ticks), return_when=asyncio.FIRST_COMPLETED)
+                if receiving in done:
+                    message = receiving.result()
+                    if message["type"] == "websocket.disconnect":
+                        return
+                    await _echo(websocket, message)
+                    receiving = asyncio.ensure_future(websocket.receive())
+                if ticks in done:
+                    if state.draining:
+                        await websocket.close(1001)
+                        return
+                    await websocket.send_text(ticker.message(payload))
+                    ticks = asyncio.shield(ticker.wait())
+        finally:
+            registry.unsubscribe(ticker)
+            receiving.cancel()
+    finally:
+        registry.changed("websocket", -1)
+
+
+async def _echo(websocket, message):
+    if message.get("text") is not None:
+        await websocket.send_text(message["text"])
+    elif message.get("bytes") is not None:
+        await websocket.send_bytes(message["bytes"])
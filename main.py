@@ -1,445 +1,78 @@
 # main.py
-from fastapi import FastAPI, Response, File, UploadFile, Request
-from fastapi.responses import RedirectResponse, PlainTextResponse, HTMLResponse
-import uvicorn
+# 콜드 스타트 측정 - 다른 import 보다 먼저 (import 구간 시작 시각, STARTUP_PROFILE 모듈별 측정)
+import startup
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response, Request, WebSocket
+from fastapi.responses import RedirectResponse, PlainTextResponse, HTMLResponse, JSONResponse
+import anyio
 import asyncio
+import math
 import os
-from datetime import datetime
+import sys
 
-app = FastAPI()
+from accesslog import ACCESS_LOG_JSON, AccessLogMiddleware, AccessLogWriter
+from admission import AdmissionConfig, AdmissionMiddleware
+from affinity import POD_NAME, PodIdentityMiddleware
+import buffering
+from capture import CAPTURE_SIZE, CaptureMiddleware, CaptureRing
+import clientip
+import compression
+import connections
+from dashboard import DashboardTemplate
+from download import build_download, parse_size
+from fastpath import FastPath, FastPathMiddleware
+from faults import FaultInjectionMiddleware, scheduler
+import headerstress
+import health
+import longlived
+from metrics import Metrics, MetricsMiddleware
+import server
+from upload import pick_file_part, receive_upload
+
+startup.profile.mark("imports")
+
+CONTROLLER_NAME = os.getenv("CONTROLLER_NAME", "unknown")
+# 정적 JSON 엔드포인트를 FastAPI 를 거치지 않고 응답 (응답 바이트는 동일)
+FAST_PATH = os.getenv("FAST_PATH", "").strip().lower() in ("1", "true", "yes", "on")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    lag_monitor = asyncio.create_task(metrics.monitor_loop_lag())
+    if access_log is not None:
+        access_log.start()
+    longlived.registry.mark_baseline()
+    # 첫 동기(def) 엔드포인트가 anyio 스레드 백엔드 import 와 스레드 생성 비용을 내지 않도록 ready 전에 준비
+    await anyio.to_thread.run_sync(lambda: None)
+    health.state.mark_started()
+    startup.profile.mark("ready")
+    yield
+    lag_monitor.cancel()
+    if access_log is not None:
+        access_log.stop()
+
+app = FastAPI(lifespan=lifespan)
+
+# 컨트롤러 이름은 프로세스 수명 동안 바뀌지 않으므로 정적 셸은 시작 시 한 번만 생성
+dashboard = DashboardTemplate(CONTROLLER_NAME)
 
 def generate_html_dashboard(request: Request):
     """대시보드 HTML 생성"""
-    controller_name = os.getenv("CONTROLLER_NAME", "unknown")
-    
-    # 요청 정보 수집
-    cookies = dict(request.cookies)
-    headers = dict(request.headers)
-    client_ip = request.client.host if request.client else None
-    
-    # 쿠키 정보 포맷팅
-    cookies_html = ""
-    if cookies:
-        for name, value in cookies.items():
-            cookies_html += f"<tr><td><strong>{name}</strong></td><td>{value}</td></tr>"
-    else:
-        cookies_html = "<tr><td colspan='2'>쿠키 없음</td></tr>"
-    
-    # 요청 헤더 정보 포맷팅
-    request_headers_html = ""
-    request_headers_list = [
-        "host", "user-agent", "x-forwarded-for", "x-real-ip", 
-        "origin", "referer", "accept", "accept-language",
-        "x-forwarded-proto", "x-forwarded-host", "x-forwarded-port"
-    ]
-    for header_name in request_headers_list:
-        header_value = headers.get(header_name.lower(), None)
-        if header_value:
-            request_headers_html += f"<tr><td><strong>{header_name}</strong></td><td>{header_value}</td></tr>"
-    
-    # CORS 관련 헤더 (요청에서 확인 가능한 것)
-    cors_request_headers = ["origin", "access-control-request-method", "access-control-request-headers"]
-    cors_request_html = ""
-    cors_request_found = False
-    for header_name in cors_request_headers:
-        header_value = headers.get(header_name.lower(), None)
-        if header_value:
-            cors_request_found = True
-            cors_request_html += f"<tr><td><strong>{header_name}</strong></td><td>{header_value}</td></tr>"
-    
-    if not cors_request_found:
-        cors_request_html = "<tr><td colspan='2' style='text-align: center; color: #999;'>CORS 요청 헤더 없음</td></tr>"
-    
-    html = f"""<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Ingress Controller Test Dashboard - {controller_name.upper()}</title>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px;
-            border-radius: 10px;
-            margin-bottom: 30px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }}
-        .header h1 {{
-            margin: 0;
-            font-size: 2em;
-        }}
-        .header .controller {{
-            margin-top: 10px;
-            font-size: 1.2em;
-            opacity: 0.9;
-        }}
-        .section {{
-            background: white;
-            padding: 25px;
-            margin-bottom: 20px;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .section h2 {{
-            margin-top: 0;
-            color: #333;
-            border-bottom: 2px solid #667eea;
-            padding-bottom: 10px;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 15px;
-        }}
-        th, td {{
-            padding: 12px;
-            text-align: left;
-            border-bottom: 1px solid #ddd;
-        }}
-        th {{
-            background-color: #f8f9fa;
-            font-weight: 600;
-            color: #555;
-        }}
-        tr:hover {{
-            background-color: #f8f9fa;
-        }}
-        .links {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 15px;
-            margin-top: 20px;
-        }}
-        .link-card {{
-            background: #f8f9fa;
-            padding: 20px;
-            border-radius: 8px;
-            border-left: 4px solid #667eea;
-            transition: transform 0.2s;
-        }}
-        .link-card:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        }}
-        .link-card h3 {{
-            margin: 0 0 10px 0;
-            color: #667eea;
-        }}
-        .link-card a {{
-            color: #667eea;
-            text-decoration: none;
-            font-weight: 500;
-        }}
-        .link-card a:hover {{
-            text-decoration: underline;
-        }}
-        .status {{
-            display: inline-block;
-            padding: 5px 10px;
-            border-radius: 5px;
-            font-size: 0.9em;
-            font-weight: 500;
-        }}
-        .status.ok {{
-            background-color: #d4edda;
-            color: #155724;
-        }}
-        .status.none {{
-            background-color: #f8d7da;
-            color: #721c24;
-        }}
-        .timestamp {{
-            color: #666;
-            font-size: 0.9em;
-            margin-top: 10px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>🚀 Ingress Controller Test Dashboard - <strong>{controller_name.upper()}</strong></h1>
-        <div class="timestamp">Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</div>
-    </div>
-
-    <div class="section">
-        <h2>📊 현재 요청 정보</h2>
-        <table>
-            <tr>
-                <th>항목</th>
-                <th>값</th>
-            </tr>
-            <tr>
-                <td><strong>클라이언트 IP</strong></td>
-                <td>{client_ip or "알 수 없음"}</td>
-            </tr>
-            <tr>
-                <td><strong>요청 URL</strong></td>
-                <td>{request.url}</td>
-            </tr>
-            <tr>
-                <td><strong>요청 메서드</strong></td>
-                <td>{request.method}</td>
-            </tr>
-        </table>
-    </div>
-
-    <div class="section">
-        <h2>🍪 쿠키 정보</h2>
-        <table>
-            <tr>
-                <th>쿠키 이름</th>
-                <th>값</th>
-            </tr>
-            {cookies_html}
-        </table>
-        <div style="margin-top: 15px;">
-            <span class="status {'ok' if cookies else 'none'}">
-                {'쿠키 ' + str(len(cookies)) + '개 발견' if cookies else '쿠키 없음'}
-            </span>
-            <span class="status {'ok' if 'route' in cookies else 'none'}" style="margin-left: 10px;">
-                route 쿠키: {'있음' if 'route' in cookies else '없음'}
-            </span>
-        </div>
-        {f'''
-        <div style="margin-top: 20px; padding: 15px; background-color: #e7f3ff; border-left: 4px solid #2196F3; border-radius: 4px;">
-            <strong style="color: #1976D2;">ℹ️ route 쿠키 값이 다른 이유:</strong>
-            <ul style="margin: 10px 0 0 20px; color: #1976D2;">
-                <li><strong>nginx:</strong> 백엔드 서비스의 IP:Port를 기반으로 해시 값을 생성합니다. 형식: <code>백엔드해시.가중치.인덱스.체크섬|SHA1해시</code></li>
-                <li><strong>Traefik:</strong> 자체 알고리즘으로 백엔드 식별자를 생성합니다. 더 짧고 간단한 형식입니다.</li>
-                <li><strong>Envoy Gateway:</strong> ConsistentHash 기반으로 쿠키를 자동 생성합니다. TTL 설정이 필수이며, 첫 요청 시 Set-Cookie로 응답합니다.</li>
-                <li>각 컨트롤러가 서로 다른 알고리즘을 사용하므로 쿠키 값이 다르지만, 모두 같은 목적(세션 어피니티)을 달성합니다.</li>
-                <li>이것은 정상적인 동작이며, 각 컨트롤러가 독립적으로 동작하기 때문입니다.</li>
-            </ul>
-        </div>
-        ''' if 'route' in cookies else ''}
-    </div>
-
-    <div class="section">
-        <h2>📋 요청 헤더 정보</h2>
-        <table>
-            <tr>
-                <th>헤더 이름</th>
-                <th>값</th>
-            </tr>
-            {request_headers_html}
-        </table>
-    </div>
-
-    <div class="section">
-        <h2>🌐 CORS 헤더 (응답)</h2>
-        <div id="cors-headers" style="color: #666; font-style: italic;">로딩 중...</div>
-        <table id="cors-headers-table" style="display: none;">
-            <tr>
-                <th>헤더 이름</th>
-                <th>값</th>
-            </tr>
-        </table>
-        <div style="margin-top: 15px; font-size: 0.9em; color: #666;">
-            <strong>CORS 요청 헤더:</strong>
-            <table style="margin-top: 10px; width: 100%;">
-                <tr>
-                    <th style="padding: 8px; background-color: #f8f9fa;">헤더 이름</th>
-                    <th style="padding: 8px; background-color: #f8f9fa;">값</th>
-                </tr>
-                {cors_request_html}
-            </table>
-        </div>
-        {f'''
-        <div style="margin-top: 20px; padding: 15px; background-color: #fff3cd; border-left: 4px solid #ffc107; border-radius: 4px;">
-            <strong style="color: #856404;">⚠️ Traefik CORS 미들웨어 동작 방식:</strong>
-            <ul style="margin: 10px 0 0 20px; color: #856404;">
-                <li>Traefik의 CORS 미들웨어는 <strong>실제 CORS 요청</strong>이 있을 때만 응답 헤더를 추가합니다.</li>
-                <li>같은 origin에서 요청하면 CORS 헤더가 보이지 않을 수 있습니다 (정상 동작).</li>
-                <li>nginx와 달리 항상 헤더를 추가하지 않습니다.</li>
-                <li><strong>테스트 방법:</strong> 브라우저 개발자 도구에서 다른 origin으로 요청하거나, curl로 <code>Origin</code> 헤더를 포함한 요청을 보내세요.</li>
-                <li>항상 CORS 헤더가 보이게 하려면 Headers 미들웨어를 사용하여 CORS 헤더를 직접 추가하는 방법을 사용하세요.</li>
-            </ul>
-            <div style="margin-top: 10px; padding-top: 10px; border-top: 1px solid #ffc107;">
-                <a href="https://doc.traefik.io/traefik/reference/routing-configuration/kubernetes/ingress-nginx/#limitations" target="_blank" style="color: #856404; text-decoration: none; font-weight: 500;">
-                    📚 Traefik 공식 문서: NGINX Ingress 제한사항 보기 →
-                </a>
-            </div>
-        </div>
-        ''' if controller_name.lower() == 'traefik' else ''}
-        {f'''
-        <div style="margin-top: 20px; padding: 15px; background-color: #e8f5e9; border-left: 4px solid #4CAF50; border-radius: 4px;">
-            <strong style="color: #2E7D32;">⚠️ Envoy Gateway CORS & 쿠키 동작 방식:</strong>
-            <ul style="margin: 10px 0 0 20px; color: #2E7D32;">
-                <li><strong>CORS:</strong> SecurityPolicy로 설정하며, <strong>Cross-Origin 요청</strong>에만 응답 헤더가 추가됩니다.</li>
-                <li>같은 origin(Same-Origin)에서 요청하면 CORS 헤더가 보이지 않습니다 (정상 동작).</li>
-                <li><strong>테스트 방법:</strong> <code>curl -H "Origin: https://other.com" URL</code> 또는 다른 도메인에서 요청하세요.</li>
-                <li><strong>route 쿠키:</strong> BackendTrafficPolicy의 ConsistentHash Cookie로 설정됩니다.</li>
-                <li>쿠키가 자동 생성되려면 <strong>ttl 설정이 필수</strong>입니다 (예: 24h).</li>
-                <li>첫 요청 시 <code>Set-Cookie: route=...</code> 헤더로 응답하며, 이후 요청에서 같은 백엔드로 라우팅됩니다.</li>
-                <li><strong>보안 헤더:</strong> HTTPRoute의 ResponseHeaderModifier filter로 추가됩니다 (SecurityPolicy에서는 미지원).</li>
-            </ul>
-            <div style="margin-top: 10px; padding-top: 10px; border-top: 1px solid #4CAF50;">
-                <a href="https://gateway.envoyproxy.io/latest/tasks/traffic/http-routing/" target="_blank" style="color: #2E7D32; text-decoration: none; font-weight: 500;">
-                    📚 Envoy Gateway 공식 문서: HTTP Routing 보기 →
-                </a>
-            </div>
-        </div>
-        ''' if controller_name.lower() == 'envoy-gateway' else ''}
-    </div>
-
-    <div class="section">
-        <h2>🔒 보안 헤더 (응답)</h2>
-        <div id="security-headers" style="color: #666; font-style: italic;">로딩 중...</div>
-        <table id="security-headers-table" style="display: none;">
-            <tr>
-                <th>헤더 이름</th>
-                <th>값</th>
-            </tr>
-        </table>
-    </div>
-
-    <div class="section">
-        <h2>🔗 테스트 기능</h2>
-        <div class="links">
-            <div class="link-card">
-                <h3>쿠키 설정</h3>
-                <p>JSESSIONID 쿠키를 설정합니다</p>
-                <a href="/set-cookie" target="_blank">/set-cookie</a>
-            </div>
-            <div class="link-card">
-                <h3>세션 확인</h3>
-                <p>route 쿠키 확인</p>
-                <a href="/check-session" target="_blank">/check-session</a>
-            </div>
-            <div class="link-card">
-                <h3>CORS 테스트</h3>
-                <p>CORS 헤더 확인</p>
-                <a href="/cors-test" target="_blank">/cors-test</a>
-            </div>
-            <div class="link-card">
-                <h3>보안 헤더</h3>
-                <p>Security headers 확인</p>
-                <a href="/security-headers" target="_blank">/security-headers</a>
-            </div>
-            <div class="link-card">
-                <h3>리다이렉트</h3>
-                <p>내부 리다이렉트 테스트</p>
-                <a href="/redirect" target="_blank">/redirect</a>
-            </div>
-            <div class="link-card">
-                <h3>타임아웃 테스트</h3>
-                <p>프록시 타임아웃 확인</p>
-                <a href="/timeout-test?seconds=5" target="_blank">/timeout-test</a>
-            </div>
-            <div class="link-card">
-                <h3>파일 업로드</h3>
-                <p>파일 업로드 테스트 (POST)</p>
-                <a href="/upload" target="_blank">/upload</a>
-            </div>
-            <div class="link-card">
-                <h3>요청 정보</h3>
-                <p>전체 요청 정보 확인</p>
-                <a href="/request-info" target="_blank">/request-info</a>
-            </div>
-        </div>
-    </div>
-
-    <div class="section">
-        <h2>💡 사용 방법</h2>
-        <ul>
-            <li>브라우저 개발자 도구(F12)를 열어 Network 탭에서 응답 헤더를 확인하세요</li>
-            <li>Application 탭에서 쿠키를 확인할 수 있습니다</li>
-            <li>각 테스트 링크를 클릭하여 기능을 확인하세요</li>
-            <li>페이지를 새로고침하면 최신 쿠키/헤더 정보가 표시됩니다</li>
-        </ul>
-    </div>
-
-    <script>
-        // 응답 헤더 확인 (CORS 및 보안 헤더)
-        async function loadResponseHeaders() {{
-            try {{
-                const response = await fetch('/');
-                const corsHeaders = {{
-                    'access-control-allow-origin': response.headers.get('access-control-allow-origin'),
-                    'access-control-allow-methods': response.headers.get('access-control-allow-methods'),
-                    'access-control-allow-headers': response.headers.get('access-control-allow-headers'),
-                    'access-control-allow-credentials': response.headers.get('access-control-allow-credentials'),
-                    'access-control-expose-headers': response.headers.get('access-control-expose-headers'),
-                    'access-control-max-age': response.headers.get('access-control-max-age')
-                }};
-                
-                const securityHeaders = {{
-                    'x-content-type-options': response.headers.get('x-content-type-options'),
-                    'x-frame-options': response.headers.get('x-frame-options'),
-                    'x-xss-protection': response.headers.get('x-xss-protection'),
-                    'strict-transport-security': response.headers.get('strict-transport-security'),
-                    'content-security-policy': response.headers.get('content-security-policy'),
-                    'pragma': response.headers.get('pragma'),
-                    'cache-control': response.headers.get('cache-control'),
-                    'referrer-policy': response.headers.get('referrer-policy')
-                }};
-
-                // CORS 헤더 표시
-                const corsTable = document.getElementById('cors-headers-table');
-                const corsDiv = document.getElementById('cors-headers');
-                let corsFound = false;
-                
-                for (const [name, value] of Object.entries(corsHeaders)) {{
-                    if (value) {{
-                        corsFound = true;
-                        const row = corsTable.insertRow();
-                        row.insertCell(0).innerHTML = '<strong>' + name + '</strong>';
-                        row.insertCell(1).textContent = value;
-                    }}
-                }}
-                
-                if (corsFound) {{
-                    corsDiv.style.display = 'none';
-                    corsTable.style.display = 'table';
-                }} else {{
-                    corsDiv.textContent = 'CORS 응답 헤더 없음';
-                }}
-
-                // 보안 헤더 표시
-                const securityTable = document.getElementById('security-headers-table');
-                const securityDiv = document.getElementById('security-headers');
-                let securityFound = false;
-                
-                for (const [name, value] of Object.entries(securityHeaders)) {{
-                    if (value) {{
-                        securityFound = true;
-                        const row = securityTable.insertRow();
-                        row.insertCell(0).innerHTML = '<strong>' + name + '</strong>';
-                        row.insertCell(1).textContent = value;
-                    }}
-                }}
-                
-                if (securityFound) {{
-                    securityDiv.style.display = 'none';
-                    securityTable.style.display = 'table';
-                }} else {{
-                    securityDiv.textContent = '보안 응답 헤더 없음';
-                }}
-            }} catch (error) {{
-                document.getElementById('cors-headers').textContent = '헤더 로드 실패: ' + error.message;
-                document.getElementById('security-headers').textContent = '헤더 로드 실패: ' + error.message;
-            }}
-        }}
-        
-        // 페이지 로드 시 헤더 확인
-        loadResponseHeaders();
-    </script>
-</body>
-</html>"""
-    return html
+    return dashboard.render(request)
 
 @app.get("/", response_class=HTMLResponse)
 def root(request: Request):
-    """메인 페이지 - 대시보드"""
-    return generate_html_dashboard(request)
+    """메인 페이지 - 대시보드 (gzip 허용 시 미리 압축된 정적 조각 사용)"""
+    if compression.choose_encoding(request.headers.get("accept-encoding"), ("gzip",)) == "gzip":
+        return HTMLResponse(
+            dashboard.render_gzip(request),
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    return HTMLResponse(generate_html_dashboard(request), headers={"Vary": "Accept-Encoding"})
+
+@app.get("/headers-probe")
+def headers_probe():
+    """대시보드 스크립트용 응답 헤더 확인 - 본문 없는 가벼운 응답"""
+    return Response(status_code=204)
 
 # ===== Cookie & Session Affinity 테스트 =====
 @app.get("/set-cookie")
@@ -459,6 +92,7 @@ def check_session(request: Request):
     return {
         "msg": "세션 쿠키 확인",
         "route_쿠키": route_cookie,
+        "파드": POD_NAME,
         "결과": "설정됨" if route_cookie != "없음" else "설정되지 않음"
     }
 
@@ -515,42 +149,260 @@ def redirect_external():
 
 # ===== Proxy Timeout 테스트 =====
 @app.get("/timeout-test")
-async def timeout_test(seconds: int = 5):
-    """프록시 타임아웃 테스트"""
+async def timeout_test(seconds: float = 5):
+    """프록시 타임아웃 테스트 (지연 분포/오류/멈춤은 fault_* 쿼리나 FAULT_CONFIG 로 추가)"""
+    if not math.isfinite(seconds):
+        return JSONResponse({"오류": "seconds 는 유한한 숫자여야 합니다"}, status_code=400)
     if seconds > 60:
-        return {"오류": "최대 60초까지만 가능합니다"}
+        return JSONResponse({"오류": "최대 60초까지만 가능합니다"}, status_code=400)
     
-    await asyncio.sleep(seconds)
+    await scheduler.sleep(seconds)
     return {
-        "msg": f"{seconds}초 후 응답 완료",
+        "msg": f"{seconds:g}초 후 응답 완료",
         "결과": "타임아웃이 발생하면 프록시 설정을 확인하세요"
     }
 
 # ===== File Upload 테스트 =====
 @app.post("/upload")
-async def upload(file: UploadFile = File(...)):
-    """파일 업로드 테스트"""
-    content = await file.read()
+async def upload(request: Request):
+    """파일 업로드 테스트 (임시 파일 없이 도착하는 대로 multipart 파싱)"""
+    try:
+        parts, _ = await receive_upload(request, metrics.add_upload_bytes)
+    except ValueError as exc:
+        return JSONResponse({"오류": str(exc)}, status_code=400)
+    file = pick_file_part(parts)
+    if file.filename is None:
+        return JSONResponse({"오류": "multipart/form-data 의 file 필드가 필요합니다"}, status_code=400)
     return {
         "msg": "파일 업로드 성공",
         "파일명": file.filename,
-        "크기": f"{len(content)} bytes",
+        "크기": f"{file.size} bytes",
         "타입": file.content_type
     }
 
+@app.post("/upload/stream")
+async def upload_stream(request: Request):
+    """스트리밍 업로드 테스트 - 본문을 도착하는 대로 해시하며 메모리 사용량 일정 유지"""
+    try:
+        parts, timer = await receive_upload(request, metrics.add_upload_bytes)
+    except ValueError as exc:
+        return JSONResponse({"오류": str(exc)}, status_code=400)
+    return {
+        "msg": "스트리밍 업로드 성공",
+        **pick_file_part(parts).summary(),
+        "파트_수": len(parts),
+        **timer.summary(),
+    }
+
+# ===== File Download 테스트 =====
+@app.api_route("/download", methods=["GET", "HEAD"])
+def download(request: Request, size: str = "1M", chunk: str = "64K", framing: str = "length", source: str = "memory"):
+    """대용량 다운로드 테스트 - 프록시 버퍼링, chunked/Content-Length 전달, Range(이어받기) 확인"""
+    try:
+        return build_download(
+            size, chunk, framing, source,
+            range_header=request.headers.get("range"),
+            if_range=request.headers.get("if-range"),
+        )
+    except ValueError as exc:
+        return JSONResponse({"오류": str(exc)}, status_code=400)
+
+# ===== 버퍼링 감지 (요청/응답 본문 청크 도착 타임라인) =====
+@app.post("/drip/upload")
+async def drip_upload(request: Request, chunks: int = 20, interval: float = 0.1):
+    """클라이언트가 interval 초마다 보낸 청크의 도착 타임라인 - 프록시가 요청 본문을 모았다가 넘기는지 확인"""
+    try:
+        buffering.check_params(chunks, interval)
+    except ValueError as exc:
+        return JSONResponse({"오류": str(exc)}, status_code=400)
+    summary = await buffering.receive_drip(request, chunks, interval)
+    metrics.add_upload_bytes(summary["바이트"])
+    return summary
+
+@app.api_route("/drip/download", methods=["GET", "HEAD"])
+def drip_download(chunks: int = 20, interval: float = 0.1, size: str = "1K", framing: str = "chunked",
+                  accel_buffering: str | None = None):
+    """interval 초마다 size 바이트씩 보내는 응답 - 프록시가 응답 본문을 모았다가 넘기는지 확인"""
+    try:
+        size_bytes = parse_size(size)
+        buffering.check_params(chunks, interval, size_bytes)
+        if framing not in buffering.FRAMINGS:
+            raise ValueError("framing 은 chunked 또는 length 여야 합니다")
+        if accel_buffering is not None and accel_buffering not in buffering.ACCEL_BUFFERING:
+            raise ValueError("accel_buffering 은 yes 또는 no 여야 합니다")
+    except ValueError as exc:
+        return JSONResponse({"오류": str(exc)}, status_code=400)
+    return buffering.DripResponse(chunks, interval, size_bytes, framing, accel_buffering)
+
+# ===== 압축 협상 테스트 =====
+@app.api_route("/compressible", methods=["GET", "HEAD"])
+def compressible(request: Request, size: str = "64K", entropy: str = "low", encoding: str = "auto"):
+    """미리 만들어 둔 raw/gzip/br 본문 - 컨트롤러가 직접 압축하는지, 백엔드 압축을 넘기는지, 재압축하는지 확인"""
+    try:
+        size_bytes = parse_size(size)
+        compression.check_corpus_params(size_bytes, entropy, encoding)
+    except ValueError as exc:
+        return JSONResponse({"오류": str(exc)}, status_code=400)
+    body, headers, media_type = compression.compressible(
+        size_bytes, entropy, encoding, request.headers.get("accept-encoding")
+    )
+    return Response(body, headers=headers, media_type=media_type)
+
+# ===== Header / Cookie 크기 스트레스 =====
+def _stress_response(block, count, size):
+    response = JSONResponse({"헤더_수": count, "값_bytes": size, "헤더_bytes": headerstress.block_bytes(block)})
+    response.raw_headers.extend(block)
+    return response
+
+@app.get("/stress/headers")
+def stress_headers(count: int = 10, size: int = 1024):
+    """응답 헤더 N 개 (X-Stress-NNNN, 값 size bytes) - 프록시 proxy_buffer_size 등 응답 헤더 한도 확인"""
+    try:
+        headerstress.check_params(count, size)
+    except ValueError as exc:
+        return JSONResponse({"오류": str(exc)}, status_code=400)
+    return _stress_response(headerstress.header_block(count, size), count, size)
+
+@app.get("/stress/cookies")
+def stress_cookies(count: int = 10, size: int = 1024, max_age: int = 60):
+    """Set-Cookie N 개 (값 size bytes, Max-Age 후 만료) - 다음 요청의 Cookie 헤더도 같이 커짐"""
+    try:
+        headerstress.check_params(count, size)
+    except ValueError as exc:
+        return JSONResponse({"오류": str(exc)}, status_code=400)
+    return _stress_response(headerstress.cookie_block(count, size, max(0, max_age)), count, size)
+
+@app.api_route("/stress/request-headers", methods=["GET", "POST"])
+def stress_request_headers(request: Request):
+    """받은 요청 헤더 수/전체 크기/가장 큰 헤더/쿠키 수 - 프록시가 어디까지 통과시키는지 확인"""
+    return headerstress.summarize_request(request.scope["headers"])
+
+# ===== Long-lived 연결 (SSE / WebSocket) 테스트 =====
+@app.api_route("/sse/ticks", methods=["GET", "HEAD"])
+def sse_ticks(interval: float = 1.0, payload: int = 0):
+    """SSE 틱 스트림 - 컨트롤러별 동시 연결 수/연결당 메모리 측정 (공유 타이머 하나가 모든 연결을 구동)"""
+    try:
+        longlived.check_params(interval, payload)
+    except ValueError as exc:
+        return JSONResponse({"오류": str(exc)}, status_code=400)
+    return longlived.SSEResponse(interval, payload, health.state)
+
+@app.websocket("/ws/echo")
+async def ws_echo(websocket: WebSocket, interval: float | None = None, payload: int = 0):
+    """WebSocket 에코 (interval 을 주면 공유 타이머의 tick 도 보냄)"""
+    try:
+        # interval 을 안 주면 tick 없이 에코만 - payload 만 검사
+        longlived.check_params(longlived.MIN_INTERVAL if interval is None else interval, payload)
+    except ValueError as exc:
+        await websocket.close(1008, str(exc))
+        return
+    await longlived.websocket_echo(websocket, health.state, interval, payload)
+
+@app.get("/long-lived")
+def long_lived_stats():
+    """이 워커의 SSE/WebSocket 연결 수, RSS, 연결당 메모리 (워커가 여럿이면 워커별 값)"""
+    return longlived.registry.stats()
+
+@app.get("/startup")
+def startup_profile():
+    """이 워커의 콜드 스타트 구간별 시간 (import, 앱 구성, lifespan, 첫 응답 첫 바이트)"""
+    return startup.profile.report()
+
 # ===== Request Info (디버깅용) =====
 @app.get("/request-info")
 def request_info(request: Request):
-    """요청 정보 확인"""
-    controller_name = os.getenv("CONTROLLER_NAME", "unknown")
+    """요청 정보 확인 (연결 ID/순번으로 프록시의 upstream keep-alive 재사용 확인)"""
+    connection = connections.current(request.scope)
+    resolved = clientip.current(request.scope)
     return {
-        "컨트롤러": controller_name,
+        "컨트롤러": CONTROLLER_NAME,
+        "파드": POD_NAME,
         "요청_메서드": request.method,
         "URL": str(request.url),
         "클라이언트_IP": request.client.host if request.client else None,
-        "확인방법": "X-Forwarded-For 헤더를 확인하세요"
+        "실제_클라이언트": resolved.info() if resolved is not None else None,
+        "연결": connection.info() if connection is not None else None,
+        "확인방법": "X-Forwarded-For 헤더와 TRUSTED_PROXIES 로 해석한 실제_클라이언트를 확인하세요"
     }
 
+# ===== Request Capture =====
+capture_ring = CaptureRing() if CAPTURE_SIZE else None
+
+@app.get("/capture")
+def capture_export(limit: int | None = None):
+    """최근 요청 캡처를 JSONL 로 내보내기 (`python main.py replay` 입력)"""
+    body = capture_ring.to_jsonl(limit) if capture_ring is not None else ""
+    return Response(body, media_type="application/x-ndjson")
+
+@app.delete("/capture")
+def capture_clear():
+    """캡처 비우기"""
+    cleared = capture_ring.clear() if capture_ring is not None else 0
+    return {"msg": "캡처를 비웠습니다", "삭제된_요청": cleared}
+
+# ===== Metrics =====
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus 메트릭 (라우트별 지연 히스토그램, in-flight, 업로드 바이트, 이벤트 루프 지연)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# 라우트 템플릿 목록이 확정된 뒤 메트릭 레이아웃 생성
+admission = AdmissionConfig.load()
+metrics = Metrics(
+    CONTROLLER_NAME,
+    [route.path for route in app.routes if route.path not in longlived.PATHS],
+    admission.groups if admission else (),
+)
+connections.registry.observer = metrics
+longlived.registry.observer = metrics
+if FAST_PATH:
+    fast_path = FastPath(app)
+    fast_path.add("GET", "/security-headers", security_headers)
+    fast_path.add("GET", "/set-cookie", set_cookie)
+    fast_path.add("OPTIONS", "/cors-test", cors_preflight)
+    fast_path.add("POST", "/cors-test", cors_post)
+    fast_path.add("GET", "/cors-test", cors_get, per_request=True)
+    fast_path.add("GET", "/redirect", redirect)
+    fast_path.add("GET", "/check-session", check_session, per_request=True)
+    # 가장 안쪽 미들웨어 - 장애 주입/메트릭/파드 헤더는 그대로 적용됨
+    app.add_middleware(FastPathMiddleware, fast_path=fast_path)
+# 나중에 추가한 미들웨어가 바깥쪽 - 주입된 지연/오류도 메트릭에 잡히도록 장애 주입을 안쪽에 둠
+app.add_middleware(FaultInjectionMiddleware)
+if admission is not None:
+    # 주입된 지연으로 잠든 요청도 슬롯을 차지하도록 장애 주입 바깥, 거절 응답도 세도록 메트릭 안쪽
+    app.add_middleware(AdmissionMiddleware, config=admission, metrics=metrics)
+if capture_ring is not None:
+    app.add_middleware(CaptureMiddleware, ring=capture_ring)
+# SSE/WebSocket 은 연결 수명 동안 열려 있으므로 in-flight/지연 대신 longlived 레지스트리 게이지로만 보고
+app.add_middleware(MetricsMiddleware, metrics=metrics, exclude=longlived.PATHS)
+app.add_middleware(PodIdentityMiddleware)
+app.add_middleware(clientip.ClientIPMiddleware, resolver=clientip.ClientResolver())
+access_log = AccessLogWriter(metrics=metrics, controller=CONTROLLER_NAME, pod=POD_NAME) if ACCESS_LOG_JSON else None
+if access_log is not None:
+    # 응답 헤더가 모두 붙은 뒤의 바이트를 세고, 생성한 X-Request-ID 를 안쪽 미들웨어/핸들러도 보도록 바깥에 둠
+    app.add_middleware(AccessLogMiddleware, writer=access_log)
+# 헬스 프로브를 뺀 첫 요청의 첫 바이트 시각
+app.add_middleware(startup.FirstResponseMiddleware)
+# 가장 바깥 - 프로브는 장애 주입/메트릭을 거치지 않음
+app.add_middleware(health.HealthMiddleware, metrics=metrics)
+startup.profile.mark("app")
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    if sys.argv[1:2] == ["bench"]:
+        import bench
+        sys.exit(bench.main(sys.argv[2:]))
+    if sys.argv[1:2] == ["replay"]:
+        import replay
+        sys.exit(replay.main(sys.argv[2:]))
+    if sys.argv[1:2] == ["header-sweep"]:
+        sys.exit(headerstress.main(sys.argv[2:]))
+    if sys.argv[1:2] == ["drip"]:
+        sys.exit(buffering.main(sys.argv[2:]))
+    if sys.argv[1:2] == ["standin"]:
+        import standin
+        sys.exit(standin.main(sys.argv[2:]))
+    if sys.argv[1:2] == ["asgi-bench"]:
+        import asgibench
+        sys.exit(asgibench.main(sys.argv[2:], app))
+    server.run(app)
 
@@ -0,0 +1,388 @@
+# metrics.py
+"""Prometheus 메트릭 - 라우트별 지연 히스토그램, 상태 코드, in-flight, 업로드 바이트, 이벤트 루프 지연,
+연결당 요청 수/연결 수명, 수락 제어 그룹별 대기 시간/거절 수
+
+모든 값은 시작 시 크기가 정해진 array('d') 한 개에 들어 있고, 기록은 인덱스 덧셈뿐이라
+요청 경로에서 락이나 객체 생성이 없습니다 (이벤트 루프 하나가 유일한 writer).
+METRICS_DIR 이 설정되어 있으면(멀티 워커) 같은 레이아웃을 워커별 mmap 파일에 두고,
+노출 시 모든 워커 파일을 합산합니다.
+"""
+import asyncio
+import mmap
+import os
+import time
+from array import array
+from bisect import bisect_left
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LOOP_LAG_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+CONNECTION_REQUEST_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 10000)
+CONNECTION_LIFETIME_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+QUEUE_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SHED_REASONS = ("queue_full", "queue_timeout")
+# 미리 슬롯을 잡아 두는 상태 코드 (그 외는 code="other")
+STATUS_CODES = (200, 201, 204, 206, 301, 302, 304, 307, 308, 400, 401, 403, 404, 405, 408,
+                413, 416, 422, 429, 431, 499, 500, 502, 503, 504)
+UNMATCHED_ROUTE = "unmatched"
+
+_STATUS_INDEX = {code: index for index, code in enumerate(STATUS_CODES)}
+_OTHER_STATUS = len(STATUS_CODES)
+
+# 전역 블록: in_flight, upload_bytes, loop_lag(마지막 값), loop_lag_sum, loop_lag_count, loop_lag_buckets...,
+#           connections_open, connections_opened, 닫힌 연결의 요청 수 히스토그램, 수명 히스토그램,
+#           버린 액세스 로그 수, SSE/WebSocket 연결 수
+_IN_FLIGHT = 0
+_UPLOAD_BYTES = 1
+_LOOP_LAG = 2
+_LOOP_LAG_SUM = 3
+_LOOP_LAG_COUNT = 4
+_LOOP_LAG_BUCKET = 5
+_CONN_OPEN = _LOOP_LAG_BUCKET + len(LOOP_LAG_BUCKETS) + 1
+_CONN_OPENED = _CONN_OPEN + 1
+_CONN_REQ_SUM = _CONN_OPENED + 1
+_CONN_REQ_COUNT = _CONN_REQ_SUM + 1
+_CONN_REQ_BUCKET = _CONN_REQ_COUNT + 1
+_CONN_AGE_SUM = _CONN_REQ_BUCKET + len(CONNECTION_REQUEST_BUCKETS) + 1
+_CONN_AGE_COUNT = _CONN_AGE_SUM + 1
+_CONN_AGE_BUCKET = _CONN_AGE_COUNT + 1
+_ACCESS_LOG_DROPPED = _CONN_AGE_BUCKET + len(CONNECTION_LIFETIME_BUCKETS) + 1
+_SSE_CLIENTS = _ACCESS_LOG_DROPPED + 1
+_WS_CLIENTS = _SSE_CLIENTS + 1
+_GLOBAL_SIZE = _WS_CLIENTS + 1
+
+# 라우트 블록: count, sum, latency_buckets..., statuses...
+_ROUTE_COUNT = 0
+_ROUTE_SUM = 1
+_ROUTE_BUCKET = 2
+_ROUTE_STATUS = _ROUTE_BUCKET + len(LATENCY_BUCKETS) + 1
+_ROUTE_SIZE = _ROUTE_STATUS + len(STATUS_CODES) + 1
+
+# 수락 제어 그룹 블록: active, queued, admitted, shed(사유별)..., 대기 시간 sum, count, buckets...
+_GROUP_ACTIVE = 0
+_GROUP_QUEUED = 1
+_GROUP_ADMITTED = 2
+_GROUP_SHED = 3
+_GROUP_WAIT_SUM = _GROUP_SHED + len(SHED_REASONS)
+_GROUP_WAIT_COUNT = _GROUP_WAIT_SUM + 1
+_GROUP_WAIT_BUCKET = _GROUP_WAIT_COUNT + 1
+_GROUP_SIZE = _GROUP_WAIT_BUCKET + len(QUEUE_WAIT_BUCKETS) + 1
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _num(value):
+    # 큰 카운터도 지수 표기 없이 정수로 출력
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _le(bound):
+    return "+Inf" if bound is None else repr(float(bound))
+
+
+def _histogram(out, name, labels, values, sum_index, count_index, bucket_index, bounds):
+    cumulative = 0.0
+    for index, bound in enumerate(bounds + (None,)):
+        cumulative += values[bucket_index + index]
+        out.append(f'{name}_bucket{{{labels},le="{_le(bound)}"}} {_num(cumulative)}')
+    out.append(f"{name}_sum{{{labels}}} {_num(values[sum_index])}")
+    out.append(f"{name}_count{{{labels}}} {_num(values[count_index])}")
+
+
+class Metrics:
+    """고정 레이아웃 메트릭 저장소
+
+    routes 는 라우트 경로 템플릿 목록입니다. 레이블 카디널리티를 묶어 두기 위해
+    목록에 없는 경로는 모두 'unmatched' 로 기록합니다.
+    """
+
+    def __init__(self, controller, routes, groups=()):
+        self.controller = controller
+        self.routes = tuple(dict.fromkeys(routes)) + (UNMATCHED_ROUTE,)
+        self._route_base = {
+            route: _GLOBAL_SIZE + index * _ROUTE_SIZE for index, route in enumerate(self.routes)
+        }
+        self._unmatched_base = self._route_base[UNMATCHED_ROUTE]
+        groups_start = _GLOBAL_SIZE + len(self.routes) * _ROUTE_SIZE
+        self._group_base = {group: groups_start + index * _GROUP_SIZE for index, group in enumerate(groups)}
+        self.size = groups_start + len(self._group_base) * _GROUP_SIZE
+        # 워커 합산 시 살아 있는 워커 값만 더하는 게이지
+        self._live_gauges = [_IN_FLIGHT, _CONN_OPEN, _SSE_CLIENTS, _WS_CLIENTS]
+        for base in self._group_base.values():
+            self._live_gauges += [base + _GROUP_ACTIVE, base + _GROUP_QUEUED]
+        self.directory = os.getenv("METRICS_DIR") or None
+        if self.directory is None:
+            self.values = array("d", bytes(8 * self.size))
+        else:
+            path = os.path.join(self.directory, f"metrics-{os.getpid()}.bin")
+            with open(path, "w+b") as f:
+                f.truncate(8 * self.size)
+                self._mmap = mmap.mmap(f.fileno(), 8 * self.size)
+            self.values = memoryview(self._mmap).cast("d")
+
+    # ----- 기록 -----
+    def observe(self, route, status, seconds):
+        values = self.values
+        base = self._route_base.get(route, self._unmatched_base)
+        values[base + _ROUTE_COUNT] += 1
+        values[base + _ROUTE_SUM] += seconds
+        values[base + _ROUTE_BUCKET + bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        values[base + _ROUTE_STATUS + _STATUS_INDEX.get(status, _OTHER_STATUS)] += 1
+
+    def request_started(self):
+        self.values[_IN_FLIGHT] += 1
+
+    def request_finished(self):
+        self.values[_IN_FLIGHT] -= 1
+
+    @property
+    def in_flight(self):
+        return int(self.values[_IN_FLIGHT])
+
+    def add_upload_bytes(self, nbytes):
+        self.values[_UPLOAD_BYTES] += nbytes
+
+    def observe_loop_lag(self, seconds):
+        values = self.values
+        values[_LOOP_LAG] = seconds
+        values[_LOOP_LAG_SUM] += seconds
+        values[_LOOP_LAG_COUNT] += 1
+        values[_LOOP_LAG_BUCKET + bisect_left(LOOP_LAG_BUCKETS, seconds)] += 1
+
+    @property
+    def loop_lag(self):
+        return self.values[_LOOP_LAG]
+
+    def connection_opened(self):
+        values = self.values
+        values[_CONN_OPEN] += 1
+        values[_CONN_OPENED] += 1
+
+    def connection_closed(self, requests, seconds):
+        values = self.values
+        values[_CONN_OPEN] -= 1
+        values[_CONN_REQ_SUM] += requests
+        values[_CONN_REQ_COUNT] += 1
+        values[_CONN_REQ_BUCKET + bisect_left(CONNECTION_REQUEST_BUCKETS, requests)] += 1
+        values[_CONN_AGE_SUM] += seconds
+        values[_CONN_AGE_COUNT] += 1
+        values[_CONN_AGE_BUCKET + bisect_left(CONNECTION_LIFETIME_BUCKETS, seconds)] += 1
+
+    def long_lived_state(self, sse, websocket):
+        self.values[_SSE_CLIENTS] = sse
+        self.values[_WS_CLIENTS] = websocket
+
+    def access_log_dropped(self):
+        self.values[_ACCESS_LOG_DROPPED] += 1
+
+    async def monitor_loop_lag(self, interval=0.5):
+        """interval 마다 잠들었다 깨어난 시각의 지연으로 이벤트 루프 지연 측정"""
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.observe_loop_lag(max(0.0, time.perf_counter() - started - interval))
+
+    def admission_admitted(self, group, seconds):
+        values = self.values
+        base = self._group_base[group]
+        values[base + _GROUP_ADMITTED] += 1
+        values[base + _GROUP_WAIT_SUM] += seconds
+        values[base + _GROUP_WAIT_COUNT] += 1
+        values[base + _GROUP_WAIT_BUCKET + bisect_left(QUEUE_WAIT_BUCKETS, seconds)] += 1
+
+    def admission_shed(self, group, reason):
+        self.values[self._group_base[group] + _GROUP_SHED + SHED_REASONS.index(reason)] += 1
+
+    def admission_state(self, group, active, queued):
+        base = self._group_base[group]
+        self.values[base + _GROUP_ACTIVE] = active
+        self.values[base + _GROUP_QUEUED] = queued
+
+    # ----- 노출 -----
+    def aggregate(self):
+        """모든 워커 값 합산 (단일 프로세스면 자기 값 그대로)
+
+        카운터/히스토그램은 종료된 워커 몫까지 더하고, in-flight/열린 연결/SSE·WebSocket/수락 제어 게이지는
+        살아 있는 워커만, 이벤트 루프 지연은 살아 있는 워커 중 최댓값을 씁니다.
+        """
+        if self.directory is None:
+            return self.values
+        total = array("d", bytes(8 * self.size))
+        live = dict.fromkeys(self._live_gauges, 0.0)
+        loop_lag = 0.0
+        for name in os.listdir(self.directory):
+            if not (name.startswith("metrics-") and name.endswith(".bin")):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), "rb") as f:
+                    data = f.read()
+                pid = int(name[len("metrics-"):-len(".bin")])
+            except (OSError, ValueError):
+                continue
+            if len(data) != 8 * self.size:
+                continue
+            worker = array("d")
+            worker.frombytes(data)
+            for index in range(self.size):
+                total[index] += worker[index]
+            if _pid_alive(pid):
+                for index in live:
+                    live[index] += worker[index]
+                loop_lag = max(loop_lag, worker[_LOOP_LAG])
+        for index, value in live.items():
+            total[index] = value
+        total[_LOOP_LAG] = loop_lag
+        return total
+
+    def render(self):
+        """Prometheus text exposition format (0.0.4)"""
+        values = self.aggregate()
+        controller = _escape(self.controller)
+        common = f'controller="{controller}"'
+        out = [
+            "# HELP ingress_echo_requests_in_flight 처리 중인 HTTP 요청 수 (SSE 스트림 제외)",
+            "# TYPE ingress_echo_requests_in_flight gauge",
+            f"ingress_echo_requests_in_flight{{{common}}} {_num(values[_IN_FLIGHT])}",
+            "# HELP ingress_echo_upload_bytes_total 업로드 라우트가 받은 본문 바이트 (multipart 경계/파트 헤더 포함)",
+            "# TYPE ingress_echo_upload_bytes_total counter",
+            f"ingress_echo_upload_bytes_total{{{common}}} {_num(values[_UPLOAD_BYTES])}",
+            "# HELP ingress_echo_event_loop_lag_seconds 마지막으로 측정한 이벤트 루프 지연",
+            "# TYPE ingress_echo_event_loop_lag_seconds gauge",
+            f"ingress_echo_event_loop_lag_seconds{{{common}}} {_num(values[_LOOP_LAG])}",
+            "# HELP ingress_echo_event_loop_lag_histogram_seconds 이벤트 루프 지연 분포",
+            "# TYPE ingress_echo_event_loop_lag_histogram_seconds histogram",
+        ]
+        _histogram(out, "ingress_echo_event_loop_lag_histogram_seconds", common, values,
+                   _LOOP_LAG_SUM, _LOOP_LAG_COUNT, _LOOP_LAG_BUCKET, LOOP_LAG_BUCKETS)
+        # 요청 수 / connections_opened_total 이 1 에 가까우면 프록시가 요청마다 새 연결을 여는 것
+        out.extend([
+            "# HELP ingress_echo_connections_open 열려 있는 클라이언트(프록시) TCP 연결 수",
+            "# TYPE ingress_echo_connections_open gauge",
+            f"ingress_echo_connections_open{{{common}}} {_num(values[_CONN_OPEN])}",
+            "# HELP ingress_echo_connections_opened_total 수락한 TCP 연결 수",
+            "# TYPE ingress_echo_connections_opened_total counter",
+            f"ingress_echo_connections_opened_total{{{common}}} {_num(values[_CONN_OPENED])}",
+            "# HELP ingress_echo_connection_requests 닫힌 연결이 처리한 요청 수",
+            "# TYPE ingress_echo_connection_requests histogram",
+        ])
+        _histogram(out, "ingress_echo_connection_requests", common, values,
+                   _CONN_REQ_SUM, _CONN_REQ_COUNT, _CONN_REQ_BUCKET, CONNECTION_REQUEST_BUCKETS)
+        out.extend([
+            "# HELP ingress_echo_connection_duration_seconds 닫힌 연결의 수명",
+            "# TYPE ingress_echo_connection_duration_seconds histogram",
+        ])
+        _histogram(out, "ingress_echo_connection_duration_seconds", common, values,
+                   _CONN_AGE_SUM, _CONN_AGE_COUNT, _CONN_AGE_BUCKET, CONNECTION_LIFETIME_BUCKETS)
+        out.extend([
+            "# HELP ingress_echo_long_lived_connections 열려 있는 SSE/WebSocket 연결 수",
+            "# TYPE ingress_echo_long_lived_connections gauge",
+            f'ingress_echo_long_lived_connections{{{common},kind="sse"}} {_num(values[_SSE_CLIENTS])}',
+            f'ingress_echo_long_lived_connections{{{common},kind="websocket"}} {_num(values[_WS_CLIENTS])}',
+            "# HELP ingress_echo_access_log_dropped_total 쓰기 대기열이 가득 차 버린 액세스 로그 수",
+            "# TYPE ingress_echo_access_log_dropped_total counter",
+            f"ingress_echo_access_log_dropped_total{{{common}}} {_num(values[_ACCESS_LOG_DROPPED])}",
+        ])
+
+        requests = [
+            "# HELP ingress_echo_requests_total 라우트/상태 코드별 HTTP 요청 수",
+            "# TYPE ingress_echo_requests_total counter",
+        ]
+        latency = [
+            "# HELP ingress_echo_request_duration_seconds 라우트별 요청 처리 시간",
+            "# TYPE ingress_echo_request_duration_seconds histogram",
+        ]
+        for route, base in self._route_base.items():
+            if not values[base + _ROUTE_COUNT]:
+                continue
+            labels = f'{common},route="{_escape(route)}"'
+            for index, code in enumerate(STATUS_CODES + ("other",)):
+                count = values[base + _ROUTE_STATUS + index]
+                if count:
+                    requests.append(f'ingress_echo_requests_total{{{labels},code="{code}"}} {_num(count)}')
+            _histogram(latency, "ingress_echo_request_duration_seconds", labels, values,
+                       base + _ROUTE_SUM, base + _ROUTE_COUNT, base + _ROUTE_BUCKET, LATENCY_BUCKETS)
+        out.extend(requests)
+        out.extend(latency)
+        if self._group_base:
+            out.extend(self._render_admission(values, common))
+        out.append("")
+        return "\n".join(out)
+
+    def _render_admission(self, values, common):
+        gauges = [
+            "# HELP ingress_echo_admission_active 수락 제어 그룹별 처리 중 요청 수",
+            "# TYPE ingress_echo_admission_active gauge",
+        ]
+        queued = [
+            "# HELP ingress_echo_admission_queued 수락 제어 그룹별 대기 중 요청 수",
+            "# TYPE ingress_echo_admission_queued gauge",
+        ]
+        admitted = [
+            "# HELP ingress_echo_admission_admitted_total 수락된 요청 수",
+            "# TYPE ingress_echo_admission_admitted_total counter",
+        ]
+        shed = [
+            "# HELP ingress_echo_admission_shed_total 과부하로 거절한 요청 수 (reason=queue_full|queue_timeout)",
+            "# TYPE ingress_echo_admission_shed_total counter",
+        ]
+        wait = [
+            "# HELP ingress_echo_admission_queue_seconds 슬롯을 얻기까지 기다린 시간",
+            "# TYPE ingress_echo_admission_queue_seconds histogram",
+        ]
+        for group, base in self._group_base.items():
+            labels = f'{common},group="{_escape(group)}"'
+            gauges.append(f"ingress_echo_admission_active{{{labels}}} {_num(values[base + _GROUP_ACTIVE])}")
+            queued.append(f"ingress_echo_admission_queued{{{labels}}} {_num(values[base + _GROUP_QUEUED])}")
+            admitted.append(f"ingress_echo_admission_admitted_total{{{labels}}} {_num(values[base + _GROUP_ADMITTED])}")
+            for index, reason in enumerate(SHED_REASONS):
+                shed.append(f'ingress_echo_admission_shed_total{{{labels},reason="{reason}"}} {_num(values[base + _GROUP_SHED + index])}')
+            _histogram(wait, "ingress_echo_admission_queue_seconds", labels, values,
+                       base + _GROUP_WAIT_SUM, base + _GROUP_WAIT_COUNT, base + _GROUP_WAIT_BUCKET, QUEUE_WAIT_BUCKETS)
+        return gauges + queued + admitted + shed + wait
+
+
+class MetricsMiddleware:
+    """요청 수/상태/지연/in-flight 를 기록하는 ASGI 미들웨어
+
+    exclude 경로(SSE 처럼 연결 내내 열린 응답)는 in-flight 와 지연 히스토그램에 넣지 않습니다 -
+    몇 분짜리 "지연" 이 히스토그램을 망치고, 유휴 구독자만으로 readiness 의 in-flight 한도를 넘기 때문입니다.
+    """
+
+    def __init__(self, app, metrics, exclude=()):
+        self.app = app
+        self.metrics = metrics
+        self.exclude = frozenset(exclude)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+        metrics = self.metrics
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.request_started()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.request_finished()
+            # 라우팅 후 FastAPI 가 scope["route"] 에 매칭된 라우트를 남김
+            route = scope.get("route")
+            metrics.observe(route.path if route is not None else None, status, time.perf_counter() - started)
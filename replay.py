@@ -0,0 +1,174 @@
+# replay.py
+"""캡처 재생기 - /capture 로 받은 JSONL 을 원래 간격(또는 배속)대로 다른 대상에 다시 보냄
+
+    curl -s http://localhost:8001/capture > capture.jsonl
+    python main.py replay capture.jsonl https://nginx.seungdobae.com https://traefik.seungdobae.com --speed 2
+
+요청마다 캡처된 메서드/경로/쿼리/선택 헤더/쿠키를 그대로 쓰고, 본문은 같은 크기로 새로 만듭니다
+(multipart 는 경계까지 포함한 전체 길이가 같은 파일 파트 본문). 지연은 예정 시각부터 재므로 대상이 밀리면 그대로 드러납니다.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime, timezone
+
+from bench import Benchmark, RouteSpec, StreamBody, Target, detect_controller, format_table, multipart_body
+
+# 다시 보낼 캡처 헤더 (Host/User-Agent 는 재생기 값, X-Forwarded-* 는 대상 프록시가 붙임)
+REPLAY_HEADERS = ("accept", "accept-encoding", "accept-language", "content-type", "origin", "referer")
+_ZERO_CHUNK = bytes(64 * 1024)
+
+
+def load_capture(path):
+    """JSONL 캡처를 도착 시각 순으로 읽기"""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                records.append(json.loads(line))
+    records.sort(key=lambda record: record["arrived_at"])
+    return records
+
+
+class _Bodies:
+    """같은 크기 본문은 한 번만 만들어 재사용"""
+
+    def __init__(self):
+        self._multipart = {}
+
+    def build(self, record, headers):
+        size = record.get("body_bytes") or 0
+        content_type = record.get("headers", {}).get("content-type", "")
+        if content_type.startswith("multipart/form-data"):
+            if size not in self._multipart:
+                # body_bytes 는 캡처된 전송 길이(경계/파트 헤더 포함)
+                self._multipart[size] = multipart_body(size, total=True)
+            body, content_type = self._multipart[size]
+            headers = [(name, value) for name, value in headers if name != "content-type"]
+            headers.append(("content-type", content_type))
+            return body, headers
+        if size:
+            return StreamBody(b"", _ZERO_CHUNK, size, b""), headers
+        return b"", headers
+
+
+def parse_cookies(header):
+    cookies = {}
+    for part in (header or "").split(";"):
+        name, sep, value = part.strip().partition("=")
+        if sep and name:
+            cookies[name] = value
+    return cookies
+
+
+class ReplaySpec(RouteSpec):
+    """캡처 레코드 하나 - 쿠키는 연결의 쿠키 저장소로 보냄 (어피니티 집계가 같은 값을 보도록)"""
+
+    def __init__(self, name, method, target, headers=(), body=b"", cookies=None):
+        super().__init__(name, method, target, headers, body)
+        self.cookies = cookies or {}
+
+
+def build_specs(records):
+    bodies = _Bodies()
+    specs = []
+    for record in records:
+        captured = record.get("headers", {})
+        headers = [(name, captured[name]) for name in REPLAY_HEADERS if name in captured]
+        body, headers = bodies.build(record, headers)
+        target = record["path"] + (f"?{record['query']}" if record.get("query") else "")
+        specs.append(ReplaySpec(
+            f"{record['method']} {record['path']}", record["method"], target, headers, body,
+            parse_cookies(record.get("cookies")),
+        ))
+    return specs
+
+
+class Replayer(Benchmark):
+    """캡처 순서와 간격(/speed)대로 요청을 발행하는 개방 루프"""
+
+    def __init__(self, target, records, speed=1.0, concurrency=64, timeout=70.0, affinity_cookie=None):
+        specs = build_specs(records)
+        super().__init__(target, specs, None, concurrency, timeout=timeout, affinity_cookie=affinity_cookie)
+        self.records = records
+        self.speed = speed
+
+    async def _one(self, conn, route, scheduled):
+        # 이전 응답의 Set-Cookie 대신 캡처된 쿠키를 보냄
+        conn.cookies = dict(route.cookies)
+        await super()._one(conn, route, scheduled)
+
+    async def run(self):
+        started = time.perf_counter()
+        self._record_from = started
+        first = self.records[0]["arrived_at"] if self.records else 0.0
+
+        def schedule():
+            for spec, record in zip(self.routes, self.records):
+                yield spec, started + (record["arrived_at"] - first) / self.speed
+
+        await self._paced(schedule())
+        return time.perf_counter() - started
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py replay", description="캡처(JSONL) 재생")
+    parser.add_argument("capture", help="GET /capture 로 받은 JSONL 파일")
+    parser.add_argument("urls", nargs="+", help="대상 base URL (여러 개면 차례로 실행)")
+    parser.add_argument("-s", "--speed", type=float, default=1.0, help="배속 (2 = 두 배 빠르게, 기본 1)")
+    parser.add_argument("-c", "--concurrency", type=int, default=64, help="연결 풀 크기 (기본 64)")
+    parser.add_argument("--timeout", type=float, default=70.0, help="요청별 타임아웃(초)")
+    parser.add_argument("--connect", default=None, help="실제로 접속할 host:port (Host/SNI 는 URL 유지)")
+    parser.add_argument("--insecure", action="store_true", help="TLS 인증서 검증 생략")
+    parser.add_argument("--affinity-cookie", default=None, metavar="NAME",
+                        help="어피니티 집계 모드 - 이 쿠키 값별로 응답한 파드를 기록")
+    parser.add_argument("--label", default=None, help="결과 라벨 (기본: /request-info 의 컨트롤러 이름)")
+    parser.add_argument("-o", "--output", default="replay-{label}.json", help="결과 파일 경로 ({label} 치환)")
+    return parser
+
+
+async def _run(args, records):
+    results = []
+    for url in args.urls:
+        target = Target(url, args.connect, args.insecure)
+        label = args.label or await detect_controller(target) or target.host
+        replayer = Replayer(target, records, args.speed, args.concurrency, args.timeout, args.affinity_cookie)
+        started_at = datetime.now(timezone.utc).isoformat()
+        elapsed = await replayer.run()
+        report = replayer.report(elapsed)
+        result = {
+            "label": label,
+            "target": url,
+            "started_at": started_at,
+            "elapsed_seconds": round(elapsed, 3),
+            "config": {
+                "capture": args.capture,
+                "records": len(records),
+                "captured_seconds": round(records[-1]["arrived_at"] - records[0]["arrived_at"], 3),
+                "speed": args.speed,
+                "concurrency": args.concurrency,
+            },
+            **report,
+        }
+        print(format_table(f"{label} ({url})", report))
+        output = args.output.replace("{label}", label.replace("/", "_"))
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"-> {output}\n")
+        results.append(result)
+    return results
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.speed <= 0:
+        print("--speed 는 0보다 커야 합니다", file=sys.stderr)
+        return 2
+    records = load_capture(args.capture)
+    if not records:
+        print(f"{args.capture}: 재생할 요청이 없습니다", file=sys.stderr)
+        return 2
+    asyncio.run(_run(args, records))
+    return 0
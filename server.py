@@ -0,0 +1,190 @@
+# server.py
+"""uvicorn 실행기 - 환경변수로 워커 수, 이벤트 루프/HTTP 파서, backlog, keep-alive 등을 조정
+
+    WEB_CONCURRENCY                   워커 프로세스 수 (기본 auto: cgroup CPU quota → CPU request, 없으면 1)
+    UVICORN_LOOP                      auto | asyncio | uvloop (auto 는 uvloop 설치 시 사용)
+    UVICORN_HTTP                      auto | h11 | httptools (auto 는 httptools 설치 시 사용)
+    UVICORN_BACKLOG                   listen backlog (기본 2048)
+    UVICORN_TIMEOUT_KEEP_ALIVE        keep-alive 유지 시간(초, 기본 65 - 프록시 idle timeout 60s 보다 길게)
+    UVICORN_LIMIT_CONCURRENCY         동시 연결/태스크 상한 (초과 시 503, 기본 없음)
+    UVICORN_TIMEOUT_GRACEFUL_SHUTDOWN 종료 시 진행 중 요청을 기다리는 시간(초, 기본 25)
+    UVICORN_ACCESS_LOG                uvicorn 기본 액세스 로그 (기본 true)
+    DRAIN_SECONDS                     SIGTERM 후 readiness 를 내린 채 요청을 계속 받는 시간(초, 기본 0)
+    HOST / PORT                       바인드 주소 (기본 0.0.0.0:8001)
+"""
+import importlib.util
+import logging
+import math
+import os
+import signal
+import tempfile
+import time
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+import connections
+import health
+
+logger = logging.getLogger("uvicorn.error")
+
+APP = "main:app"
+
+
+def _env_int(name, default):
+    value = os.getenv(name, "").strip()
+    return int(value) if value else default
+
+
+def _env_bool(name, default):
+    value = os.getenv(name, "").strip().lower()
+    if not value:
+        return default
+    return value in ("1", "true", "yes", "on")
+
+
+def cgroup_cpu_limit():
+    """cgroup CPU quota 를 코어 수로 (제한이 없으면 None)"""
+    try:
+        # cgroup v2: "<quota> <period>" 또는 "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    try:
+        # cgroup v1
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def auto_workers():
+    """CPU quota → (차트가 넘겨준) CPU request 순서로 워커 수 결정 (둘 다 없으면 1)
+
+    resources 를 지정하지 않은 파드에서 노드 코어 수만큼 워커를 띄우지 않도록 코어 수는 보지 않습니다.
+    """
+    limit = cgroup_cpu_limit()
+    if limit is None:
+        limit = _env_int("CPU_REQUEST_MILLICORES", 0) / 1000
+    return max(1, math.ceil(limit))
+
+
+def worker_count():
+    value = os.getenv("WEB_CONCURRENCY", "auto").strip().lower()
+    if value in ("", "auto"):
+        return auto_workers()
+    return max(1, int(value))
+
+
+def _resolved(choice, fast, fallback):
+    """'auto' 가 실제로 어떤 구현을 쓰게 되는지 (로그용)"""
+    if choice != "auto":
+        return choice
+    return fast if importlib.util.find_spec(fast) is not None else fallback
+
+
+def build_config(app=None, **overrides):
+    """환경변수로 uvicorn.Config 생성
+
+    워커가 하나면 이미 import 된 app 객체를 그대로 쓰고(두 번 import 하지 않음),
+    여럿이면 각 워커가 직접 import 하도록 import 문자열을 넘깁니다.
+    """
+    limit_concurrency = _env_int("UVICORN_LIMIT_CONCURRENCY", 0)
+    workers = overrides.pop("workers", None) or worker_count()
+    options = {
+        "host": os.getenv("HOST", "0.0.0.0"),
+        "port": _env_int("PORT", 8001),
+        "workers": workers,
+        "loop": os.getenv("UVICORN_LOOP", "auto"),
+        "http": os.getenv("UVICORN_HTTP", "auto"),
+        "backlog": _env_int("UVICORN_BACKLOG", 2048),
+        "timeout_keep_alive": _env_int("UVICORN_TIMEOUT_KEEP_ALIVE", 65),
+        "limit_concurrency": limit_concurrency or None,
+        "timeout_graceful_shutdown": _env_int("UVICORN_TIMEOUT_GRACEFUL_SHUTDOWN", 25),
+        "access_log": _env_bool("UVICORN_ACCESS_LOG", True),
+        # X-Forwarded-For 해석은 clientip.py 가 신뢰 대역 기준으로 하므로 scope["client"] 는 연결 상대 그대로 둠
+        "proxy_headers": False,
+        # h11 의 요청 헤더 한도(기본 16KiB) - 프록시 한도를 찾을 때 백엔드가 먼저 거절하지 않도록 크게
+        "h11_max_incomplete_event_size": _env_int("UVICORN_H11_MAX_INCOMPLETE_EVENT_SIZE", 1024 * 1024),
+        "ws": os.getenv("UVICORN_WS", "auto"),
+        # 연결마다 zlib 압축 상태를 두지 않도록 기본은 끔 (연결당 메모리 측정용)
+        "ws_per_message_deflate": _env_bool("UVICORN_WS_PER_MESSAGE_DEFLATE", False),
+        # 0 이면 서버 ping 을 보내지 않음 (연결마다 keepalive 태스크가 없어짐)
+        "ws_ping_interval": float(os.getenv("UVICORN_WS_PING_INTERVAL", "20") or 0) or None,
+    }
+    options.update(overrides)
+    if isinstance(options["http"], str):
+        # 연결별 요청 수/수명 추적을 위해 uvicorn 프로토콜 클래스를 상속한 버전을 넘김
+        options["http"] = connections.protocol_class(options["http"])
+    return uvicorn.Config(app if app is not None and workers == 1 else APP, **options)
+
+
+class DrainingServer(uvicorn.Server):
+    """SIGTERM 을 받으면 바로 종료하지 않고 drain_seconds 동안 not ready 로 요청을 계속 처리
+
+    엔드포인트 제거가 인그레스 컨트롤러에 반영될 시간을 준 뒤 uvicorn 의 일반 종료
+    (새 연결 거부 → 진행 중 요청 대기)로 넘어갑니다. 두 번째 신호나 SIGINT 는 바로 종료합니다.
+    """
+
+    def __init__(self, config, drain_seconds=0.0):
+        super().__init__(config)
+        self.drain_seconds = drain_seconds
+        self.drain_deadline = None
+
+    def handle_exit(self, sig, frame):
+        if sig == signal.SIGTERM and self.drain_seconds > 0 and self.drain_deadline is None:
+            self.drain_deadline = time.monotonic() + self.drain_seconds
+            # uvicorn 이 종료 후 받은 신호를 다시 올려 주도록 기록 (기본 handle_exit 와 같은 동작)
+            self._captured_signals.append(sig)
+            health.state.begin_drain()
+            logger.info("SIGTERM: %.1fs 동안 드레인 후 종료합니다", self.drain_seconds)
+            return
+        super().handle_exit(sig, frame)
+
+    async def on_tick(self, counter):
+        if self.drain_deadline is not None and not self.should_exit and time.monotonic() >= self.drain_deadline:
+            self.should_exit = True
+        return await super().on_tick(counter)
+
+
+def _prepare_metrics_dir(workers):
+    """워커가 여럿이면 워커별 메트릭 파일을 모을 디렉터리 준비 (/metrics 에서 합산)"""
+    if workers <= 1:
+        return
+    directory = os.getenv("METRICS_DIR")
+    if not directory:
+        directory = tempfile.mkdtemp(prefix="ingress-echo-metrics-")
+        os.environ["METRICS_DIR"] = directory
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.startswith("metrics-") and name.endswith(".bin"):
+            os.unlink(os.path.join(directory, name))
+
+
+def run(app=None, **overrides):
+    """uvicorn.run 과 같은 흐름 - 워커가 여럿이면 소켓을 먼저 바인드하고 Multiprocess 로 실행"""
+    config = build_config(app, **overrides)
+    _prepare_metrics_dir(config.workers)
+    server = DrainingServer(config, float(os.getenv("DRAIN_SECONDS", "0") or 0))
+    logger.info(
+        "workers=%d loop=%s http=%s backlog=%d keep_alive=%ds limit_concurrency=%s",
+        config.workers,
+        _resolved(config.loop, "uvloop", "asyncio"),
+        config.http.__name__,
+        config.backlog,
+        config.timeout_keep_alive, config.limit_concurrency,
+    )
+    if config.workers > 1:
+        sock = config.bind_socket()
+        Multiprocess(config, target=server.run, sockets=[sock]).run()
+    else:
+        server.run()
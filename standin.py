@@ -0,0 +1,904 @@
+# standin.py
+"""오프라인 인그레스 스탠드인 - chart/values_{nginx,traefik,envoy}.yaml 을 읽어 각 컨트롤러의 동작을
+흉내 내는 asyncio 리버스 프록시 (네트워크/클러스터 없이 재현 가능한 비교 환경)
+
+    python main.py standin nginx --workers 2 --port 8080
+    python main.py bench http://127.0.0.1:8080
+
+values 파일에서 읽어 적용하는 동작:
+    nginx    affinity/session-cookie-*, enable-cors/cors-*, configuration-snippet 의 add_header/more_set_headers/
+             proxy_cookie_flags, proxy-read/send/connect-timeout, proxy-body-size (기본 1m)
+    traefik  ingressRoute 의 sticky.cookie, security-headers@file / cors@file 미들웨어
+             (File Provider 정의는 values 밖이라 example-traefik-middleware.md 의 값을 사용)
+    envoy    gateway.features.cors / securityHeaders / backend.timeout / maxRequestBodySize / sticky
+
+--workers N 이면 앱(main.py)을 파드처럼 N 개 띄워(POD_NAME 다르게) 라운드 로빈 + 스티키 쿠키로 나누고,
+upstream 연결은 upstream 별 keep-alive 풀로 재사용합니다. TLS, HTTP/2, ssl-redirect 는 흉내 내지 않습니다.
+"""
+import argparse
+import asyncio
+import hashlib
+import itertools
+import os
+import re
+import shlex
+import signal
+import subprocess
+import sys
+import time
+from collections import deque
+
+FLAVORS = ("nginx", "traefik", "envoy")
+READ_CHUNK = 64 * 1024
+HOP_BY_HOP = frozenset({
+    "connection", "keep-alive", "proxy-connection", "te", "trailer", "transfer-encoding", "upgrade", "expect",
+})
+_STATUS_TEXT = {
+    200: "OK", 204: "No Content", 400: "Bad Request", 413: "Payload Too Large",
+    431: "Request Header Fields Too Large", 502: "Bad Gateway", 504: "Gateway Timeout",
+}
+
+
+# ===== values 파일 (YAML 부분집합) =====
+def _strip_comment(line):
+    quote = None
+    for index, char in enumerate(line):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "#" and (index == 0 or line[index - 1] in " \t"):
+            return line[:index].rstrip()
+    return line.rstrip()
+
+
+def _split_flow(text):
+    items, current, quote = [], "", None
+    for char in text:
+        if quote:
+            current += char
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+            current += char
+        elif char == ",":
+            items.append(current.strip())
+            current = ""
+        else:
+            current += char
+    if current.strip():
+        items.append(current.strip())
+    return items
+
+
+def _scalar(text):
+    text = text.strip()
+    if not text or text in ("~", "null"):
+        return None
+    if text[0] == text[-1] and text[0] in "'\"" and len(text) >= 2:
+        return text[1:-1]
+    if text.startswith("[") and text.endswith("]"):
+        return [_scalar(item) for item in _split_flow(text[1:-1])]
+    if text == "{}":
+        return {}
+    if text in ("true", "false"):
+        return text == "true"
+    if re.fullmatch(r"-?\d+", text):
+        return int(text)
+    if re.fullmatch(r"-?\d+\.\d*", text):
+        return float(text)
+    return text
+
+
+def load_yaml(text):
+    """values 파일에 쓰이는 YAML 부분집합 (블록 매핑/시퀀스, 플로우 시퀀스, 블록 스칼라 |) 파서
+
+    PyYAML 의존성 없이 차트 values 파일만 읽으면 되므로 앵커/태그/여러 문서는 지원하지 않습니다.
+    """
+    lines = []
+    raw_lines = text.splitlines()
+    index = 0
+    while index < len(raw_lines):
+        raw = raw_lines[index]
+        index += 1
+        line = _strip_comment(raw)
+        if not line.strip():
+            continue
+        if line.strip() == "---":
+            break
+        indent = len(line) - len(line.lstrip(" "))
+        content = line.strip()
+        if content.endswith((": |", ": |-", ": >", ": >-")) or content in ("- |", "- |-"):
+            # 블록 스칼라 - 더 깊게 들여쓴 줄을 그대로 모음 (주석 처리 없이)
+            block = []
+            while index < len(raw_lines):
+                nxt = raw_lines[index]
+                if nxt.strip() and len(nxt) - len(nxt.lstrip(" ")) <= indent:
+                    break
+                block.append(nxt)
+                index += 1
+            depth = min((len(b) - len(b.lstrip(" ")) for b in block if b.strip()), default=0)
+            value = "\n".join(b[depth:] for b in block).rstrip("\n") + "\n"
+            lines.append((indent, content.rsplit(" ", 1)[0] + " ", value))
+        else:
+            lines.append((indent, content, None))
+    value, _ = _parse_block(lines, 0, lines[0][0] if lines else 0)
+    return value
+
+
+def _parse_block(lines, index, indent):
+    if index >= len(lines):
+        return None, index
+    if lines[index][1].startswith("- ") or lines[index][1] == "-":
+        return _parse_sequence(lines, index, indent)
+    return _parse_mapping(lines, index, indent)
+
+
+def _parse_value(lines, index, indent, text, block):
+    """'key:' 뒤의 값 - 인라인 스칼라, 블록 스칼라, 또는 다음 줄부터의 중첩 블록"""
+    if block is not None:
+        return block, index
+    if text:
+        return _scalar(text), index
+    if index < len(lines):
+        child_indent, child, _ = lines[index]
+        if child_indent > indent or (child_indent == indent and child.startswith("- ")):
+            return _parse_block(lines, index, child_indent)
+    return None, index
+
+
+def _parse_mapping(lines, index, indent):
+    result = {}
+    while index < len(lines):
+        line_indent, content, block = lines[index]
+        if line_indent != indent or content.startswith("- "):
+            break
+        key, _, rest = content.partition(":")
+        key = _scalar(key)
+        value, index = _parse_value(lines, index + 1, indent, rest.strip(), block)
+        result[key] = value
+    return result, index
+
+
+def _parse_sequence(lines, index, indent):
+    result = []
+    while index < len(lines):
+        line_indent, content, block = lines[index]
+        if line_indent != indent or not (content.startswith("- ") or content == "-"):
+            break
+        item = content[2:].strip()
+        if block is not None and item.endswith(" "):
+            # "- key: |" 형태
+            key = item.rstrip()[:-1].strip()
+            lines[index] = (indent + 2, f"{key}: ", block)
+            value, index = _parse_mapping(lines, index, indent + 2)
+        elif re.match(r"^[^'\"\[{][^:]*:(\s|$)", item):
+            # "- key: value" - 같은 항목의 나머지 키는 indent + 2
+            lines[index] = (indent + 2, item, block)
+            value, index = _parse_mapping(lines, index, indent + 2)
+        else:
+            value, index = _parse_value(lines, index + 1, indent, item, block)
+        result.append(value)
+    return result, index
+
+
+def _get(data, *keys, default=None):
+    for key in keys:
+        if not isinstance(data, dict) or key not in data:
+            return default
+        data = data[key]
+    return default if data is None else data
+
+
+def parse_size(value, default=None):
+    """nginx(500m, 1k) / 쿠버네티스(100Mi, 1G) 크기 → bytes (0 이면 제한 없음)"""
+    if value is None:
+        return default
+    match = re.fullmatch(r"\s*(\d+)\s*([kKmMgG]i?)?\s*", str(value))
+    if not match:
+        raise ValueError(f"잘못된 크기: {value!r}")
+    number, unit = int(match.group(1)), (match.group(2) or "").lower()
+    if unit.endswith("i") or unit in ("k", "m", "g"):
+        power = 1024
+    else:
+        power = 1000
+    return number * power ** {"": 0, "k": 1, "m": 2, "g": 3}[unit.rstrip("i")]
+
+
+def parse_duration(value, default=None):
+    """'60s', '1m', '24h' 또는 초 숫자 → 초"""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+    total = 0.0
+    parts = re.findall(r"(\d+(?:\.\d+)?)(ms|s|m|h)", value)
+    if not parts:
+        return float(value)
+    for number, unit in parts:
+        total += float(number) * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[unit]
+    return total
+
+
+# ===== 컨트롤러 동작 프로필 =====
+class StickyCookie:
+    """세션 어피니티 쿠키 - 값은 upstream 주소의 해시 (컨트롤러가 엔드포인트별로 고정 값을 쓰는 것과 같음)"""
+
+    def __init__(self, name, attributes, digest="sha1", max_age=None):
+        self.name = name
+        self.attributes = attributes
+        self.digest = digest
+        self.max_age = max_age
+
+    def value_for(self, upstream):
+        return hashlib.new(self.digest, upstream.address.encode("latin-1")).hexdigest()[:16 if self.digest == "sha256" else None]
+
+    def header(self, upstream):
+        parts = [f"{self.name}={self.value_for(upstream)}", *self.attributes]
+        if self.max_age is not None:
+            parts.append(f"Max-Age={int(self.max_age)}")
+        return ("Set-Cookie", "; ".join(parts))
+
+
+class CorsPolicy:
+    """CORS 응답 - style 로 컨트롤러별 차이를 표현
+
+    nginx    OPTIONS 는 Origin 과 관계없이 204, 다른 응답에는 항상 CORS 헤더 (설정한 origin 값 그대로)
+    envoy    Origin 이 허용 목록에 있을 때만, ACAO 는 요청 Origin 을 그대로
+    traefik  Origin 이 있을 때만, ACAO 는 목록 값('*')
+    """
+
+    def __init__(self, style, origins, methods, headers, expose=(), credentials=False, max_age=None):
+        self.style = style
+        self.origins = tuple(origins)
+        self.methods = ", ".join(methods)
+        self.headers = ", ".join(headers)
+        self.expose = ", ".join(expose)
+        self.credentials = credentials
+        self.max_age = max_age
+
+    def _allow_origin(self, origin):
+        if self.style == "nginx":
+            return self.origins[0] if self.origins else "*"
+        if origin is None:
+            return None
+        if "*" in self.origins:
+            return origin if self.style == "envoy" or self.credentials else "*"
+        return origin if origin in self.origins else None
+
+    def preflight(self, method, request_headers):
+        """프록시가 직접 답하는 preflight 응답 헤더 (해당 없으면 None)"""
+        if method != "OPTIONS":
+            return None
+        origin = request_headers.get("origin")
+        if self.style != "nginx" and (origin is None or "access-control-request-method" not in request_headers):
+            return None
+        allow = self._allow_origin(origin)
+        if allow is None:
+            return None
+        headers = [
+            ("Access-Control-Allow-Origin", allow),
+            ("Access-Control-Allow-Methods", self.methods),
+            ("Access-Control-Allow-Headers", self.headers),
+        ]
+        if self.credentials:
+            headers.append(("Access-Control-Allow-Credentials", "true"))
+        if self.max_age is not None:
+            headers.append(("Access-Control-Max-Age", str(self.max_age)))
+        return headers
+
+    def response(self, request_headers):
+        allow = self._allow_origin(request_headers.get("origin"))
+        if allow is None:
+            return []
+        headers = [("Access-Control-Allow-Origin", allow)]
+        if self.credentials:
+            headers.append(("Access-Control-Allow-Credentials", "true"))
+        if self.style == "nginx":
+            headers += [("Access-Control-Allow-Methods", self.methods), ("Access-Control-Allow-Headers", self.headers)]
+        if self.expose:
+            headers.append(("Access-Control-Expose-Headers", self.expose))
+        return headers
+
+
+# nginx add_header 는 이 상태 코드에만 붙음 (always 없이)
+_NGINX_ADD_HEADER_STATUSES = frozenset({200, 201, 204, 206, 301, 302, 303, 304, 307, 308})
+# example-traefik-middleware.md 의 security-headers / cors File Provider 정의
+TRAEFIK_SECURITY_HEADERS = (
+    ("X-Content-Type-Options", "nosniff"),
+    ("Pragma", "no-cache"),
+    ("Cache-Control", "max-age=0, no-store, no-cache, must-revalidate"),
+    ("X-XSS-Protection", "1;mode=block"),
+    ("X-Frame-Options", "DENY"),
+)
+
+
+class Profile:
+    """values 파일에서 뽑은 컨트롤러 동작"""
+
+    def __init__(self, flavor, controller):
+        self.flavor = flavor
+        self.controller = controller
+        self.sticky = None
+        self.cors = None
+        # (이름, 값, mode) - mode: add(덧붙임) | set(교체) | add_success(nginx add_header)
+        self.response_headers = []
+        self.cookie_flags = {}
+        self.connect_timeout = 5.0
+        self.read_timeout = None
+        self.total_timeout = None
+        self.max_body = 0
+        self.header_limit = 1024 * 1024
+        self.header_limit_status = 431
+        self.server = None
+        self.forwarded = ("x-forwarded-for", "x-forwarded-proto", "x-forwarded-host", "x-forwarded-port")
+        self.request_id = False
+
+    @classmethod
+    def from_values(cls, flavor, values):
+        controller = next(
+            (item.get("value") for item in _get(values, "env", default=[])
+             if isinstance(item, dict) and item.get("name") == "CONTROLLER_NAME"),
+            flavor,
+        )
+        profile = cls(flavor, controller)
+        getattr(profile, f"_load_{flavor}")(values)
+        return profile
+
+    def _load_nginx(self, values):
+        annotations = _get(values, "ingress", "annotations", default={})
+
+        def ann(name, default=None):
+            value = annotations.get(f"nginx.ingress.kubernetes.io/{name}")
+            return default if value is None else str(value)
+
+        if ann("affinity") == "cookie":
+            attributes = ["Path=/"]
+            if ann("session-cookie-samesite"):
+                attributes.append(f"SameSite={ann('session-cookie-samesite')}")
+            if ann("session-cookie-secure") == "true":
+                attributes.append("Secure")
+            if ann("session-cookie-httponly", "true") == "true":
+                attributes.append("HttpOnly")
+            max_age = ann("session-cookie-max-age")
+            self.sticky = StickyCookie(
+                ann("session-cookie-name", "INGRESSCOOKIE"), attributes,
+                "md5" if ann("session-cookie-hash") == "md5" else "sha1",
+                int(max_age) if max_age else None,
+            )
+        if ann("enable-cors") == "true":
+            split = lambda value: [item.strip() for item in value.split(",") if item.strip()]
+            self.cors = CorsPolicy(
+                "nginx",
+                split(ann("cors-allow-origin", "*")),
+                split(ann("cors-allow-methods", "GET, PUT, POST, DELETE, PATCH, OPTIONS")),
+                split(ann("cors-allow-headers", "DNT,Keep-Alive,User-Agent,X-Requested-With,If-Modified-Since,"
+                                                "Cache-Control,Content-Type,Range,Authorization")),
+                split(ann("cors-expose-headers", "")),
+                ann("cors-allow-credentials", "true") == "true",
+                int(ann("cors-max-age", "1728000")),
+            )
+        # 따옴표 안의 ';' 는 문장 끝이 아님 (more_set_headers "X-Xss-Protection: 1;mode=block")
+        for statement in re.findall(r'((?:[^;"]|"[^"]*")+);', ann("configuration-snippet", "")):
+            directive, *words = shlex.split(statement)
+            if directive == "add_header" and len(words) >= 2:
+                self.response_headers.append((words[0], words[1], "add_success"))
+            elif directive == "more_set_headers":
+                for word in words:
+                    name, _, value = word.partition(":")
+                    self.response_headers.append((name.strip(), value.strip(), "set"))
+            elif directive == "proxy_cookie_flags" and words:
+                self.cookie_flags[words[0]] = words[1:]
+        self.connect_timeout = float(ann("proxy-connect-timeout", "5"))
+        self.read_timeout = float(ann("proxy-read-timeout", "60"))
+        self.max_body = parse_size(ann("proxy-body-size", "1m"))
+        # large_client_header_buffers 4 8k
+        self.header_limit = 32 * 1024
+        self.header_limit_status = 400
+        self.server = "nginx"
+        self.forwarded = ("x-real-ip", "x-forwarded-for", "x-forwarded-host", "x-forwarded-port",
+                          "x-forwarded-proto", "x-forwarded-scheme", "x-scheme")
+        self.request_id = True
+
+    def _load_traefik(self, values):
+        routes = _get(values, "ingressRoute", "routes", default=[])
+        route = routes[0] if routes else {}
+        cookie = _get(route, "sticky", "cookie")
+        if cookie:
+            attributes = ["Path=/"]
+            if cookie.get("secure"):
+                attributes.append("Secure")
+            if cookie.get("httpOnly"):
+                attributes.append("HttpOnly")
+            if cookie.get("sameSite"):
+                attributes.append(f"SameSite={cookie['sameSite']}")
+            self.sticky = StickyCookie(cookie.get("name") or "_traefik", attributes, "sha256",
+                                       cookie.get("maxAge"))
+        middlewares = {item.get("name", "").split("@")[0] for item in route.get("middlewares") or []}
+        if "security-headers" in middlewares:
+            self.response_headers += [(name, value, "set") for name, value in TRAEFIK_SECURITY_HEADERS]
+        if "cors" in middlewares:
+            self.cors = CorsPolicy(
+                "traefik", ["*"], ["GET", "POST", "HEAD", "OPTIONS"],
+                ["X-Forwarded-For", "Content-Type", "Authorization"], ["X-Forwarded-For"], False, 86400,
+            )
+        # 기본 forwardingTimeouts.responseHeaderTimeout = 0 (제한 없음), 본문 크기 제한 없음
+        self.forwarded = ("x-forwarded-for", "x-forwarded-host", "x-forwarded-port", "x-forwarded-proto",
+                          "x-forwarded-server", "x-real-ip")
+
+    def _load_envoy(self, values):
+        features = _get(values, "gateway", "features", default={})
+        cors = features.get("cors") or {}
+        if cors.get("enabled"):
+            self.cors = CorsPolicy(
+                "envoy", cors.get("allowOrigins") or [], cors.get("allowMethods") or [],
+                cors.get("allowHeaders") or [], cors.get("exposeHeaders") or [],
+                bool(cors.get("allowCredentials")), cors.get("maxAge"),
+            )
+        security = features.get("securityHeaders") or {}
+        if security.get("enabled"):
+            # httproute.yaml 의 ResponseHeaderModifier.add 와 같은 순서/값
+            if security.get("frameDeny"):
+                self.response_headers.append(("X-Frame-Options", "DENY", "add"))
+            if security.get("contentTypeNosniff"):
+                self.response_headers.append(("X-Content-Type-Options", "nosniff", "add"))
+            if security.get("cacheControl"):
+                self.response_headers.append(("Cache-Control", security["cacheControl"], "add"))
+                self.response_headers.append(("Pragma", "no-cache", "add"))
+            if security.get("xssProtection"):
+                self.response_headers.append(("X-XSS-Protection", "1; mode=block", "add"))
+        backend = features.get("backend") or {}
+        self.total_timeout = parse_duration(backend.get("timeout"), 15.0)
+        self.max_body = parse_size(backend.get("maxRequestBodySize"), 0)
+        sticky = backend.get("sticky") or {}
+        if sticky.get("enabled"):
+            attributes = [f"{name}" if str(value) == "true" else f"{name}={value}"
+                          for name, value in (sticky.get("attributes") or {}).items()]
+            self.sticky = StickyCookie(sticky.get("cookieName") or "route", attributes, "sha256",
+                                       parse_duration(sticky.get("ttl"), 86400))
+        # max_request_headers_kb 기본 60
+        self.header_limit = 60 * 1024
+        self.server = "envoy"
+        self.forwarded = ("x-forwarded-for", "x-forwarded-proto")
+        self.request_id = True
+
+    def summary(self):
+        return {
+            "flavor": self.flavor,
+            "controller": self.controller,
+            "sticky": self.sticky and {"name": self.sticky.name, "attributes": self.sticky.attributes},
+            "cors": self.cors and self.cors.style,
+            "response_headers": [f"{name}: {value} ({mode})" for name, value, mode in self.response_headers],
+            "cookie_flags": self.cookie_flags,
+            "read_timeout": self.read_timeout,
+            "total_timeout": self.total_timeout,
+            "max_body": self.max_body,
+        }
+
+
+# ===== upstream 연결 풀 =====
+class Upstream:
+    """앱 워커 하나 - 유휴 keep-alive 연결을 max_idle 개까지 보관"""
+
+    def __init__(self, host, port, max_idle=64):
+        self.host = host
+        self.port = port
+        self.address = f"{host}:{port}"
+        self.idle = deque()
+        self.max_idle = max_idle
+        self.opened = 0
+
+    async def acquire(self, timeout):
+        """(reader, writer, 재사용 여부)"""
+        while self.idle:
+            reader, writer = self.idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, limit=1024 * 1024), timeout
+        )
+        self.opened += 1
+        return reader, writer, False
+
+    def release(self, reader, writer):
+        if len(self.idle) < self.max_idle and not writer.is_closing():
+            self.idle.append((reader, writer))
+        else:
+            writer.close()
+
+
+class _Reject(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _response_head(status, headers):
+    lines = [f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, 'Status')}"]
+    lines += [f"{name}: {value}" for name, value in headers]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def _parse_head(data):
+    lines = data.decode("latin-1").split("\r\n")
+    first = lines[0]
+    headers = []
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers.append((name.strip(), value.strip()))
+    return first, headers
+
+
+async def _copy_exact(reader, writer, size, timeout):
+    remaining = size
+    while remaining:
+        chunk = await asyncio.wait_for(reader.read(min(remaining, READ_CHUNK)), timeout)
+        if not chunk:
+            raise asyncio.IncompleteReadError(b"", remaining)
+        remaining -= len(chunk)
+        writer.write(chunk)
+        await writer.drain()
+
+
+async def _copy_chunked(reader, writer, timeout, limit=0):
+    """chunked 본문을 그대로 전달 (limit 을 넘으면 _Reject(413))"""
+    total = 0
+    while True:
+        size_line = await asyncio.wait_for(reader.readuntil(b"\r\n"), timeout)
+        size = int(size_line.split(b";", 1)[0].strip(), 16)
+        total += size
+        if limit and total > limit:
+            raise _Reject(413, "요청 본문이 너무 큽니다")
+        writer.write(size_line)
+        if size == 0:
+            while True:
+                line = await asyncio.wait_for(reader.readuntil(b"\r\n"), timeout)
+                writer.write(line)
+                if line == b"\r\n":
+                    break
+            await writer.drain()
+            return
+        await _copy_exact(reader, writer, size + 2, timeout)
+
+
+class StandinProxy:
+    """프로필대로 요청/응답을 바꿔 upstream 으로 전달하는 HTTP/1.1 프록시"""
+
+    def __init__(self, profile, upstreams):
+        self.profile = profile
+        self.upstreams = upstreams
+        self._round_robin = itertools.cycle(upstreams)
+        self._sticky_values = (
+            {profile.sticky.value_for(upstream): upstream for upstream in upstreams} if profile.sticky else {}
+        )
+        self._request_ids = itertools.count(1)
+        self.requests = 0
+
+    def _pick(self, request_headers):
+        """(upstream, 스티키 쿠키를 새로 줘야 하는지)"""
+        sticky = self.profile.sticky
+        if sticky is not None:
+            for part in request_headers.get("cookie", "").split(";"):
+                name, _, value = part.strip().partition("=")
+                if name == sticky.name and value in self._sticky_values:
+                    return self._sticky_values[value], False
+        return next(self._round_robin), sticky is not None
+
+    async def handle(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        client_ip = peer[0] if peer else "127.0.0.1"
+        local = writer.get_extra_info("sockname")
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.LimitOverrunError:
+                    await self._reply(writer, self.profile.header_limit_status, "요청 헤더가 너무 큽니다", close=True)
+                    return
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                keep_alive = await self._proxy(head, reader, writer, client_ip, local)
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+    async def _reply(self, writer, status, message, headers=(), close=False):
+        body = f'{{"오류": "{message}", "standin": "{self.profile.flavor}"}}'.encode("utf-8")
+        head = [*headers, ("Content-Type", "application/json"), ("Content-Length", str(len(body)))]
+        if self.profile.server:
+            head.insert(0, ("Server", self.profile.server))
+        if close:
+            head.append(("Connection", "close"))
+        writer.write(_response_head(status, head) + body)
+        await writer.drain()
+
+    def _forward_headers(self, headers, lookup, client_ip, local):
+        profile = self.profile
+        out = [(name, value) for name, value in headers if name.lower() not in HOP_BY_HOP
+               and name.lower() not in profile.forwarded]
+        host = lookup.get("host", "")
+        values = {
+            "x-forwarded-for": f"{lookup['x-forwarded-for']}, {client_ip}" if "x-forwarded-for" in lookup else client_ip,
+            "x-real-ip": client_ip,
+            "x-forwarded-host": host,
+            "x-forwarded-port": str(local[1]) if local else "",
+            "x-forwarded-proto": "http",
+            "x-forwarded-scheme": "http",
+            "x-scheme": "http",
+            "x-forwarded-server": profile.flavor,
+        }
+        out += [(name, values[name]) for name in profile.forwarded]
+        if profile.request_id and "x-request-id" not in lookup:
+            out.append(("X-Request-ID", f"{os.getpid():x}{next(self._request_ids):012x}"))
+        if profile.total_timeout and profile.flavor == "envoy":
+            out.append(("X-Envoy-Expected-Rq-Timeout-Ms", str(int(profile.total_timeout * 1000))))
+        return out
+
+    async def _proxy(self, head, reader, writer, client_ip, local):
+        """요청 하나 전달 → 클라이언트 연결을 유지할지"""
+        profile = self.profile
+        self.requests += 1
+        request_line, headers = _parse_head(head)
+        try:
+            method, target, version = request_line.split(" ", 2)
+        except ValueError:
+            await self._reply(writer, 400, "잘못된 요청 줄", close=True)
+            return False
+        lookup = {}
+        for name, value in headers:
+            lookup.setdefault(name.lower(), value)
+        client_keep_alive = lookup.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+        chunked = "chunked" in lookup.get("transfer-encoding", "").lower()
+        length = int(lookup.get("content-length", "0") or 0) if not chunked else None
+
+        if length and profile.max_body and length > profile.max_body:
+            await self._reply(writer, 413, "요청 본문이 너무 큽니다", close=True)
+            return False
+        if profile.cors is not None:
+            preflight = profile.cors.preflight(method, lookup)
+            if preflight is not None:
+                status = 204 if profile.cors.style == "nginx" else 200
+                writer.write(_response_head(status, [*preflight, ("Content-Length", "0")]))
+                await writer.drain()
+                return client_keep_alive and not length and not chunked
+        if lookup.get("expect", "").lower() == "100-continue":
+            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+
+        upstream, set_sticky = self._pick(lookup)
+        forward = self._forward_headers(headers, lookup, client_ip, local)
+        if "upgrade" in lookup and "upgrade" in lookup.get("connection", "").lower():
+            forward += [("Connection", "Upgrade"), ("Upgrade", lookup["upgrade"])]
+        if chunked:
+            forward.append(("Transfer-Encoding", "chunked"))
+        elif length or method in ("POST", "PUT", "PATCH"):
+            forward.append(("Content-Length", str(length)))
+        request_head = (f"{method} {target} HTTP/1.1\r\n"
+                        + "".join(f"{name}: {value}\r\n" for name, value in forward) + "\r\n").encode("latin-1")
+        timeout = profile.read_timeout or profile.total_timeout
+
+        for attempt in range(2):
+            try:
+                up_reader, up_writer, reused = await upstream.acquire(profile.connect_timeout)
+            except (OSError, TimeoutError):
+                await self._reply(writer, 502, "upstream 연결 실패", close=True)
+                return False
+            try:
+                up_writer.write(request_head)
+                if chunked:
+                    await _copy_chunked(reader, up_writer, timeout, profile.max_body)
+                elif length:
+                    await _copy_exact(reader, up_writer, length, timeout)
+                await up_writer.drain()
+                status_head = await asyncio.wait_for(up_reader.readuntil(b"\r\n\r\n"), timeout)
+                while status_head[9:10] == b"1" and status_head[9:12] != b"101":
+                    # 1xx 중간 응답은 건너뜀
+                    status_head = await asyncio.wait_for(up_reader.readuntil(b"\r\n\r\n"), timeout)
+                break
+            except _Reject as reject:
+                up_writer.close()
+                await self._reply(writer, reject.status, reject.message, close=True)
+                return False
+            except TimeoutError:
+                up_writer.close()
+                await self._reply(writer, 504, "upstream 응답 시간 초과", close=True)
+                return False
+            except (asyncio.IncompleteReadError, ConnectionError):
+                up_writer.close()
+                # 재사용한 유휴 연결이 이미 닫혀 있었으면 본문 없는 요청만 새 연결로 한 번 더
+                if reused and attempt == 0 and not length and not chunked:
+                    continue
+                await self._reply(writer, 502, "upstream 연결이 끊겼습니다", close=True)
+                return False
+
+        status_line, response_headers = _parse_head(status_head)
+        status = int(status_line.split(" ", 2)[1])
+        response_lookup = {}
+        for name, value in response_headers:
+            response_lookup.setdefault(name.lower(), value)
+        upstream_keep_alive = response_lookup.get("connection", "").lower() != "close"
+
+        if status == 101:
+            writer.write(status_head)
+            await writer.drain()
+            await self._tunnel(reader, writer, up_reader, up_writer)
+            return False
+
+        out = self._response_headers(status, response_headers, lookup, upstream, set_sticky)
+        body_chunked = "chunked" in response_lookup.get("transfer-encoding", "").lower()
+        body_length = response_lookup.get("content-length")
+        no_body = method == "HEAD" or status in (204, 304) or status < 200
+        close_delimited = not no_body and not body_chunked and body_length is None
+        if body_chunked or close_delimited:
+            out.append(("Transfer-Encoding", "chunked"))
+        elif body_length is not None:
+            out.append(("Content-Length", body_length))
+        if not client_keep_alive:
+            out.append(("Connection", "close"))
+        writer.write(_response_head(status, out))
+        try:
+            if no_body:
+                pass
+            elif body_chunked:
+                await _copy_chunked(up_reader, writer, timeout)
+            elif body_length is not None:
+                await _copy_exact(up_reader, writer, int(body_length), timeout)
+            else:
+                while chunk := await asyncio.wait_for(up_reader.read(READ_CHUNK), timeout):
+                    writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                    await writer.drain()
+                writer.write(b"0\r\n\r\n")
+                upstream_keep_alive = False
+            await writer.drain()
+        except (TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            up_writer.close()
+            return False
+        if upstream_keep_alive:
+            upstream.release(up_reader, up_writer)
+        else:
+            up_writer.close()
+        return client_keep_alive
+
+    def _response_headers(self, status, headers, request_lookup, upstream, set_sticky):
+        profile = self.profile
+        drop = set(HOP_BY_HOP) | {"content-length"}
+        if profile.server:
+            drop.add("server")
+        out = []
+        for name, value in headers:
+            lower = name.lower()
+            if lower in drop:
+                continue
+            if lower == "set-cookie" and profile.cookie_flags:
+                cookie = value.partition("=")[0].strip()
+                flags = profile.cookie_flags.get(cookie)
+                if flags:
+                    present = {part.strip().split("=")[0].lower() for part in value.split(";")[1:]}
+                    value += "".join(f"; {flag}" for flag in flags if flag.split("=")[0].lower() not in present)
+            out.append((name, value))
+        if profile.server:
+            out.insert(0, ("Server", profile.server))
+        for name, value, mode in profile.response_headers:
+            if mode == "add_success" and status not in _NGINX_ADD_HEADER_STATUSES:
+                continue
+            if mode == "set":
+                out = [(n, v) for n, v in out if n.lower() != name.lower()]
+            out.append((name, value))
+        if profile.cors is not None:
+            cors = profile.cors.response(request_lookup)
+            names = {name.lower() for name, _ in cors}
+            out = [(n, v) for n, v in out if n.lower() not in names] + cors
+        if set_sticky:
+            out.append(profile.sticky.header(upstream))
+        return out
+
+    async def _tunnel(self, reader, writer, up_reader, up_writer):
+        """Upgrade(WebSocket) 이후 양방향 바이트 중계"""
+
+        async def pipe(source, sink):
+            try:
+                while chunk := await source.read(READ_CHUNK):
+                    sink.write(chunk)
+                    await sink.drain()
+            except ConnectionError:
+                pass
+            finally:
+                sink.close()
+
+        await asyncio.gather(pipe(reader, up_writer), pipe(up_reader, writer))
+
+
+# ===== 워커 실행 / CLI =====
+def spawn_workers(count, base_port, controller, flavor):
+    """앱을 파드처럼 count 개 실행 (워커마다 POD_NAME/포트가 다름)"""
+    main_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+    processes = []
+    for index in range(count):
+        env = {
+            **os.environ,
+            "PORT": str(base_port + index),
+            "HOST": "127.0.0.1",
+            "WEB_CONCURRENCY": "1",
+            "CONTROLLER_NAME": controller,
+            "POD_NAME": f"{flavor}-standin-{index}",
+            "UVICORN_ACCESS_LOG": "false",
+        }
+        processes.append(subprocess.Popen([sys.executable, main_path], env=env))
+    return processes
+
+
+async def wait_ready(upstreams, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    for upstream in upstreams:
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(upstream.host, upstream.port)
+                writer.write(b"GET /health/ready HTTP/1.1\r\nHost: standin\r\nConnection: close\r\n\r\n")
+                await writer.drain()
+                status = await reader.readline()
+                writer.close()
+                if b" 200 " in status:
+                    break
+            except OSError:
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{upstream.address} 가 준비되지 않았습니다")
+            await asyncio.sleep(0.2)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py standin", description="values 파일 기반 인그레스 스탠드인 프록시")
+    parser.add_argument("flavor", choices=FLAVORS, help="흉내 낼 컨트롤러")
+    parser.add_argument("--values", default=None, help="values 파일 (기본 chart/values_{flavor}.yaml)")
+    parser.add_argument("--host", default="127.0.0.1", help="프록시 바인드 주소")
+    parser.add_argument("--port", type=int, default=8080, help="프록시 포트 (기본 8080)")
+    parser.add_argument("--workers", type=int, default=2, help="띄울 앱 워커(파드) 수 (기본 2, --upstream 을 주면 무시)")
+    parser.add_argument("--worker-port", type=int, default=18101, help="앱 워커 시작 포트 (기본 18101)")
+    parser.add_argument("--upstream", action="append", default=[], metavar="HOST:PORT",
+                        help="이미 떠 있는 앱 주소 (여러 번 지정 가능)")
+    return parser
+
+
+async def _serve(args, profile, upstreams):
+    await wait_ready(upstreams)
+    proxy = StandinProxy(profile, upstreams)
+    server = await asyncio.start_server(proxy.handle, args.host, args.port, limit=profile.header_limit)
+    print(f"{profile.controller} standin: http://{args.host}:{args.port} -> "
+          f"{', '.join(upstream.address for upstream in upstreams)}")
+    for key, value in profile.summary().items():
+        print(f"  {key}: {value}")
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    async with server:
+        await stop.wait()
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    path = args.values or os.path.join(os.path.dirname(os.path.abspath(__file__)), "chart", f"values_{args.flavor}.yaml")
+    with open(path, encoding="utf-8") as f:
+        profile = Profile.from_values(args.flavor, load_yaml(f.read()))
+    processes = []
+    if args.upstream:
+        upstreams = []
+        for item in args.upstream:
+            host, _, port = item.rpartition(":")
+            upstreams.append(Upstream(host or "127.0.0.1", int(port)))
+    else:
+        processes = spawn_workers(args.workers, args.worker_port, profile.controller, args.flavor)
+        upstreams = [Upstream("127.0.0.1", args.worker_port + index) for index in range(args.workers)]
+    try:
+        asyncio.run(_serve(args, profile, upstreams))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+    return 0
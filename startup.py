@@ -0,0 +1,217 @@
+# startup.py
+"""콜드 스타트 측정 - 컨테이너/프로세스 시작부터 ready, 첫 응답까지 구간별 시간
+
+    GET /startup          이 워커의 구간별 시간
+    STARTUP_PROFILE       켜면 모듈별 import 시간도 기록 (기본 false, import 마다 약간의 오버헤드)
+    STARTUP_PROFILE_TOP   보고할 모듈/패키지 수 (기본 15)
+
+구간: PID 1 시작 → 프로세스 시작 → main import 시작(인터프리터 기동) → 의존성 import → 앱 구성
+      → 서버 기동 (uvicorn 설정 로드, 바인드, lifespan 완료 = ready) → 첫 요청(헬스 프로브 제외)의 첫 바이트
+컨테이너 안에서는 PID 1 이 컨테이너 시작 시각이므로 "PID1_시작→ready" 가 container-start-to-ready 입니다.
+프로세스 시작 시각은 리눅스 /proc 의 starttime 으로 계산합니다 (해상도 1 clock tick, 그 외 OS 에서는 None).
+부팅 후 경과(monotonic)를 벽시계로 바꾸는 값이라 NTP 보정에 따라 흔들리므로 이 모듈 import 때 한 번만 계산합니다.
+
+main.py 가 다른 무엇보다 먼저 이 모듈을 import 해야 import 구간과 모듈별 시간이 온전히 잡힙니다.
+"""
+import os
+import sys
+import time
+
+STARTUP_PROFILE = os.getenv("STARTUP_PROFILE", "").strip().lower() in ("1", "true", "yes", "on")
+STARTUP_PROFILE_TOP = int(os.getenv("STARTUP_PROFILE_TOP", "").strip() or 15)
+# 시작 시 불러오지 않는 것이 목표인 모듈 (ready 시점에 이미 로드돼 있으면 누가 먼저 import 한 것)
+# python_multipart 는 starlette.formparsers 가 import 시점에 불러오므로 뺄 수 없어 넣지 않음
+LAZY_MODULES = ("replay", "standin", "asgibench")
+# (끝 표시, 구간 이름) - 서버 기동은 uvicorn 설정 로드(프로토콜/websockets import), 소켓 바인드, lifespan
+_PHASES = (("imports", "import_ms"), ("app", "앱_구성_ms"), ("ready", "서버_기동_ms"))
+
+
+def process_started_at(pid="self"):
+    """/proc/<pid>/stat 의 starttime → epoch 초 (읽을 수 없으면 None)"""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            # comm 에 공백/괄호가 있을 수 있으므로 마지막 ')' 뒤부터 (starttime 은 22번째 필드)
+            fields = f.read().rsplit(b")", 1)[1].split()
+        with open("/proc/uptime", "rb") as f:
+            uptime = float(f.read().split()[0])
+        started_after_boot = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+    return time.time() - (uptime - started_after_boot)
+
+
+class ImportTimer:
+    """sys.meta_path 맨 앞에서 모듈별 exec 시간을 잼 - 자기 시간 = 전체 - 그 안에서 import 한 모듈 시간"""
+
+    def __init__(self):
+        self.self_times = {}
+        self._stack = []
+        self._finding = False
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, name, path=None, target=None):
+        if self._finding:
+            return None
+        self._finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, name, self)
+        return spec
+
+    def _enter(self):
+        self._stack.append(0.0)
+
+    def _leave(self, name, elapsed):
+        children = self._stack.pop()
+        self.self_times[name] = max(0.0, elapsed - children)
+        if self._stack:
+            self._stack[-1] += elapsed
+
+    def report(self, top):
+        packages = {}
+        for name, seconds in self.self_times.items():
+            package = name.partition(".")[0]
+            packages[package] = packages.get(package, 0.0) + seconds
+        ranked = lambda items: {name: round(seconds * 1000, 3) for name, seconds in
+                                sorted(items, key=lambda item: item[1], reverse=True)[:top]}
+        return {
+            "측정_모듈_수": len(self.self_times),
+            "합계_ms": round(sum(self.self_times.values()) * 1000, 3),
+            "패키지별_ms": ranked(packages.items()),
+            "모듈별_ms": ranked(self.self_times.items()),
+        }
+
+
+class _TimedLoader:
+    """원래 로더에 위임하면서 exec_module 시간만 기록"""
+
+    def __init__(self, loader, name, timer):
+        self._loader = loader
+        self._name = name
+        self._timer = timer
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        timer = self._timer
+        timer._enter()
+        started = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            timer._leave(self._name, time.perf_counter() - started)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class StartupProfile:
+    """워커 프로세스 하나의 시작 시각 기록 (epoch 초)"""
+
+    def __init__(self, import_timer=None):
+        self.marks = {
+            "import_start": time.time(),
+            "process_start": process_started_at(),
+            "pid1_start": process_started_at(1),
+        }
+        self.import_timer = import_timer
+        self.first_response = None
+        self.lazy_loaded = None
+
+    def mark(self, name):
+        self.marks[name] = time.time()
+        if name == "ready":
+            self.lazy_loaded = [module for module in LAZY_MODULES if module in sys.modules]
+            if self.import_timer is not None:
+                # ready 이후의 import(첫 요청 때 지연 로드 등)는 시작 비용이 아니므로 측정 종료
+                self.import_timer.uninstall()
+
+    def record_first_response(self, path, started, first_byte):
+        self.first_response = (path, started, first_byte)
+
+    def report(self):
+        marks = self.marks
+        process_start = marks["process_start"]
+        pid1_start = marks["pid1_start"]
+        ready = marks.get("ready")
+
+        def ms(start, end):
+            return round((end - start) * 1000, 3) if start is not None and end is not None else None
+
+        phases = {"인터프리터_기동_ms": ms(process_start, marks["import_start"])}
+        previous = marks["import_start"]
+        for name, label in _PHASES:
+            phases[label] = ms(previous, marks.get(name))
+            previous = marks.get(name, previous)
+        result = {
+            "워커": os.getpid(),
+            "구간": phases,
+            "누적": {
+                "PID1_시작→ready_ms": ms(pid1_start, ready),
+                "프로세스_시작→ready_ms": ms(process_start, ready),
+                "import_시작→ready_ms": ms(marks["import_start"], ready),
+            },
+            "첫_응답": None,
+            "ready_때_로드된_지연_모듈": self.lazy_loaded,
+        }
+        if self.first_response is not None:
+            path, started, first_byte = self.first_response
+            result["첫_응답"] = {
+                "경로": path,
+                "ready→요청_ms": ms(ready, started),
+                "첫_바이트_ms": ms(started, first_byte),
+                "프로세스_시작→첫_바이트_ms": ms(process_start, first_byte),
+            }
+        if self.import_timer is not None:
+            result["import_프로파일"] = self.import_timer.report(STARTUP_PROFILE_TOP)
+        return result
+
+
+def _create_profile():
+    timer = None
+    if STARTUP_PROFILE:
+        timer = ImportTimer()
+        timer.install()
+    return StartupProfile(timer)
+
+
+profile = _create_profile()
+
+
+class FirstResponseMiddleware:
+    """첫 요청(헬스 프로브 제외)의 응답 시작 시각을 한 번만 기록 - 그 뒤로는 속성 확인 하나"""
+
+    def __init__(self, app, profile=profile):
+        self.app = app
+        self.profile = profile
+
+    async def __call__(self, scope, receive, send):
+        if self.profile.first_response is not None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.time()
+        profile = self.profile
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and profile.first_response is None:
+                profile.record_first_response(scope["path"], started, time.time())
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
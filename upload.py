@@ -0,0 +1,161 @@
+# upload.py
+"""스트리밍 업로드 - 본문을 도착하는 대로 청크 단위로 처리 (전체를 메모리에 두지 않음)"""
+import hashlib
+import time
+import zlib
+
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+
+class UploadDigest:
+    """수신 중인 바이트의 크기/SHA-256/CRC32 누적"""
+
+    __slots__ = ("name", "filename", "content_type", "size", "_sha256", "_crc32")
+
+    def __init__(self, name=None, filename=None, content_type=None):
+        self.name = name
+        self.filename = filename
+        self.content_type = content_type
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+        self._crc32 = 0
+
+    def update(self, data):
+        self.size += len(data)
+        self._sha256.update(data)
+        self._crc32 = zlib.crc32(data, self._crc32)
+
+    def summary(self):
+        return {
+            "파일명": self.filename,
+            "크기": f"{self.size} bytes",
+            "타입": self.content_type,
+            "sha256": self._sha256.hexdigest(),
+            "crc32": f"{self._crc32 & 0xFFFFFFFF:08x}",
+        }
+
+
+class ReceiveTimer:
+    """본문 청크 도착 시각 기록 - 첫 바이트 지연과 수신 처리량 계산"""
+
+    __slots__ = ("started", "first_byte", "last_byte", "bytes", "chunks")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_byte = None
+        self.last_byte = None
+        self.bytes = 0
+        self.chunks = 0
+
+    def mark(self, nbytes):
+        now = time.perf_counter()
+        if self.first_byte is None:
+            self.first_byte = now
+        self.last_byte = now
+        self.bytes += nbytes
+        self.chunks += 1
+
+    def summary(self):
+        if self.first_byte is None:
+            return {"수신_바이트": 0, "청크_수": 0, "첫_바이트_ms": None, "수신_시간_ms": 0.0, "처리량_MBps": None}
+        elapsed = self.last_byte - self.first_byte
+        return {
+            "수신_바이트": self.bytes,
+            "청크_수": self.chunks,
+            "첫_바이트_ms": round((self.first_byte - self.started) * 1000, 3),
+            "수신_시간_ms": round(elapsed * 1000, 3),
+            "처리량_MBps": round(self.bytes / elapsed / 1_000_000, 3) if elapsed > 0 else None,
+        }
+
+
+class _MultipartDigester:
+    """python-multipart 스트리밍 파서 콜백 - 파트별로 본문만 해시"""
+
+    def __init__(self, boundary):
+        self.parts = []
+        self._current = None
+        self._field = b""
+        self._value = b""
+        self._headers = {}
+        self.parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_part_data": self._on_part_data,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+        })
+
+    def _on_part_begin(self):
+        self._headers = {}
+
+    def _on_header_field(self, data, start, end):
+        self._field += data[start:end]
+
+    def _on_header_value(self, data, start, end):
+        self._value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._field.lower()] = self._value
+        self._field = b""
+        self._value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        filename = options.get(b"filename")
+        content_type = self._headers.get(b"content-type")
+        self._current = UploadDigest(
+            options.get(b"name", b"").decode("utf-8", "replace"),
+            filename.decode("utf-8", "replace") if filename is not None else None,
+            content_type.decode("latin-1") if content_type is not None else None,
+        )
+        self.parts.append(self._current)
+
+    def _on_part_data(self, data, start, end):
+        # 슬라이스 복사 없이 memoryview 로 해시
+        self._current.update(memoryview(data)[start:end])
+
+
+async def receive_upload(request, on_chunk=None):
+    """요청 본문을 스트리밍으로 읽어 (파트별 다이제스트 목록, 수신 타이머) 반환
+
+    multipart/form-data 이면 파트별 본문만, 그 외에는 본문 전체를 해시합니다.
+    on_chunk 가 있으면 청크가 도착할 때마다 바이트 수로 호출합니다.
+    경계(boundary)가 없는 multipart 요청이면 ValueError.
+    """
+    timer = ReceiveTimer()
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        _, options = parse_options_header(content_type)
+        boundary = options.get(b"boundary")
+        if not boundary:
+            raise ValueError("multipart boundary가 없습니다")
+        digester = _MultipartDigester(boundary)
+        async for chunk in request.stream():
+            if chunk:
+                timer.mark(len(chunk))
+                if on_chunk is not None:
+                    on_chunk(len(chunk))
+                digester.parser.write(chunk)
+        digester.parser.finalize()
+        return digester.parts, timer
+
+    digest = UploadDigest(content_type=content_type or None)
+    async for chunk in request.stream():
+        if chunk:
+            timer.mark(len(chunk))
+            if on_chunk is not None:
+                on_chunk(len(chunk))
+            digest.update(chunk)
+    return [digest], timer
+
+
+def pick_file_part(parts, field="file"):
+    """/upload 와 같은 필드 이름의 파트를 우선, 없으면 첫 파일 파트"""
+    for part in parts:
+        if part.name == field:
+            return part
+    for part in parts:
+        if part.filename is not None:
+            return part
+    return parts[0] if parts else UploadDigest()